@@ -0,0 +1,99 @@
+"""
+Review UI (docs/tooling_stack.md: Streamlit, input on the left, JSON on the right).
+
+Filters and pages go through src/review/store.py, so the queue stays fast
+for large exports; "Sync exports" indexes only new or changed export files.
+
+Usage (from the repo root, needs `pip install streamlit`):
+    streamlit run app/review_app.py -- --export-dir export --db .cache/review.sqlite
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+import streamlit as st
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root, for `src`
+
+from src.models.rfq import RFQ  # noqa: E402
+from src.review.store import DEFAULT_PATH, ReviewStore  # noqa: E402
+
+RAW_DIR = os.path.join("data_samples", "raw")
+MISSING_FIELDS = [name for name in RFQ.model_fields if name not in ("request_id", "needs_review")]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--export-dir", default="export")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    return parser.parse_args()
+
+
+@st.cache_resource
+def open_store(path: str) -> ReviewStore:
+    return ReviewStore(path, check_same_thread=False)  # Streamlit reruns the script in other threads
+
+
+def mail_text(raw_dir: str, request_id: str) -> str:
+    path = os.path.join(raw_dir, f"{request_id}.txt")
+    if not os.path.exists(path):
+        return "(no mail text found in %s)" % raw_dir
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def main():
+    args = parse_args()
+    st.set_page_config(page_title="RFQ review", layout="wide")
+    store = open_store(args.db)
+    if "synced" not in st.session_state or st.sidebar.button("Sync exports"):
+        st.session_state.synced = store.sync(args.export_dir)
+    stats = st.session_state.synced
+    st.sidebar.caption(f"{len(store)} RFQs indexed ({stats.files_read} file(s) read at the last sync)")
+
+    review = st.sidebar.selectbox("Status", ["needs review", "all", "complete"])
+    customers = [""] + [name for name, _ in store.facets("customer_name")]
+    products = [""] + [name for name, _ in store.facets("product_or_service")]
+    customer = st.sidebar.selectbox("Customer", customers)
+    product = st.sidebar.selectbox("Product / service", products)
+    missing = st.sidebar.selectbox("Missing field", [""] + MISSING_FIELDS)
+    due_before = st.sidebar.date_input("Response due before", value=None)
+    text = st.sidebar.text_input("Search")
+    page_size = st.sidebar.select_slider("Page size", [10, 25, 50, 100], value=25)
+    page_number = st.sidebar.number_input("Page", min_value=1, value=1, step=1)
+
+    page = store.query(
+        needs_review={"needs review": True, "complete": False}.get(review),
+        customer=customer or None,
+        product=product or None,
+        missing_field=missing or None,
+        due_before=due_before.isoformat() if due_before else None,
+        text=text or None,
+        page=int(page_number),
+        page_size=page_size,
+    )
+    st.caption(f"{page.total} matching RFQs, page {page.page}/{page.pages}")
+    if not page.items:
+        st.info("No RFQs match the filters.")
+        return
+
+    labels = {
+        f"{r['request_id']} · due {r['response_due_date']} · {r.get('customer_name') or '?'}: {r['product_or_service']}": r
+        for r in page.items
+    }
+    record = labels[st.radio("RFQ", list(labels), label_visibility="collapsed")]
+    left, right = st.columns(2)
+    with left:
+        st.subheader("Input")
+        st.text(mail_text(args.raw_dir, record["request_id"]))
+    with right:
+        st.subheader("RFQ JSON")
+        if record["missing_fields"]:
+            st.warning("Missing: " + ", ".join(record["missing_fields"]))
+        st.json(record)
+
+
+main()
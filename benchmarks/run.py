@@ -0,0 +1,176 @@
+"""
+Throughput benchmark for intake: extraction, validation and export at several
+corpus scales, with peak RSS per scale. Each scale runs in a fresh process so
+its peak RSS is not inflated by earlier scales.
+
+Usage (from the repo root):
+    python -m benchmarks.run --scales 10000 100000 1000000
+    python -m benchmarks.run --scales 10000 --packed /tmp/rfqs.jsonl --compare export/benchmarks/previous.json
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, List, Optional
+
+from benchmarks.synthetic import count_packed, iter_packed, iter_synthetic_rfqs, write_packed
+from src.extraction.attachments import parse_attachment
+from src.extraction.rules import build_record, parse_mail
+from src.models.rfq import RFQ
+from src.review.rules import apply_review
+
+RESULTS_DIR = os.path.join("export", "benchmarks")
+STAGES = ("extract", "review", "validate", "export")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scale(n: int, seed: int = 42, packed: Optional[str] = None, block_size: int = 10_000, export_path: str = os.devnull) -> Dict[str, float]:
+    """
+    Stream n RFQs through the stages block by block (memory stays bounded by block_size).
+    Rates are computed from the RFQs actually processed ("processed"), which
+    is less than n if a packed file holds fewer requests.
+
+    extract:  mail text and attachment texts -> RFQ-shaped dict (rule scanner, attachment parser)
+    review:   review rules over the whole block, column-wise
+    validate: RFQ.validate_many over each block
+    export:   one JSON line per RFQ written to export_path
+    """
+    source = islice(iter_packed(packed), n) if packed else iter_synthetic_rfqs(n, seed)
+    timings = {stage: 0.0 for stage in STAGES}
+    timings["generate"] = 0.0
+    invalid = processed = 0
+    with open(export_path, "w", encoding="utf-8") as out:
+        while True:
+            t0 = time.perf_counter()
+            block = list(islice(source, block_size))
+            if not block:
+                break
+            t1 = time.perf_counter()
+            parsed = [parse_mail(r["mail_text"]) for r in block]
+            records = [
+                build_record(r["request_id"], p, review=False, attachments=[parse_attachment(t) for t in r["attachment_texts"]])
+                for r, p in zip(block, parsed)
+            ]
+            t2 = time.perf_counter()
+            apply_review(records, [p.flags for p in parsed])
+            t2r = time.perf_counter()
+            result = RFQ.validate_many(records)
+            t3 = time.perf_counter()
+            buf = io.StringIO()
+            for rfq in result.valid:
+                buf.write(rfq.model_dump_json())
+                buf.write("\n")
+            out.write(buf.getvalue())
+            t4 = time.perf_counter()
+            invalid += len(result.errors)
+            processed += len(block)
+            timings["generate"] += t1 - t0
+            timings["extract"] += t2 - t1
+            timings["review"] += t2r - t2
+            timings["validate"] += t3 - t2r
+            timings["export"] += t4 - t3
+
+    row: Dict[str, float] = {"n": n, "processed": processed, "invalid": invalid}
+    for stage, seconds in timings.items():
+        row[f"{stage}_s"] = seconds
+        row[f"{stage}_rfq_per_s"] = processed / seconds if seconds else 0.0
+    pipeline = sum(timings[s] for s in STAGES)
+    row["pipeline_s"] = pipeline
+    row["pipeline_rfq_per_s"] = processed / pipeline if pipeline else 0.0
+    row["peak_rss_mb"] = peak_rss_mb()
+    return row
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: Dict[str, object], previous: Dict[str, object], tolerance: float = 0.10) -> List[str]:
+    """Return one line per stage/scale whose throughput dropped by more than tolerance."""
+    before = {row["n"]: row for row in previous.get("scales", [])}
+    regressions = []
+    for row in current["scales"]:
+        old = before.get(row["n"])
+        if old is None:
+            continue
+        for stage in STAGES + ("pipeline",):
+            key = f"{stage}_rfq_per_s"
+            if old.get(key) and row[key] < old[key] * (1 - tolerance):
+                regressions.append(
+                    f"n={row['n']} {stage}: {row[key]:.0f}/s vs {old[key]:.0f}/s ({row[key] / old[key] - 1:+.1%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[10_000], help="Corpus sizes to benchmark.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--block-size", type=int, default=10_000)
+    parser.add_argument("--packed", default="", help="Use (and create if missing or too small) one packed JSONL corpus file.")
+    parser.add_argument("--out", default="", help="Result JSON (default: export/benchmarks/bench_<timestamp>.json).")
+    parser.add_argument("--compare", default="", help="Earlier result JSON to check for throughput regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args()
+
+    if args.packed and count_packed(args.packed) < max(args.scales):
+        print(f"Packing {max(args.scales)} RFQs into {args.packed} ...")
+        write_packed(args.packed, max(args.scales), args.seed)
+
+    started = datetime.now(timezone.utc)
+    rows = []
+    for n in args.scales:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            row = pool.submit(run_scale, n, args.seed, args.packed or None, args.block_size).result()
+        rows.append(row)
+        print(
+            f"n={n}: extract {row['extract_rfq_per_s']:.0f}/s, review {row['review_rfq_per_s']:.0f}/s, validate {row['validate_rfq_per_s']:.0f}/s, "
+            f"export {row['export_rfq_per_s']:.0f}/s, pipeline {row['pipeline_rfq_per_s']:.0f}/s, "
+            f"peak RSS {row['peak_rss_mb']:.1f} MB"
+        )
+
+    report = {
+        "timestamp": started.isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "source": "packed" if args.packed else "memory",
+        "scales": rows,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"bench_{started.strftime('%Y%m%dT%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to: {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
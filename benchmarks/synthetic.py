@@ -0,0 +1,64 @@
+"""
+Synthetic RFQ corpus at any scale, built from the generators in
+scripts/generate_rfqs.py and scripts/generate_attachments.py.
+
+RFQs are produced lazily (nothing is held in memory) and can be packed into
+one JSONL file in the streaming intake format (src/intake/stream.py).
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+from typing import Dict, Iterator
+
+from scripts.generate_attachments import ATTACHMENT_TYPES, make_attachment_text
+from scripts.generate_rfqs import make_clean_email, make_contradictory_email, make_incomplete_email
+
+# Same distribution as generate_rfqs.py: 60% clean, 30% incomplete, 10% contradictory
+MIX = [(0.60, make_clean_email), (0.90, make_incomplete_email), (1.00, make_contradictory_email)]
+
+
+def iter_synthetic_rfqs(n: int, seed: int = 42) -> Iterator[Dict[str, object]]:
+    """Yield n requests {"request_id", "mail_text", "attachment_texts", "category", "dirty_flags"}."""
+    rng = random.Random(seed)
+    for i in range(1, n + 1):
+        rfq_id = f"RFQ_{i:08d}"
+        roll = rng.random()
+        make = next(fn for limit, fn in MIX if roll < limit)
+        row = make(rng, rfq_id)
+        attachments = []
+        if row["has_attachments"]:
+            types = rng.sample(ATTACHMENT_TYPES, k=rng.randint(1, 3))
+            attachments = [make_attachment_text(rng, rfq_id, t) for t in types]
+        yield {
+            "request_id": rfq_id,
+            "mail_text": row["text"],
+            "attachment_texts": attachments,
+            "category": row["category"],
+            "dirty_flags": row["dirty_flags"],
+        }
+
+
+def write_packed(path: str, n: int, seed: int = 42) -> int:
+    """Write n synthetic requests as JSONL into one file; returns the number written."""
+    with open(path, "w", encoding="utf-8") as f:
+        for request in iter_synthetic_rfqs(n, seed):
+            f.write(json.dumps(request, ensure_ascii=False))
+            f.write("\n")
+    return n
+
+
+def count_packed(path: str) -> int:
+    """Number of requests in a packed file (0 if it does not exist)."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def iter_packed(path: str) -> Iterator[Dict[str, object]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,209 @@
+"""
+KPI evaluation (docs/Erfolgskriterien.md M1–M5) of an extractor against the
+golden set or the full rfq_index.csv, with per-RFQ latency percentiles.
+
+Usage (from the repo root):
+    python -m src.evaluation.evaluate --set golden --workers 4
+    python -m src.evaluation.evaluate --set full --out export/eval_report.json --gate
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.extraction.rules import RuleExtractor
+from src.instrumentation.runlog import percentile
+from src.intake.batch import make_chunks
+from src.intake.corpus import RAW_DIR, load_rfq_texts
+from src.intake.index import CorpusIndex
+from src.models.constants import UNKNOWN
+
+GOLDEN_SET = os.path.join("data_samples", "expected", "golden_set.csv")
+
+EXTRACTORS = {
+    "rules": RuleExtractor,
+}
+
+# dirty_flags in rfq_index.csv -> RFQ field that must show up in missing_fields
+DIRTY_FLAG_FIELDS = {
+    "delivery_date": "requested_delivery_date",
+    "due_date": "response_due_date",
+    "quantity": "quantity",
+    "incoterms": "incoterms",
+    "two_quantities": "quantity",
+    "two_dates": "requested_delivery_date",
+}
+
+# MVP targets from docs/Erfolgskriterien.md
+TARGETS = {
+    "M1_valid_json_rate": (">=", 0.90),
+    "M2_review_precision": (">=", 0.80),
+    "M3_auto_approve_rate": (">=", 0.50),
+    "M4_required_field_coverage": (">=", 0.70),
+    "M5_runtime_mean_s": ("<", 10.0),
+}
+
+
+@dataclass
+class EvalCase:
+    rfq_id: str
+    expected_needs_review: bool
+    dirty_flags: str = ""
+    attachment_files: List[str] = field(default_factory=list)
+
+
+@dataclass
+class EvalRecord:
+    rfq_id: str
+    valid: bool
+    runtime_s: float
+    needs_review: Optional[bool] = None
+    missing_fields: List[str] = field(default_factory=list)
+    required_complete: bool = False
+    error: Optional[str] = None
+
+
+def load_cases(which: str = "golden", golden_path: str = GOLDEN_SET, index: Optional[CorpusIndex] = None) -> List[EvalCase]:
+    index = index or CorpusIndex.build()
+    if which == "full":
+        return [EvalCase(e.rfq_id, e.expected_needs_review, e.dirty_flags, e.attachment_files) for e in index]
+    with open(golden_path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    cases = []
+    for r in rows:
+        rfq_id = r["rfq_id"]
+        known = rfq_id in index
+        cases.append(EvalCase(
+            rfq_id,
+            r["should_needs_review"] == "True",
+            index.dirty_flags(rfq_id) if known else "",
+            index.attachments(rfq_id) if known else [],
+        ))
+    return cases
+
+
+def evaluate_case(extractor, raw_dir: str, case: EvalCase) -> EvalRecord:
+    start = time.perf_counter()
+    try:
+        mail_text, attachment_texts = load_rfq_texts(case.rfq_id, case.attachment_files, raw_dir)
+        rfq = extractor.extract(case.rfq_id, mail_text, attachment_texts)
+    except (OSError, ValueError) as e:
+        return EvalRecord(case.rfq_id, False, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+    runtime = time.perf_counter() - start
+    complete = rfq.product_or_service != UNKNOWN and rfq.specification != UNKNOWN
+    return EvalRecord(case.rfq_id, True, runtime, rfq.needs_review, list(rfq.missing_fields), complete)
+
+
+def evaluate_chunk(extractor_name: str, raw_dir: str, chunk: Sequence[EvalCase]) -> List[EvalRecord]:
+    extractor = EXTRACTORS[extractor_name]()
+    return [evaluate_case(extractor, raw_dir, case) for case in chunk]
+
+
+def run_evaluation(
+    cases: Sequence[EvalCase],
+    extractor_name: str = "rules",
+    raw_dir: str = RAW_DIR,
+    workers: int = 1,
+    chunk_size: int = 16,
+) -> Tuple[List[EvalRecord], float]:
+    """Return per-RFQ records (input order) and the wall-clock time of the run."""
+    start = time.perf_counter()
+    chunks = make_chunks(list(cases), max(1, chunk_size))
+    work = partial(evaluate_chunk, extractor_name, raw_dir)
+    if workers <= 1:
+        results = [work(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(work, chunks))
+    return [r for chunk in results for r in chunk], time.perf_counter() - start
+
+
+def _ratio(num: int, den: int) -> float:
+    return num / den if den else 0.0
+
+
+def compute_kpis(cases: Sequence[EvalCase], records: Sequence[EvalRecord], wall_s: float) -> Dict[str, object]:
+    total = len(records)
+    by_id = {c.rfq_id: c for c in cases}
+    valid = [r for r in records if r.valid]
+    flagged = [r for r in valid if r.needs_review]
+    expected_review = [r for r in valid if by_id[r.rfq_id].expected_needs_review]
+    correct = [r for r in valid if r.needs_review == by_id[r.rfq_id].expected_needs_review]
+
+    dirty = [r for r in valid if by_id[r.rfq_id].dirty_flags]
+    dirty_hits = [
+        r for r in dirty
+        if all(DIRTY_FLAG_FIELDS.get(f, f) in r.missing_fields for f in by_id[r.rfq_id].dirty_flags.split(";") if f)
+    ]
+    runtimes = sorted(r.runtime_s for r in records)
+
+    return {
+        "total": total,
+        "M1_valid_json_rate": _ratio(len(valid), total),
+        "M2_review_precision": _ratio(sum(by_id[r.rfq_id].expected_needs_review for r in flagged), len(flagged)),
+        "M3_auto_approve_rate": _ratio(len(valid) - len(flagged), total),
+        "M4_required_field_coverage": _ratio(sum(r.required_complete for r in valid), total),
+        "M5_runtime_mean_s": _ratio(sum(runtimes), total),
+        "review_recall": _ratio(sum(bool(r.needs_review) for r in expected_review), len(expected_review)),
+        "review_accuracy": _ratio(len(correct), total),
+        "dirty_flag_coverage": _ratio(len(dirty_hits), len(dirty)),
+        "latency_p50_s": percentile(runtimes, 50),
+        "latency_p95_s": percentile(runtimes, 95),
+        "latency_p99_s": percentile(runtimes, 99),
+        "throughput_rfq_per_s": _ratio(total, wall_s) if wall_s else 0.0,
+        "wall_s": wall_s,
+    }
+
+
+def check_targets(kpis: Dict[str, object]) -> Dict[str, bool]:
+    out = {}
+    for name, (op, target) in TARGETS.items():
+        value = kpis[name]
+        out[name] = value >= target if op == ">=" else value < target
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--set", choices=["golden", "full"], default="golden", help="Golden set or full rfq_index.csv.")
+    parser.add_argument("--extractor", choices=sorted(EXTRACTORS), default="rules")
+    parser.add_argument("--golden", default=GOLDEN_SET)
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--out", default="", help="Write the JSON report here.")
+    parser.add_argument("--gate", action="store_true", help="Exit with status 1 if an M1–M5 target is missed.")
+    args = parser.parse_args()
+
+    cases = load_cases(args.set, args.golden)
+    records, wall_s = run_evaluation(cases, args.extractor, args.raw_dir, args.workers, args.chunk_size)
+    kpis = compute_kpis(cases, records, wall_s)
+    passed = check_targets(kpis)
+
+    print(f"Evaluated {kpis['total']} RFQs ({args.set} set, extractor={args.extractor}, workers={args.workers})")
+    for name, value in kpis.items():
+        mark = "" if name not in passed else ("  [ok]" if passed[name] else "  [MISSED]")
+        print(f"- {name}: {value:.4g}{mark}" if isinstance(value, float) else f"- {name}: {value}{mark}")
+    for r in records:
+        if not r.valid:
+            print(f"  - {r.rfq_id}: {r.error}")
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"kpis": kpis, "targets_met": passed, "records": [asdict(r) for r in records]}, f, indent=2)
+        print(f"Report written to: {args.out}")
+    if args.gate and not all(passed.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Bulk export writers for validated RFQs: JSONL, CSV (CRM import) and Parquet.
+
+Records are buffered and flushed in batches into a few large files instead
+of one small JSON file per RFQ. Every output part is written under a
+".tmp" name and renamed when it is complete, so readers never see partial
+files. A new part is started once the current one reaches max_bytes:
+
+    export/rfqs-00001.csv, export/rfqs-00002.csv, ...
+
+Parquet needs pyarrow (optional dependency); JSONL and CSV use the stdlib.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+if TYPE_CHECKING:
+    from src.models.rfq import RFQ
+
+LIST_COLUMNS = ("missing_fields", "clarification_questions", "tasks", "certifications_required")
+CSV_LIST_SEPARATOR = ";"  # same convention as attachments_index.csv
+
+Record = Union["RFQ", Dict[str, object]]
+
+
+@lru_cache(maxsize=None)
+def columns() -> List[str]:
+    """Stable column order for the CRM = field order of the RFQ model (loaded on first use, not at import)."""
+    from src.models.rfq import RFQ
+
+    return list(RFQ.model_fields)
+
+
+def __getattr__(name: str):
+    if name == "COLUMNS":
+        return columns()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def as_dict(record: Record) -> Dict[str, object]:
+    return record if isinstance(record, dict) else record.model_dump(mode="json")
+
+
+class BatchWriter(ABC):
+    """Base class: buffering, size-based rotation and atomic finalization of parts."""
+
+    extension = ""
+
+    def __init__(self, out_dir: str = "export", basename: str = "rfqs", batch_size: int = 1000, max_bytes: int = 256 * 1024 * 1024):
+        self.out_dir = out_dir
+        self.basename = basename
+        self.batch_size = max(1, batch_size)
+        self.max_bytes = max_bytes
+        self.paths: List[str] = []  # finalized parts
+        self.records_written = 0
+        self._buffer: List[Dict[str, object]] = []
+        self._part = 0
+        self._file = None
+        self._tmp_path: Optional[str] = None
+        os.makedirs(out_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record: Record):
+        self._buffer.append(as_dict(record))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._open_part()
+        self._write_batch(self._buffer)
+        self.records_written += len(self._buffer)
+        self._buffer = []
+        if self._file.tell() >= self.max_bytes:
+            self._finish_part()
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._finish_part()
+
+    # ---- parts ----
+
+    def _final_path(self) -> str:
+        return os.path.join(self.out_dir, f"{self.basename}-{self._part:05d}{self.extension}")
+
+    def _open_part(self):
+        self._part += 1
+        while os.path.exists(self._final_path()):  # never overwrite parts from earlier runs
+            self._part += 1
+        self._tmp_path = self._final_path() + ".tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._start_part()
+
+    def _finish_part(self):
+        self._end_part()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        final = self._final_path()
+        os.replace(self._tmp_path, final)
+        self.paths.append(final)
+        self._file = self._tmp_path = None
+
+    # ---- format hooks ----
+
+    def _start_part(self):
+        pass
+
+    @abstractmethod
+    def _write_batch(self, batch: List[Dict[str, object]]):
+        """Write one batch of JSON-mode records to the open part."""
+
+    def _end_part(self):
+        pass
+
+
+class JSONLWriter(BatchWriter):
+    extension = ".jsonl"
+
+    def _write_batch(self, batch):
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch)
+        self._file.write(data.encode("utf-8"))
+
+
+class CSVWriter(BatchWriter):
+    """CSV with a header per part; list fields are joined with ';'."""
+
+    extension = ".csv"
+
+    def _start_part(self):
+        self._write_rows([columns()])
+
+    def _write_batch(self, batch):
+        rows = []
+        cols = columns()
+        for r in batch:
+            row = []
+            for c in cols:
+                v = r.get(c)
+                if c in LIST_COLUMNS:
+                    v = CSV_LIST_SEPARATOR.join(v or ())
+                row.append("" if v is None else v)
+            rows.append(row)
+        self._write_rows(rows)
+
+    def _write_rows(self, rows):
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        self._file.write(buf.getvalue().encode("utf-8"))
+
+
+class ParquetWriter(BatchWriter):
+    """One Parquet row group per batch; list fields are native list<string> columns."""
+
+    extension = ".parquet"
+
+    def __init__(self, *args, **kwargs):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from e
+        self._pa, self._pq = pa, pq
+        types = {"quantity": pa.float64(), "needs_review": pa.bool_()}
+        self.schema = pa.schema([
+            (c, pa.list_(pa.string()) if c in LIST_COLUMNS else types.get(c, pa.string()))
+            for c in columns()
+        ])
+        super().__init__(*args, **kwargs)
+
+    def _start_part(self):
+        self._pq_writer = self._pq.ParquetWriter(self._file, self.schema)
+
+    def _write_batch(self, batch):
+        data = {c: [r.get(c) for r in batch] for c in columns()}
+        self._pq_writer.write_table(self._pa.Table.from_pydict(data, schema=self.schema))
+
+    def _end_part(self):
+        self._pq_writer.close()
+
+
+WRITERS = {
+    "jsonl": JSONLWriter,
+    "csv": CSVWriter,
+    "parquet": ParquetWriter,
+}
+
+
+def open_writer(fmt: str, out_dir: str = "export", **kwargs) -> BatchWriter:
+    try:
+        cls = WRITERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown export format '{fmt}'. Use one of: {', '.join(WRITERS)}") from None
+    return cls(out_dir, **kwargs)
@@ -0,0 +1,236 @@
+"""
+Parser for the structured RFQ attachments written by scripts/generate_attachments.py.
+
+Each attachment is classified by its header line
+("Attachment: Delivery / Billing Information (RFQ_0003)") and scanned once:
+"Key: value" lines become values, "Heading:" lines followed by indented or
+plain lines up to the next blank line become blocks. Per attachment kind, a
+fact table maps the scan result to RFQ fields:
+
+    addresses  "Delivery Address" block       -> delivery_location
+               "Requested delivery window"    -> requested_delivery_date (end of the window)
+    quality    RoHS / REACH / ISO 9001 / ...  -> certifications_required
+    spec       key/value lines                -> specification (if the mail has none)
+    packaging  (no RFQ field)
+
+merge_attachments() combines the facts with the mail fields: the mail wins,
+attachments fill gaps (but not fields the mail explicitly leaves open, e.g.
+"ASAP / to be confirmed"), and disagreements are returned as conflicts and
+raised as flags (CONFLICT_FLAGS; src/review/rules.py asks the customer to
+confirm them without sending the RFQ to review).
+
+AttachmentReader reads attachment files lazily and concurrently, and skips
+files whose size and mtime are unchanged since the last parse.
+"""
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Collection, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from src.extraction.normalize import parse_date
+from src.models.constants import UNKNOWN
+
+# Header title (lower-case, without the RFQ id) -> attachment kind
+KINDS: Dict[str, str] = {
+    "technical specification": "spec",
+    "delivery / billing information": "addresses",
+    "quality & compliance requirements": "quality",
+    "packaging & labeling requirements": "packaging",
+}
+# Fallback for unknown titles: first keyword found in the title decides
+KIND_KEYWORDS = (("spec", "spec"), ("deliver", "addresses"), ("address", "addresses"), ("quality", "quality"),
+                 ("compliance", "quality"), ("packag", "packaging"), ("label", "packaging"))
+
+# Pattern (case-insensitive) -> canonical certification name, in report order
+CERTIFICATIONS = (
+    (r"rohs", "RoHS"),
+    (r"reach", "REACH"),
+    (r"iso\s*9001", "ISO 9001"),
+    (r"iso\s*14001", "ISO 14001"),
+    (r"iatf\s*16949", "IATF 16949"),
+    (r"en\s*10204(?:[\s-]*3\.[12])?", "EN 10204"),
+    (r"coc|certificate of conformity", "CoC"),
+)
+_CERTIFICATIONS = re.compile("|".join(rf"(?P<c{i}>\b(?:{p})\b)" for i, (p, _) in enumerate(CERTIFICATIONS)), re.IGNORECASE)
+
+# One alternative per line kind, as in the mail scanner of src/extraction/rules.py
+_SCANNER = re.compile(
+    r"[ \t]*+(?:"
+    r"(?P<header>Attachment:[ \t]*+(?P<title>[^(\n]*?)[ \t]*(?:\((?P<rfq_id>[^)\n]*)\))?[ \t]*\r?$)"
+    r"|(?P<block>(?P<heading>[^:\n-][^:\n]{0,40}):[ \t]*\r?$)"
+    r"|(?P<pair>(?P<key>[^:\n-][^:\n]{0,40}):[ \t]*+(?P<value>[^\n]+))"
+    r"|(?P<blank>\r?$)"
+    r"|(?P<line>[^\n]+)"
+    r")\n?",
+    re.MULTILINE,
+)
+
+
+@dataclass
+class ParsedAttachment:
+    kind: str = "unknown"
+    rfq_id: Optional[str] = None
+    values: Dict[str, str] = field(default_factory=dict)  # lower-case key -> value
+    blocks: Dict[str, List[str]] = field(default_factory=dict)  # lower-case heading -> lines
+    certifications: List[str] = field(default_factory=list)
+
+
+# Field -> flag raised when mail and attachment disagree on it
+CONFLICT_FLAGS: Dict[str, str] = {
+    "requested_delivery_date": "attachment_date_conflict",
+    "delivery_location": "attachment_location_conflict",
+}
+
+
+class Conflict(NamedTuple):
+    field: str
+    current_value: object  # value from the mail, or from an earlier attachment (source)
+    attachment_value: object
+    source: str = "mail"  # "mail" or "attachment"
+
+    @property
+    def flag(self) -> str:
+        return CONFLICT_FLAGS[self.field]
+
+
+def classify(title: str) -> str:
+    title = title.strip().lower()
+    kind = KINDS.get(title)
+    if kind is not None:
+        return kind
+    return next((k for word, k in KIND_KEYWORDS if word in title), "unknown")
+
+
+def parse_attachment(text: str) -> ParsedAttachment:
+    """Single scan: header, key/value lines, blocks and certification mentions."""
+    parsed = ParsedAttachment()
+    block: Optional[List[str]] = None
+    for m in _SCANNER.finditer(text):
+        kind = m.lastgroup
+        if kind == "header":
+            parsed.kind = classify(m.group("title"))
+            parsed.rfq_id = (m.group("rfq_id") or "").strip() or None
+            block = None
+        elif kind == "block":
+            block = parsed.blocks.setdefault(m.group("heading").strip().lower(), [])
+        elif kind == "pair":
+            if block is not None and not block:  # "Heading:" directly followed by "Key: value" is not a block
+                block = None
+            parsed.values.setdefault(m.group("key").strip().lower(), m.group("value").strip())
+        elif kind == "line":
+            if block is not None:
+                block.append(m.group("line").strip())
+        elif kind == "blank":
+            block = None
+    if parsed.kind == "quality":
+        seen = {CERTIFICATIONS[int(c.lastgroup[1:])][1] for c in _CERTIFICATIONS.finditer(text)}
+        parsed.certifications = [name for _, name in CERTIFICATIONS if name in seen]
+    return parsed
+
+
+# ---- facts and merge ----
+
+def attachment_facts(att: ParsedAttachment) -> Dict[str, object]:
+    """RFQ field values stated by one attachment."""
+    facts: Dict[str, object] = {}
+    if att.kind == "addresses":
+        address = att.blocks.get("delivery address")
+        if address:
+            facts["delivery_location"] = ", ".join(address)
+        window = att.values.get("requested delivery window")
+        if window:
+            value = parse_date(window)
+            if value.end is not None:
+                facts["requested_delivery_date"] = value.iso
+    elif att.kind == "quality":
+        if att.certifications:
+            facts["certifications_required"] = list(att.certifications)
+    elif att.kind == "spec":
+        if att.values:
+            facts["specification"] = "; ".join(f"{k.capitalize()}: {v}" for k, v in att.values.items())
+    return facts
+
+
+def _same_location(mail_value: str, attachment_value: str) -> bool:
+    """The mail usually names the city ('Hamburg, DE'); the attachment the full address."""
+    city = mail_value.split(",")[0].strip().lower()
+    return bool(city) and city in attachment_value.lower()
+
+
+def merge_attachments(
+    values: Dict[str, object],
+    flags: Set[str],
+    attachments: Sequence[ParsedAttachment],
+    stated_missing: Collection[str] = (),
+) -> List[Conflict]:
+    """
+    Merge attachment facts into the mail values in place (mail first, then
+    attachments in order). Returns the conflicts between mail and attachments.
+
+    stated_missing: fields the mail labels as not given ("ASAP / to be
+    confirmed"); they stay open, the customer has to state them.
+    """
+    conflicts: List[Conflict] = []
+    filled: Set[str] = set()  # fields whose current value came from an attachment
+    for att in attachments:
+        for name, value in attachment_facts(att).items():
+            if name in stated_missing:
+                continue
+            current = values.get(name)
+            source = "attachment" if name in filled else "mail"
+            if current is None or current == UNKNOWN:
+                values[name] = value
+                filled.add(name)
+            elif name == "certifications_required":
+                values[name] = list(dict.fromkeys([*current, *value]))
+            elif name == "requested_delivery_date":
+                window = parse_date(att.values["requested delivery window"])  # memoized
+                if not window.start <= date.fromisoformat(current) <= window.end:
+                    conflicts.append(Conflict(name, current, att.values["requested delivery window"], source))
+                    flags.add(CONFLICT_FLAGS[name])
+            elif name == "delivery_location":
+                same = _same_location(str(current), str(value)) if source == "mail" else str(current).lower() == str(value).lower()
+                if not same:
+                    conflicts.append(Conflict(name, current, value, source))
+                    flags.add(CONFLICT_FLAGS[name])
+            # specification: the mail text stays authoritative, the attachment only fills gaps
+    return conflicts
+
+
+# ---- files ----
+
+class AttachmentReader:
+    """
+    Parses attachment files with a (size, mtime)-keyed cache: unchanged files
+    are not read again. With an executor, the files of one RFQ are read and
+    parsed concurrently.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_entries: int = 100_000):
+        self.executor = executor
+        self.max_entries = max_entries
+        self._cache: Dict[str, Tuple[int, int, ParsedAttachment]] = {}
+        self.parsed = self.skipped = 0
+
+    def parse_file(self, path: str) -> ParsedAttachment:
+        st = os.stat(path)
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            self.skipped += 1
+            return cached[2]
+        with open(path, "r", encoding="utf-8") as f:
+            parsed = parse_attachment(f.read())
+        if len(self._cache) >= self.max_entries:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[path] = (st.st_size, st.st_mtime_ns, parsed)
+        self.parsed += 1
+        return parsed
+
+    def parse_files(self, paths: Sequence[str]) -> List[ParsedAttachment]:
+        if self.executor is None or len(paths) < 2:
+            return [self.parse_file(p) for p in paths]
+        return list(self.executor.map(self.parse_file, paths))
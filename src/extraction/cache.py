@@ -0,0 +1,273 @@
+"""
+Content-addressed extraction cache (SQLite) in front of any extractor.
+
+Key:   sha256(normalized mail text + sorted normalized attachment texts
+              + extractor version + RFQ schema fingerprint)
+Value: validated RFQ JSON
+
+Re-sends and forwards of the same RFQ cost one indexed lookup instead of an
+extraction. The schema fingerprint is stored in the database; opening a cache
+written for a different RFQ schema clears it.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.models.rfq import RFQ
+
+DEFAULT_PATH = os.path.join(".cache", "extraction.sqlite")
+
+_QUOTE_PREFIX = re.compile(r"^(?:[ \t]*>)+[ \t]?", re.MULTILINE)
+_SPACES = re.compile(r"[ \t ]+")
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form for hashing: NFC, '\\n' line ends, no quote markers, collapsed whitespace."""
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    text = _QUOTE_PREFIX.sub("", text)
+    text = "\n".join(_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+@lru_cache(maxsize=None)
+def schema_fingerprint(model: type = RFQ) -> str:
+    schema = json.dumps(model.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(schema.encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(mail_text: str, attachment_texts: Sequence[str] = (), extractor_version: str = "", schema: str = "") -> str:
+    h = hashlib.sha256()
+    for part in (extractor_version, schema or schema_fingerprint(), normalize_text(mail_text)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    for att in sorted(normalize_text(a) for a in attachment_texts):
+        h.update(att.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# entries plus a one-row totals table kept exact by triggers, so that every
+# process sharing the file sees the same entry count and size
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)",
+    "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_used)",
+    "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), count INTEGER NOT NULL, bytes INTEGER NOT NULL)",
+    "CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN"
+    " UPDATE totals SET count = count + 1, bytes = bytes + NEW.size; END",
+    "CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN"
+    " UPDATE totals SET count = count - 1, bytes = bytes - OLD.size; END",
+    "CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN"
+    " UPDATE totals SET bytes = bytes + NEW.size - OLD.size; END",
+    # caches written before the totals table existed
+    "INSERT OR IGNORE INTO totals SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM entries",
+)
+
+
+class ExtractionCache:
+    """
+    SQLite-backed LRU cache of RFQ JSON by content key.
+
+    max_entries / max_bytes bound the cache; the least recently used entries
+    are evicted first. Several processes may share one file: entry count and
+    size are kept in the database and read inside the eviction transaction.
+    Hits queue their last_used update, which is written with the next put,
+    every TOUCH_BATCH hits or on close. A locked or unreadable database makes
+    get() miss and put() a no-op. hits, misses and evictions are counted per
+    instance.
+    """
+
+    TOUCH_BATCH = 256
+
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = 1_000_000, max_bytes: Optional[int] = None,
+                 timeout: float = 30.0):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._touched: Dict[str, int] = {}  # key -> last_used not written yet
+        self._clock = 0
+        self._totals = (0, 0)  # (entries, bytes) as last read from the database
+
+        self.db = sqlite3.connect(path, isolation_level=None, timeout=timeout)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction():
+            for statement in _SCHEMA:
+                self.db.execute(statement)
+            schema = schema_fingerprint()
+            row = self.db.execute("SELECT value FROM meta WHERE name = 'schema'").fetchone()
+            if row is None or row[0] != schema:
+                self.db.execute("DELETE FROM entries")
+                self.db.execute("INSERT OR REPLACE INTO meta VALUES ('schema', ?)", (schema,))
+
+    @contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front: the totals read for eviction
+        # cannot go stale before the deletes
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def _tick(self) -> int:
+        # wall clock, so that last_used is comparable between processes
+        self._clock = max(time.time_ns(), self._clock + 1)
+        return self._clock
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            row = self.db.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched[key] = self._tick()
+        if len(self._touched) >= self.TOUCH_BATCH:
+            self.flush()
+        return row[0]
+
+    def put(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        try:
+            with self._transaction():
+                self._write_touches()
+                self.db.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?) ON CONFLICT(key) DO UPDATE"
+                    " SET value = excluded.value, size = excluded.size, last_used = excluded.last_used",
+                    (key, value, size, self._tick()),
+                )
+                self._evict()
+        except sqlite3.Error:
+            pass
+
+    def flush(self):
+        """Write the queued last_used updates of recent hits."""
+        if not self._touched:
+            return
+        try:
+            with self._transaction():
+                self._write_touches()
+        except sqlite3.Error:
+            self._touched.clear()  # recency is best effort
+
+    def _write_touches(self):
+        touched, self._touched = self._touched, {}
+        self.db.executemany("UPDATE entries SET last_used = ? WHERE key = ?", [(t, k) for k, t in touched.items()])
+
+    def _evict(self):
+        while True:
+            count, size = self._read_totals()
+            over = count - self.max_entries
+            if over <= 0 and not (self.max_bytes is not None and size > self.max_bytes and count > 1):
+                return
+            rows = self.db.execute("SELECT key FROM entries ORDER BY last_used LIMIT ?", (max(over, 1),)).fetchall()
+            self.db.executemany("DELETE FROM entries WHERE key = ?", rows)
+            self.evictions += len(rows)
+
+    def _read_totals(self) -> Tuple[int, int]:
+        try:
+            self._totals = self.db.execute("SELECT count, bytes FROM totals").fetchone()
+        except sqlite3.ProgrammingError:
+            pass  # closed: keep the last values for stats()
+        return self._totals
+
+    def clear(self):
+        self._touched.clear()
+        with self._transaction():
+            self.db.execute("DELETE FROM entries")
+
+    def stats(self) -> Dict[str, float]:
+        count, size = self._read_totals()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self.flush()
+        self._read_totals()
+        self.db.close()
+
+    def __len__(self) -> int:
+        return self._read_totals()[0]
+
+
+class CachedExtractor:
+    """
+    Wraps an extractor with an ExtractionCache.
+
+    extract() serves sync extractors (e.g. RuleExtractor), extract_many() async
+    ones (e.g. LLMExtractor); on a hit the cached RFQ gets the new request_id.
+    """
+
+    def __init__(self, extractor, cache: ExtractionCache):
+        self.extractor = extractor
+        self.cache = cache
+        self.name = f"cached-{getattr(extractor, 'name', type(extractor).__name__)}"
+        self.version = getattr(extractor, "version", type(extractor).__name__)
+
+    def key(self, mail_text: str, attachment_texts: Sequence[str]) -> str:
+        return cache_key(mail_text, attachment_texts, self.version)
+
+    def _lookup(self, key: str, request_id: str) -> Optional[RFQ]:
+        value = self.cache.get(key)
+        if value is None:
+            return None
+        return RFQ.model_validate_json(value).model_copy(update={"request_id": request_id})
+
+    def extract(self, request_id: str, mail_text: str, attachment_texts: Sequence[str] = ()) -> RFQ:
+        key = self.key(mail_text, attachment_texts)
+        rfq = self._lookup(key, request_id)
+        if rfq is None:
+            rfq = self.extractor.extract(request_id, mail_text, attachment_texts)
+            self.cache.put(key, rfq.model_dump_json())
+        return rfq
+
+    async def extract_many(self, requests: Sequence) -> List:
+        from src.extraction.llm import ExtractionResult
+
+        results: List[Optional[ExtractionResult]] = []
+        pending: Dict[str, List[int]] = {}  # key -> positions waiting for that content
+        misses = []
+        for rid, mail_text, attachment_texts in requests:
+            key = self.key(mail_text, attachment_texts)
+            rfq = None if key in pending else self._lookup(key, rid)
+            if rfq is None:
+                if key not in pending:
+                    pending[key] = []
+                    misses.append((rid, mail_text, attachment_texts))
+                pending[key].append(len(results))
+            results.append(ExtractionResult(rid, rfq=rfq) if rfq is not None else None)
+        if misses:
+            for key, result in zip(pending, await self.extractor.extract_many(misses)):
+                if result.rfq is not None:
+                    self.cache.put(key, result.rfq.model_dump_json())
+                for pos in pending[key]:
+                    rid = requests[pos][0]
+                    if result.rfq is None or rid == result.request_id:
+                        results[pos] = ExtractionResult(rid, rfq=result.rfq, error=result.error)
+                    else:
+                        results[pos] = ExtractionResult(rid, rfq=result.rfq.model_copy(update={"request_id": rid}))
+        return results
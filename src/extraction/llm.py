@@ -0,0 +1,213 @@
+"""
+Async Extractor adapter for an HTTP LLM provider (see docs/tooling_stack.md:
+input mail_text + attachment_texts, output strict RFQ JSON).
+
+- one pooled keep-alive HTTP/1.1 client (stdlib asyncio streams, no extra dependency)
+- a semaphore caps the number of requests in flight
+- per-request timeout, retries with exponential backoff + full jitter
+- RFQs are sent in batches of batch_size per HTTP request
+
+The wire format matches src/extraction/stub_server.py:
+    POST /v1/extract {"requests": [{"request_id", "mail_text", "attachment_texts"}, ...]}
+    -> {"results": [{"request_id", "rfq": {...}} | {"request_id", "error": "..."}, ...]}
+A request may name the fields it needs ("fields": [...], see
+src/extraction/tiered.py); providers can use it to shorten the answer.
+Subclass LLMExtractor and override build_payload/parse_response for another provider.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from src.extraction.normalize import normalize_fields
+from src.models.rfq import RFQ
+
+EXTRACTOR_VERSION = "llm-1"
+
+# (request_id, mail_text, attachment_texts[, fields to extract])
+ExtractionRequest = Tuple[str, str, Sequence[str]]
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+
+
+@dataclass
+class ExtractionResult:
+    request_id: str
+    rfq: Optional[RFQ] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.rfq is not None
+
+
+class ConnectionPool:
+    """Minimal keep-alive HTTP/1.1 client pool for one host."""
+
+    def __init__(self, host: str, port: int, max_connections: int = 100):
+        self.host = host
+        self.port = port
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def request(self, method: str, path: str, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes]:
+        async with self._slots:
+            reader, writer = self._idle.pop() if self._idle else await asyncio.open_connection(self.host, self.port)
+            try:
+                status, data, keep_alive = await self._roundtrip(reader, writer, method, path, body, headers or {})
+            except BaseException:  # includes cancellation by a timeout: the connection state is unknown
+                writer.close()
+                raise
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, data
+
+    async def _roundtrip(self, reader, writer, method, path, body, headers):
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(body)}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server.")
+        status = int(status_line.split()[1])
+        length = 0
+        keep_alive = True
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "connection" and value.strip().lower() == "close":
+                keep_alive = False
+        data = await reader.readexactly(length) if length else b""
+        return status, data, keep_alive
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class LLMExtractor:
+    """Async extractor; use as `async with LLMExtractor(url) as ex: await ex.extract_many(requests)`."""
+
+    name = "llm"
+    version = EXTRACTOR_VERSION
+
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:8765",
+        path: str = "/v1/extract",
+        concurrency: int = 100,
+        batch_size: int = 8,
+        timeout: float = 60.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        parts = urlsplit(base_url)
+        self.pool = ConnectionPool(parts.hostname or "127.0.0.1", parts.port or 80, max_connections=concurrency)
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self._in_flight = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.pool.close()
+
+    # ---- provider hooks ----
+
+    def build_payload(self, batch: Sequence[ExtractionRequest]) -> bytes:
+        requests = []
+        for rid, mail, atts, *fields in batch:
+            request = {"request_id": rid, "mail_text": mail, "attachment_texts": list(atts)}
+            if fields:
+                request["fields"] = list(fields[0])
+            requests.append(request)
+        return json.dumps({"requests": requests}).encode("utf-8")
+
+    def parse_response(self, batch: Sequence[ExtractionRequest], body: bytes) -> List[ExtractionResult]:
+        doc = json.loads(body)
+        results = doc.get("results") if isinstance(doc, dict) else None
+        if not isinstance(results, list):
+            raise ValueError("Response has no 'results' list.")
+        by_id = {r.get("request_id"): r for r in results if isinstance(r, dict)}  # other entries: no result for that id
+        out = []
+        for rid, *_ in batch:
+            r = by_id.get(rid)
+            if r is None:
+                out.append(ExtractionResult(rid, error="No result returned."))
+            elif "rfq" in r:
+                rfq = r["rfq"]
+                try:
+                    # free-form dates/quantities ("KW 12", "1.000 pcs") are normalized before strict validation
+                    out.append(ExtractionResult(rid, rfq=RFQ.model_validate(normalize_fields(rfq) if isinstance(rfq, dict) else rfq)))
+                except (TypeError, ValueError) as e:
+                    out.append(ExtractionResult(rid, error=f"{type(e).__name__}: {e}"))
+            else:
+                out.append(ExtractionResult(rid, error=str(r.get("error", "Unknown error."))))
+        return out
+
+    # ---- requests ----
+
+    async def _post(self, payload: bytes) -> bytes:
+        for attempt in range(self.retries + 1):
+            try:
+                status, body = await asyncio.wait_for(
+                    self.pool.request("POST", self.path, payload, self.headers), self.timeout
+                )
+                if status == 200:
+                    return body
+                if status not in RETRY_STATUS or attempt == self.retries:
+                    raise HTTPError(status, body)
+            except (asyncio.TimeoutError, ConnectionError, OSError, asyncio.IncompleteReadError):
+                if attempt == self.retries:
+                    raise
+            # exponential backoff with full jitter
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+        raise AssertionError("unreachable")
+
+    async def extract_batch(self, batch: Sequence[ExtractionRequest]) -> List[ExtractionResult]:
+        async with self._in_flight:
+            try:
+                body = await self._post(self.build_payload(batch))
+                return self.parse_response(batch, body)
+            except (HTTPError, asyncio.TimeoutError, ConnectionError, OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                # AttributeError/TypeError: a parse_response override choking on a malformed body
+                error = f"{type(e).__name__}: {e}"
+                return [ExtractionResult(rid, error=error) for rid, *_ in batch]
+
+    async def extract_many(self, requests: Sequence[ExtractionRequest]) -> List[ExtractionResult]:
+        """Extract all requests concurrently; results keep the input order and never raise."""
+        batches = [requests[i:i + self.batch_size] for i in range(0, len(requests), self.batch_size)]
+        results = await asyncio.gather(*(self.extract_batch(b) for b in batches))
+        return [r for batch in results for r in batch]
+
+    async def extract(self, request_id: str, mail_text: str, attachment_texts: Sequence[str] = ()) -> RFQ:
+        result = (await self.extract_batch([(request_id, mail_text, attachment_texts)]))[0]
+        if result.rfq is None:
+            raise ValueError(f"Extraction failed for {request_id}: {result.error}")
+        return result.rfq
@@ -0,0 +1,252 @@
+"""
+Normalization of the date and quantity values found in RFQ mails and
+attachments (docs/Erfolgskriterien.md Q2: "1.000", "1000 pcs", several dates).
+
+Dates: one precompiled regex with one alternative per format; the matching
+alternative selects its handler from a table. Supported (German and English):
+    2026-03-15, 15.03.2026, 15.03.26, 15/03/2026, 15. März 2026, March 15, 2026,
+    KW 12 / CW 12/2026 / week 12, Mitte März / mid-March / Ende Mai 2026,
+    März 2026, ASAP / sofort, and windows "2026-04-06 to 2026-05-16" / "... bis ...".
+Dates without a year are placed on or after the reference date ("today").
+
+Quantities: thousands separators (1.000 / 1,000 / 1'000 / 1 000), decimal
+commas (2,5) and unit aliases (Stück, Stk, pieces -> pcs).
+
+Results are memoized per (text, reference date); repeated tokens such as
+"ASAP" or "1000 pcs" are parsed once per process.
+"""
+from __future__ import annotations
+
+import calendar
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from src.models.constants import UNKNOWN
+
+MONTHS: Dict[str, int] = {
+    "januar": 1, "january": 1, "jan": 1, "jänner": 1,
+    "februar": 2, "february": 2, "feb": 2,
+    "märz": 3, "maerz": 3, "march": 3, "mär": 3, "mrz": 3, "mar": 3,
+    "april": 4, "apr": 4,
+    "mai": 5, "may": 5,
+    "juni": 6, "june": 6, "jun": 6,
+    "juli": 7, "july": 7, "jul": 7,
+    "august": 8, "aug": 8,
+    "september": 9, "sept": 9, "sep": 9,
+    "oktober": 10, "october": 10, "okt": 10, "oct": 10,
+    "november": 11, "nov": 11,
+    "dezember": 12, "december": 12, "dez": 12, "dec": 12,
+}
+
+# Part of a month -> (first day, last day); None = last day of the month
+MONTH_PARTS: Dict[str, Tuple[int, Optional[int]]] = {
+    "anfang": (1, 10), "beginning of": (1, 10), "start of": (1, 10), "early": (1, 10),
+    "mitte": (11, 20), "middle of": (11, 20), "mid": (11, 20),
+    "ende": (21, None), "end of": (21, None), "late": (21, None),
+}
+
+UNITS: Dict[str, str] = {
+    "pcs": "pcs", "pc": "pcs", "piece": "pcs", "pieces": "pcs", "stück": "pcs", "stueck": "pcs", "stk": "pcs", "st": "pcs",
+    "units": "units", "unit": "units", "einheiten": "units",
+    "sets": "sets", "set": "sets", "satz": "sets",
+    "kg": "kg", "kilogram": "kg", "g": "g", "t": "t", "tons": "t",
+    "m": "m", "meter": "m", "metres": "m", "meters": "m", "metre": "m",
+    "l": "l", "liter": "l", "litres": "l", "liters": "l",
+}
+
+_MONTH = "|".join(sorted((re.escape(m) for m in MONTHS), key=len, reverse=True))
+_PART = "|".join(sorted((p.replace(" ", r"\s+") for p in MONTH_PARTS), key=len, reverse=True))
+
+# (kind, pattern); group names are prefixed with the kind so they stay unique in the alternation
+_DATE_PATTERNS = (
+    ("iso", r"(?P<iso_y>\d{4})-(?P<iso_m>\d{1,2})-(?P<iso_d>\d{1,2})(?!\d)"),
+    ("dmy", r"(?P<dmy_d>\d{1,2})[./](?P<dmy_m>\d{1,2})(?:[./](?P<dmy_y>\d{4}|\d{2})(?!\d)|\.)"),
+    ("dmony", rf"(?P<dmony_d>\d{{1,2}})\.?\s*(?P<dmony_m>{_MONTH})\.?(?:,?\s*(?P<dmony_y>\d{{4}}))?(?![\w])"),
+    ("mdy", rf"(?P<mdy_m>{_MONTH})\.?\s+(?P<mdy_d>\d{{1,2}})(?:st|nd|rd|th)?(?!\d)(?:,?\s*(?P<mdy_y>\d{{4}}))?"),
+    ("part", rf"(?P<part_p>{_PART})[\s-]*(?:of\s+)?(?P<part_m>{_MONTH})\.?(?:\s*(?P<part_y>\d{{4}}))?(?![\w])"),
+    ("month", rf"(?P<month_m>{_MONTH})\.?\s*(?P<month_y>\d{{4}})(?!\d)"),
+    ("week", r"(?:KW|CW|WK|Kalenderwoche|calendar\s+week|week)\s*\.?\s*(?P<week_w>\d{1,2})(?:\s*[/']\s*(?P<week_y>\d{4}|\d{2}))?(?!\d)"),
+    ("asap", r"asap|a\.s\.a\.p\.?|as\s+soon\s+as\s+possible|sofort|umgehend|schnellstmöglich|baldmöglichst|immediately"),
+)
+_DATES = re.compile(
+    "|".join(rf"(?P<{kind}>(?<![\w]){pattern})" for kind, pattern in _DATE_PATTERNS),
+    re.IGNORECASE,
+)
+_WINDOW_SEPARATOR = re.compile(r"\s*(?:to|bis(?:\s+zum)?|until|till|through|and|-|–|—)\s*", re.IGNORECASE)
+
+_NUMBER_UNIT = re.compile(r"(\d(?:[\d.,']|[   ](?=\d{3}(?!\d)))*)[ \t]*([^\W\d_][\w.]*)?")
+_THOUSANDS = re.compile(r"\d{1,3}(?:([.,'   ])\d{3})(?:\1\d{3})*")
+
+
+class DateValue(NamedTuple):
+    """A parsed date expression: kind plus the earliest and latest day it allows."""
+
+    kind: str  # date | week | month_part | month | window | asap | unknown
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    @property
+    def iso(self) -> str:
+        """Value for the RFQ date fields: the latest acceptable day, or 'unknown'."""
+        return self.end.isoformat() if self.end is not None else UNKNOWN
+
+
+UNKNOWN_DATE = DateValue("unknown")
+
+
+def _year(y: Optional[str], month: int, day: int, today: date) -> int:
+    if y:
+        return int(y) + 2000 if len(y) == 2 else int(y)
+    year = today.year
+    try:
+        return year + 1 if date(year, month, day) < today else year
+    except ValueError:
+        return year
+
+
+def _day(y: Optional[str], m: int, d: int, today: date) -> DateValue:
+    try:
+        day = date(_year(y, m, d, today), m, d)
+    except ValueError:
+        return UNKNOWN_DATE
+    return DateValue("date", day, day)
+
+
+def _month_days(year: int, month: int, first: int = 1, last: Optional[int] = None) -> DateValue:
+    end = calendar.monthrange(year, month)[1] if last is None else last
+    return DateValue("month", date(year, month, first), date(year, month, end))
+
+
+def _iso(m, today):
+    return _day(m["iso_y"], int(m["iso_m"]), int(m["iso_d"]), today)
+
+
+def _dmy(m, today):
+    return _day(m["dmy_y"], int(m["dmy_m"]), int(m["dmy_d"]), today)
+
+
+def _dmony(m, today):
+    return _day(m["dmony_y"], MONTHS[m["dmony_m"].lower()], int(m["dmony_d"]), today)
+
+
+def _mdy(m, today):
+    return _day(m["mdy_y"], MONTHS[m["mdy_m"].lower()], int(m["mdy_d"]), today)
+
+
+def _part(m, today):
+    month = MONTHS[m["part_m"].lower()]
+    first, last = MONTH_PARTS[re.sub(r"\s+", " ", m["part_p"].lower())]
+    year = _year(m["part_y"], month, calendar.monthrange(today.year, month)[1], today)
+    days = _month_days(year, month, first, last)
+    return DateValue("month_part", days.start, days.end)
+
+
+def _month(m, today):
+    return _month_days(int(m["month_y"]), MONTHS[m["month_m"].lower()])
+
+
+def _week(m, today):
+    week, y = int(m["week_w"]), m["week_y"]
+    if y:
+        year = int(y) + 2000 if len(y) == 2 else int(y)
+    else:
+        year = today.year if week >= today.isocalendar()[1] else today.year + 1
+    try:
+        monday = date.fromisocalendar(year, week, 1)
+    except ValueError:
+        return UNKNOWN_DATE
+    return DateValue("week", monday, monday + timedelta(days=6))
+
+
+def _asap(m, today):
+    return DateValue("asap")
+
+
+_HANDLERS: Dict[str, Callable] = {
+    "iso": _iso, "dmy": _dmy, "dmony": _dmony, "mdy": _mdy,
+    "part": _part, "month": _month, "week": _week, "asap": _asap,
+}
+
+
+@lru_cache(maxsize=65536)
+def _parse_date(text: str, today_ordinal: int) -> DateValue:
+    today = date.fromordinal(today_ordinal)
+    matches = _DATES.finditer(text)
+    first = next(matches, None)
+    if first is None:
+        return UNKNOWN_DATE
+    value = _HANDLERS[first.lastgroup](first, today)
+    second = next(matches, None)
+    # "X to Y" / "X bis Y" / "X - Y": a window from the start of X to the end of Y
+    if second is not None and value.start and _WINDOW_SEPARATOR.fullmatch(text, first.end(), second.start()):
+        other = _HANDLERS[second.lastgroup](second, today)
+        if other.end and other.end >= value.start:
+            return DateValue("window", value.start, other.end)
+    return value
+
+
+def parse_date(text: Optional[str], today: Optional[date] = None) -> DateValue:
+    """First date expression in text (or the window it opens)."""
+    if not text:
+        return UNKNOWN_DATE
+    return _parse_date(text, (today or date.today()).toordinal())
+
+
+def rfq_date(text: Optional[str], today: Optional[date] = None) -> str:
+    """ISO date for the RFQ date fields, or 'unknown' (ASAP, placeholders, nothing parseable)."""
+    return parse_date(text, today).iso
+
+
+def _number(token: str) -> Optional[float]:
+    token = token.rstrip(".,'   ")
+    if _THOUSANDS.fullmatch(token):
+        token = re.sub(r"[.,'   ]", "", token)
+    elif "," in token and "." in token:  # 1.000,5 (German) or 1,000.5 (English): the last one is the decimal mark
+        decimal = "," if token.rfind(",") > token.rfind(".") else "."
+        token = token.replace("." if decimal == "," else ",", "").replace(decimal, ".")
+    else:
+        token = token.replace(",", ".").replace("'", "")
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=65536)
+def parse_quantity(value: str) -> Tuple[Optional[float], Optional[str]]:
+    """'1.000 pcs' -> (1000.0, 'pcs'), '2,5 kg' -> (2.5, 'kg'); (None, None) if no number is found."""
+    m = _NUMBER_UNIT.search(value)
+    if m is None:
+        return None, None
+    qty = _number(m.group(1))
+    if qty is None:
+        return None, None
+    unit = m.group(2)
+    if unit:
+        unit = UNITS.get(unit.rstrip(".").lower(), unit)
+    return qty, unit
+
+
+DATE_FIELDS = ("requested_delivery_date", "response_due_date")
+
+
+def normalize_fields(record: Dict[str, object], today: Optional[date] = None) -> Dict[str, object]:
+    """
+    Copy of an RFQ-shaped dict with free-form dates and quantities normalized,
+    e.g. for extractor output before RFQ.model_validate. Values that already
+    fit the RFQ model are left unchanged.
+    """
+    out = dict(record)
+    for name in DATE_FIELDS:
+        value = out.get(name)
+        if isinstance(value, str) and value != UNKNOWN:
+            out[name] = rfq_date(value, today)
+    quantity = out.get("quantity")
+    if isinstance(quantity, str):
+        qty, unit = parse_quantity(quantity)
+        out["quantity"] = qty
+        if unit and not out.get("quantity_unit"):
+            out["quantity_unit"] = unit
+    return out
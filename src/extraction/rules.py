@@ -0,0 +1,237 @@
+"""
+Deterministic rule-based extractor for the bullet-style RFQ mails
+produced by scripts/generate_rfqs.py ("- Quantity: ...", "- Incoterms: ...").
+
+The whole mail is scanned once by a single precompiled regex; every match
+is dispatched through a label table instead of running one regex per field.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set
+
+from src.extraction.attachments import Conflict, ParsedAttachment, merge_attachments, parse_attachment
+from src.extraction.normalize import parse_quantity, rfq_date
+from src.models.constants import UNKNOWN
+from src.review.rules import QUESTIONS, review_fields
+
+if TYPE_CHECKING:
+    from src.models.rfq import RFQ
+
+EXTRACTOR_VERSION = "rules-4"  # part of the extraction cache key: bump it whenever the rule output changes
+
+# Bullet label (lower-case) -> RFQ field name
+LABELS: Dict[str, str] = {
+    "product/service": "product_or_service",
+    "product": "product_or_service",
+    "service": "product_or_service",
+    "specification": "specification",
+    "spec": "specification",
+    "quantity": "quantity",
+    "qty": "quantity",
+    "requested delivery date": "requested_delivery_date",
+    "delivery date": "requested_delivery_date",
+    "delivery location": "delivery_location",
+    "delivery address": "delivery_location",
+    "incoterms": "incoterms",
+    "incoterm": "incoterms",
+    "response due date": "response_due_date",
+    "quotation due date": "response_due_date",
+    "contact": "contact_name",
+    "contact person": "contact_name",
+    "email": "contact_email",
+    "e-mail": "contact_email",
+    "customer": "customer_name",
+    "company": "customer_name",
+}
+
+INCOTERMS = frozenset({"EXW", "FCA", "CPT", "CIP", "DAP", "DPU", "DDP", "FAS", "FOB", "CFR", "CIF"})
+
+
+# One alternation per line kind; the trailing catch-all consumes every other
+# line so finditer advances line by line instead of probing each character.
+_SCANNER = re.compile(
+    r"[ \t]*+(?:"
+    r"[-*•][ \t]*+(?P<label>[^:\n]{1,40}+):(?P<value>[^\n]*+)"
+    r"|Subject:(?P<subject>[^\n]*+)"
+    r"|(?P<closing>(?:(?:[Bb]est|[Kk]ind|[Ww]arm)[ \t]+)?[Rr]egards|[Tt]hanks|[Tt]hank you|[Cc]heers|[Ss]incerely"
+    r"|[Mm]it freundlichen [Gg]rüßen|[Vv]iele [Gg]rüße|[Bb]este [Gg]rüße)[ \t]*+,?[ \t]*+\r?(?=\n|$)"
+    r"|[^\n]*+)\n?"
+)
+_SUBJECT_ID = re.compile(r"\bRFQ[ \t]+(\S+)")
+_PLACEHOLDER_WORDS = ("asap", "to be confirmed", "tbc", "tbd", "n/a", "unknown", "not specified", "no deadline")
+_ALTERNATIVE_WORDS = ("alternatively", "also provide pricing for")
+
+# Signature lines that name a role, not the customer
+_ROLE_LINES = frozenset({
+    "procurement", "purchasing", "purchase", "sales", "buyer", "einkauf", "logistics", "team",
+    "procurement team", "purchasing team", "purchasing department", "procurement department",
+})
+
+
+@dataclass
+class ParsedMail:
+    """Field values found in one mail plus the contradiction flags raised while parsing."""
+
+    values: Dict[str, object] = field(default_factory=dict)
+    flags: Set[str] = field(default_factory=set)
+    raw: Dict[str, str] = field(default_factory=dict)  # labelled text behind each field, also when it did not parse
+    conflicts: List[Conflict] = field(default_factory=list)  # mail vs. attachment, set by build_record
+    subject_id: Optional[str] = None
+
+
+def is_placeholder(value: str) -> bool:
+    """True for '(not specified)', 'ASAP / to be confirmed' and similar non-values."""
+    if not value or value[0] == "(":
+        return True
+    low = value.lower()
+    return any(w in low for w in _PLACEHOLDER_WORDS)
+
+
+def has_alternative(value: str) -> bool:
+    """True if a value offers a second option ('alternatively ...', 'also provide pricing for ...')."""
+    low = value.lower()
+    return any(w in low for w in _ALTERNATIVE_WORDS)
+
+
+def _signature_name(text: str, start: int) -> Optional[str]:
+    for line in text[start:].splitlines():
+        line = line.strip()
+        if line and line.lower() not in _ROLE_LINES:
+            return line
+    return None
+
+
+def parse_mail(text: str) -> ParsedMail:
+    """Single pass over the mail text; the first occurrence of a field wins."""
+    parsed = ParsedMail()
+    values = parsed.values
+    closing_end = None
+
+    for m in _SCANNER.finditer(text):
+        kind = m.lastgroup
+        if kind is None:
+            continue
+        if kind == "value":
+            name = LABELS.get(m.group("label").strip().lower())
+            if name is None or name in values:
+                continue
+            raw = m.group("value").strip()
+            parsed.raw[name] = raw
+
+            if name == "quantity":
+                if has_alternative(raw):
+                    parsed.flags.add("two_quantities")
+                if is_placeholder(raw):
+                    continue
+                qty, unit = parse_quantity(raw)
+                if qty is not None:
+                    values["quantity"] = qty
+                    if unit:
+                        values["quantity_unit"] = unit
+            elif name == "requested_delivery_date" or name == "response_due_date":
+                if name == "requested_delivery_date" and has_alternative(raw):
+                    parsed.flags.add("two_dates")
+                values[name] = rfq_date(raw)
+            elif name == "incoterms":
+                if is_placeholder(raw):
+                    continue
+                code = raw.split(None, 1)[0].upper().rstrip(".,;")
+                if code in INCOTERMS:
+                    values[name] = code
+            elif not is_placeholder(raw):
+                values[name] = raw
+        elif kind == "subject":
+            if parsed.subject_id is None:
+                sm = _SUBJECT_ID.search(m.group("subject"))
+                if sm:
+                    parsed.subject_id = sm.group(1)
+        elif closing_end is None:
+            closing_end = m.end()
+
+    if closing_end is not None and "customer_name" not in values:
+        name = _signature_name(text, closing_end)
+        if name:
+            values["customer_name"] = name
+    return parsed
+
+
+def build_record(
+    request_id: str,
+    parsed: ParsedMail,
+    review: bool = True,
+    attachments: Sequence[ParsedAttachment] = (),
+    as_of: Optional[date] = None,
+) -> Dict[str, object]:
+    """
+    Turn parsed values into an RFQ-shaped dict (required strings fall back to 'unknown').
+
+    Facts from parsed attachments fill fields the mail leaves out (not those it
+    labels as not given); conflicts with the mail go to parsed.conflicts and
+    parsed.flags, and their questions quote both values. review=False leaves the review
+    fields out, for callers that run src.review.rules.apply_review over a
+    whole batch afterwards. With as_of, dates before that day count as
+    uncertain (plausibility rules of src/review/rules.py).
+    """
+    record: Dict[str, object] = dict(parsed.values)
+    record["request_id"] = request_id
+    if attachments:
+        stated_missing = {name for name, raw in parsed.raw.items() if is_placeholder(raw)}
+        parsed.conflicts = merge_attachments(record, parsed.flags, attachments, stated_missing)
+    if review:
+        record.update(review_fields(record, parsed.flags, as_of))
+        record["clarification_questions"] = conflict_questions(record["clarification_questions"], parsed.conflicts)
+    record.setdefault("product_or_service", UNKNOWN)
+    record.setdefault("specification", UNKNOWN)
+    return record
+
+
+def _quoted(value: object) -> str:
+    # no ';' in question texts: the CSV export joins list items with it (src/export/writers.py)
+    return str(value).replace(";", ",")
+
+
+def _conflict_question(c: Conflict) -> str:
+    if c.source == "mail":
+        return f"{QUESTIONS[c.flag]} (mail: {_quoted(c.current_value)} / attachment: {_quoted(c.attachment_value)})"
+    label = c.field.replace("_", " ")
+    return f"The attachments state different values for the {label} ({_quoted(c.current_value)} / {_quoted(c.attachment_value)}). Which applies?"
+
+
+def conflict_questions(questions: List[str], conflicts: Sequence[Conflict]) -> List[str]:
+    """Replace the generic question of each mail/attachment conflict by one that quotes both values."""
+    if not conflicts:
+        return questions
+    detailed = {QUESTIONS[c.flag]: _conflict_question(c) for c in reversed(conflicts)}  # the first conflict wins
+    return [detailed.get(q, q) for q in questions]
+
+
+def extract_rfq(request_id: Optional[str], mail_text: str, attachment_texts: Sequence[str] = (), as_of: Optional[date] = None) -> RFQ:
+    """
+    Extract a validated RFQ from one mail.
+
+    request_id falls back to the id in the subject line ("Subject: RFQ RFQ_0001 – ...").
+    attachment_texts are parsed by src/extraction/attachments.py and merged into the mail fields.
+    """
+    parsed = parse_mail(mail_text)
+    rid = request_id or parsed.subject_id
+    if not rid:
+        raise ValueError("No request_id given and none found in the subject line.")
+    attachments = [parse_attachment(text) for text in attachment_texts]
+    from src.models.rfq import RFQ  # pydantic and the model are loaded on the first extraction, not at import
+
+    return RFQ.model_validate(build_record(rid, parsed, attachments=attachments, as_of=as_of))
+
+
+class RuleExtractor:
+    """Extractor wrapper around extract_rfq (input: mail_text, attachment_texts; output: RFQ)."""
+
+    name = "rules"
+    version = EXTRACTOR_VERSION
+
+    def extract(self, request_id: Optional[str], mail_text: str, attachment_texts: Sequence[str] = ()) -> RFQ:
+        return extract_rfq(request_id, mail_text, attachment_texts)
+
+    __call__ = extract
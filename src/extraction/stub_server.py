@@ -0,0 +1,139 @@
+"""
+Local stand-in for the LLM provider, for offline throughput tests of src/extraction/llm.py.
+
+Replays canned RFQ JSON (all *.json files in --responses, keyed by request_id);
+requests without a canned response are answered by the rule extractor.
+Every HTTP request waits latency + uniform(0, jitter) seconds and fails
+with 503 at the given failure rate.
+
+Usage (from the repo root):
+    python -m src.extraction.stub_server --port 8765 --latency 0.8 --jitter 0.4 --responses export
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+from typing import Dict, Optional
+
+from src.extraction.rules import extract_rfq
+
+
+def load_responses(directory: str) -> Dict[str, dict]:
+    responses = {}
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and "request_id" in data:
+            responses[data["request_id"]] = data
+    return responses
+
+
+class StubLLMServer:
+    def __init__(
+        self,
+        responses: Optional[Dict[str, dict]] = None,
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.responses = responses or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+        self.requests_served = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def answer(self, request: dict) -> dict:
+        if not isinstance(request, dict):
+            return {"request_id": None, "error": "Expected a JSON object per request."}
+        rid = request.get("request_id")
+        if rid in self.responses:
+            return {"request_id": rid, "rfq": self.responses[rid]}
+        try:
+            rfq = extract_rfq(rid, request.get("mail_text", ""), request.get("attachment_texts") or ())
+        except (TypeError, ValueError) as e:  # also wrongly typed fields
+            return {"request_id": rid, "error": f"{type(e).__name__}: {e}"}
+        return {"request_id": rid, "rfq": rfq.model_dump(mode="json")}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                body = await reader.readexactly(length) if length else b""
+
+                await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+                self.requests_served += 1
+                if self.rng.random() < self.failure_rate:
+                    status, payload = 503, b'{"error": "overloaded"}'
+                else:
+                    try:
+                        requests = json.loads(body)["requests"]
+                        results = [self.answer(r) for r in requests]
+                        status, payload = 200, json.dumps({"results": results}).encode("utf-8")
+                    except (ValueError, KeyError, TypeError) as e:
+                        status, payload = 400, json.dumps({"error": str(e)}).encode("utf-8")
+
+                reason = {200: "OK", 400: "Bad Request", 503: "Service Unavailable"}[status]
+                writer.write(
+                    f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\nConnection: keep-alive\r\n\r\n".encode("latin-1") + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # client went away, or the loop is shutting down with idle keep-alive connections
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and return the bound port (port=0 picks a free one)."""
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+async def serve(args):
+    responses = load_responses(args.responses) if args.responses else {}
+    server = StubLLMServer(responses, args.latency, args.jitter, args.failure_rate, args.seed)
+    port = await server.start(args.host, args.port)
+    print(f"Stub LLM server on http://{args.host}:{port}/v1/extract ({len(responses)} canned responses)")
+    await server.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--responses", default="", help="Directory with canned RFQ JSON files (e.g. export/).")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per HTTP request.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with 503.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Confidence-gated tiered extraction: the rule extractor first, the LLM only
+for the fields the rules could not settle.
+
+Tier 1 runs parse_mail/build_record and scores every review field
+(src/review/rules.py FIELD_RULES) by the evidence behind its value:
+
+    1.0  labelled bullet with a value that parsed
+    0.9  labelled as not given ("(not specified)", "ASAP / to be confirmed"),
+         or filled from an attachment
+    0.3  value contradicted by a second one (two_quantities, two_dates)
+    0.2  labelled, but the value did not parse ("Quantity: a few hundred")
+    0.0  no label at all; the mail may still state it in prose
+
+Fields below the threshold (default 0.5) are uncertain. Only RFQs with
+uncertain fields go to tier 2, and only those fields are asked for (the
+"fields" hint of src/extraction/llm.py); the answer replaces just those
+values and counts with llm_confidence. Fields still uncertain afterwards (no
+LLM configured, or the request failed) are reported as missing, so
+needs_review also reflects low extraction confidence
+(docs/rfq-data-model.md). Contradiction flags keep their review questions
+either way: the LLM picks a value, the customer still has to confirm it.
+Mail/attachment conflicts do not lower the confidence (the mail wins), they
+only add a question.
+
+TierReport counts where each RFQ was settled and estimates the latency and
+tokens saved against sending every RFQ to the LLM (tokens ~ characters / 4).
+
+Usage (from the repo root; without --llm-url a local stub LLM is started):
+    python -m src.extraction.tiered --stub-latency 0.8
+    python -m src.extraction.tiered --llm-url http://127.0.0.1:8765 --threshold 0.5 --out export/tiered_report.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from src.extraction.attachments import parse_attachment
+from src.extraction.rules import EXTRACTOR_VERSION, ParsedMail, build_record, conflict_questions, is_placeholder, parse_mail
+from src.models.constants import UNKNOWN
+from src.review.rules import CONTRADICTIONS, REVIEW_FIELDS, review_fields
+
+if TYPE_CHECKING:
+    from src.extraction.llm import LLMExtractor
+    from src.models.rfq import RFQ
+
+LABELLED = 1.0
+STATED_MISSING = 0.9
+FROM_ATTACHMENT = 0.9
+CONTRADICTED = 0.3
+UNPARSED = 0.2
+ABSENT = 0.0
+
+TIERS = ("rules", "llm", "unresolved")
+PROMPT_TOKENS = 350  # instructions + RFQ schema sent with every LLM request (estimate)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _missing(value) -> bool:
+    return value is None or value == UNKNOWN
+
+
+def field_confidence(parsed: ParsedMail, record: Dict[str, object]) -> Dict[str, float]:
+    """Confidence per review field of a tier-1 record (see the module docstring for the scale)."""
+    confidence = {}
+    for name in REVIEW_FIELDS:
+        raw = parsed.raw.get(name)
+        missing = _missing(record.get(name))
+        if raw is None:
+            confidence[name] = ABSENT if missing else FROM_ATTACHMENT
+        elif missing:
+            confidence[name] = STATED_MISSING if is_placeholder(raw) else UNPARSED
+        else:
+            confidence[name] = LABELLED
+    for flag in parsed.flags:
+        name = CONTRADICTIONS.get(flag)
+        if name in confidence:
+            confidence[name] = min(confidence[name], CONTRADICTED)
+    return confidence
+
+
+@dataclass
+class TieredResult:
+    request_id: Optional[str]
+    rfq: Optional[RFQ] = None
+    tier: str = "rules"  # where the RFQ was settled: rules, llm or unresolved
+    confidence: Dict[str, float] = field(default_factory=dict)
+    escalated: Tuple[str, ...] = ()  # fields asked from the LLM
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.rfq is not None
+
+
+@dataclass
+class TierReport:
+    """Running totals over all extract_many() calls of one TieredExtractor."""
+
+    rfqs: int = 0
+    errors: int = 0
+    tiers: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(TIERS, 0))
+    escalated_fields: Dict[str, int] = field(default_factory=dict)
+    rules_s: float = 0.0  # summed per-RFQ tier-1 time
+    llm_s: float = 0.0  # summed per-RFQ LLM latency (the duration of its HTTP request)
+    llm_rfqs: int = 0  # RFQs that got an LLM answer
+    tokens: int = 0  # estimated LLM tokens spent
+    tokens_all_llm: int = 0  # estimated tokens had every RFQ gone to the LLM in full
+
+    def summary(self) -> Dict[str, object]:
+        n = max(1, self.rfqs)
+        llm_mean = self.llm_s / self.llm_rfqs if self.llm_rfqs else None
+        out = asdict(self)
+        out["fractions"] = {tier: round(count / n, 4) for tier, count in self.tiers.items()}
+        out["latency_ms"] = {
+            "rules_mean": round(1000 * self.rules_s / n, 3),
+            "llm_mean": round(1000 * llm_mean, 1) if llm_mean is not None else None,
+            "tiered_mean": round(1000 * (self.rules_s + self.llm_s) / n, 3),
+        }
+        # had every RFQ waited for the LLM once, at the latency observed here
+        out["llm_seconds_saved_est"] = round(llm_mean * (self.rfqs - self.llm_rfqs) - self.rules_s, 3) if llm_mean is not None else None
+        out["tokens_saved_est"] = self.tokens_all_llm - self.tokens
+        out["tokens_saved_fraction"] = round(1 - self.tokens / self.tokens_all_llm, 4) if self.tokens_all_llm else None
+        return out
+
+
+@dataclass
+class _Draft:
+    request_id: str
+    parsed: ParsedMail
+    record: Dict[str, object]
+    confidence: Dict[str, float]
+    uncertain: Tuple[str, ...]
+    input_tokens: int
+
+
+class TieredExtractor:
+    """
+    `await TieredExtractor(llm).extract_many(requests)` with requests as for
+    LLMExtractor; results keep the input order and never raise. llm=None runs
+    tier 1 only (uncertain fields go to review).
+    """
+
+    name = "tiered"
+
+    def __init__(self, llm: Optional[LLMExtractor] = None, threshold: float = 0.5, llm_confidence: float = 0.8):
+        self.llm = llm
+        self.threshold = threshold
+        self.llm_confidence = llm_confidence
+        self.version = f"{EXTRACTOR_VERSION}+{llm.version}" if llm is not None else EXTRACTOR_VERSION
+        self.report = TierReport()
+
+    def draft(self, request_id: Optional[str], mail_text: str, attachment_texts: Sequence[str] = ()) -> _Draft:
+        """Tier 1: rule-based record and field confidence."""
+        parsed = parse_mail(mail_text)
+        rid = request_id or parsed.subject_id
+        if not rid:
+            raise ValueError("No request_id given and none found in the subject line.")
+        record = build_record(rid, parsed, review=False, attachments=[parse_attachment(t) for t in attachment_texts])
+        confidence = field_confidence(parsed, record)
+        uncertain = tuple(f for f, c in confidence.items() if c < self.threshold)
+        tokens = PROMPT_TOKENS + estimate_tokens(mail_text) + sum(estimate_tokens(t) for t in attachment_texts)
+        return _Draft(rid, parsed, record, confidence, uncertain, tokens)
+
+    async def _ask_llm(self, drafts: List[_Draft], requests: Sequence) -> Dict[int, Tuple[object, float]]:
+        """Position -> (ExtractionResult, latency of its HTTP request) for the drafts with uncertain fields."""
+        positions = [i for i, d in enumerate(drafts) if d is not None and d.uncertain]
+        if self.llm is None or not positions:
+            return {}
+        asks = [(drafts[i].request_id, requests[i][1], requests[i][2], drafts[i].uncertain) for i in positions]
+        size = self.llm.batch_size
+
+        async def timed(batch):
+            start = time.perf_counter()
+            results = await self.llm.extract_batch(batch)
+            return results, time.perf_counter() - start
+
+        answers = await asyncio.gather(*(timed(asks[i:i + size]) for i in range(0, len(asks), size)))
+        flat = [(result, elapsed) for results, elapsed in answers for result in results]
+        return dict(zip(positions, flat))
+
+    def _finish(self, draft: _Draft, answer) -> TieredResult:
+        from src.models.rfq import RFQ
+
+        record, confidence = draft.record, dict(draft.confidence)
+        tier = "rules"
+        if draft.uncertain:
+            tier = "unresolved"
+            if answer is not None and answer.rfq is not None:
+                tier = "llm"
+                for name in draft.uncertain:
+                    value = getattr(answer.rfq, name)
+                    if not _missing(value):
+                        record[name] = value
+                        if name == "quantity":
+                            record["quantity_unit"] = answer.rfq.quantity_unit
+                    confidence[name] = max(confidence[name], self.llm_confidence)
+        low = {f: None for f, c in confidence.items() if c < self.threshold}
+        record.update(review_fields({**record, **low}, draft.parsed.flags))
+        record["clarification_questions"] = conflict_questions(record["clarification_questions"], draft.parsed.conflicts)
+        try:
+            rfq = RFQ.model_validate(record)
+        except ValueError as e:  # pydantic.ValidationError is a ValueError
+            return TieredResult(draft.request_id, None, tier, confidence, draft.uncertain, f"{type(e).__name__}: {e}")
+        return TieredResult(draft.request_id, rfq, tier, confidence, draft.uncertain)
+
+    async def extract_many(self, requests: Sequence) -> List[TieredResult]:
+        report = self.report
+        drafts: List[Optional[_Draft]] = []
+        results: List[Optional[TieredResult]] = []
+        for rid, mail_text, attachment_texts in requests:
+            start = time.perf_counter()
+            try:
+                drafts.append(self.draft(rid, mail_text, attachment_texts))
+                results.append(None)
+            except (TypeError, ValueError) as e:  # malformed request fields end up as an error result, too
+                drafts.append(None)
+                results.append(TieredResult(rid, tier="unresolved", error=f"{type(e).__name__}: {e}"))
+            report.rules_s += time.perf_counter() - start
+
+        answers = await self._ask_llm(drafts, requests)
+        for i, draft in enumerate(drafts):
+            if draft is None:
+                report.rfqs += 1
+                report.errors += 1
+                report.tiers["unresolved"] += 1
+                continue
+            start = time.perf_counter()
+            answer, latency = answers.get(i, (None, 0.0))
+            result = results[i] = self._finish(draft, answer)
+            report.rules_s += time.perf_counter() - start
+            report.rfqs += 1
+            report.errors += not result.ok
+            report.tiers[result.tier] += 1
+            full_answer = estimate_tokens(result.rfq.model_dump_json()) if result.ok else 0
+            report.tokens_all_llm += draft.input_tokens + full_answer
+            if answer is not None:
+                report.llm_s += latency
+                report.llm_rfqs += answer.rfq is not None
+                partial = {name: draft.record.get(name) for name in draft.uncertain}
+                report.tokens += draft.input_tokens + estimate_tokens(json.dumps(partial, default=str))
+                for name in draft.uncertain:
+                    report.escalated_fields[name] = report.escalated_fields.get(name, 0) + 1
+        return results
+
+
+async def run_tiered(requests: Sequence, llm_url: str = "", stub_latency: float = 0.8, threshold: float = 0.5, **llm_kwargs) -> TierReport:
+    """Run the tiered extractor over requests against llm_url, or a local stub LLM server if none is given."""
+    from src.extraction.llm import LLMExtractor
+    from src.extraction.stub_server import StubLLMServer
+
+    server = None
+    if not llm_url:
+        server = StubLLMServer(latency=stub_latency)
+        llm_url = f"http://127.0.0.1:{await server.start()}"
+    try:
+        async with LLMExtractor(llm_url, **llm_kwargs) as llm:
+            extractor = TieredExtractor(llm, threshold)
+            await extractor.extract_many(requests)
+    finally:
+        if server is not None:
+            await server.stop()
+    return extractor.report
+
+
+def main():
+    from src.intake.batch import build_work_items
+    from src.intake.corpus import load_rfq_texts
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm-url", default="", help="LLM provider (src/extraction/llm.py wire format); default: local stub.")
+    parser.add_argument("--stub-latency", type=float, default=0.8, help="Seconds per request of the local stub LLM.")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Fields below this confidence are escalated.")
+    parser.add_argument("--batch-size", type=int, default=8, help="RFQs per LLM request.")
+    parser.add_argument("--out", default="", help="Write the JSON report here.")
+    args = parser.parse_args()
+
+    requests = [(rid, *load_rfq_texts(rid, files)) for rid, files in build_work_items()]
+    report = asyncio.run(run_tiered(requests, args.llm_url, args.stub_latency, args.threshold, batch_size=args.batch_size))
+    text = json.dumps(report.summary(), indent=2)
+    print(text)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Per-stage timing and the structured run log from docs/tooling_stack.md.
+
+One JSONL record per RFQ:
+    {"rfq_id", "is_valid_json", "needs_review", "missing_fields_count",
+     "runtime_s", "timestamp", "stages": {"read": s, "attachments": s, "extract": s,
+     "review": s, "validate": s, "export": s}, "error"}
+
+summarize() turns the records into an end-of-run report (throughput, per-stage
+percentiles, runtime histogram); profile_slowest() re-runs the slowest RFQs
+under cProfile on request. percentile() is the nearest-rank percentile used
+by every latency report (evaluation, deadline queue, watch-folder metrics).
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import math
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+STAGES = ("read", "attachments", "extract", "review", "validate", "export")
+
+# Upper bounds (seconds) of the runtime histogram buckets; the last bucket is open-ended
+HISTOGRAM_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class StageTimer:
+    """Accumulates wall time per stage for one RFQ."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def runtime_s(self) -> float:
+        return time.perf_counter() - self.started
+
+
+def make_record(
+    rfq_id: str,
+    timer: StageTimer,
+    valid: bool,
+    needs_review: Optional[bool] = None,
+    missing_fields_count: int = 0,
+    error: Optional[str] = None,
+) -> Dict[str, object]:
+    return {
+        "rfq_id": rfq_id,
+        "is_valid_json": valid,
+        "needs_review": needs_review,
+        "missing_fields_count": missing_fields_count,
+        "runtime_s": timer.runtime_s,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "stages": dict(timer.stages),
+        "error": error,
+    }
+
+
+class RunLog:
+    """Append-only JSONL run log; keeps the records for the end-of-run summary."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.records: List[Dict[str, object]] = []
+        self._file = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record: Dict[str, object]):
+        self.records.append(record)
+        if self._file is not None:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_records(path: str) -> List[Dict[str, object]]:
+    """Records of a JSONL run log written by RunLog."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(ordered: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0..100) of ascending values; 0.0 for none. Shared by all latency reports."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered), max(1, math.ceil(p / 100 * len(ordered)))) - 1]
+
+
+def _stats(values: Iterable[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    total = sum(ordered)
+    return {
+        "total_s": total,
+        "mean_s": total / len(ordered) if ordered else 0.0,
+        "p50_s": percentile(ordered, 50),
+        "p95_s": percentile(ordered, 95),
+        "p99_s": percentile(ordered, 99),
+        "max_s": ordered[-1] if ordered else 0.0,
+    }
+
+
+def histogram(values: Iterable[float], buckets=HISTOGRAM_BUCKETS) -> Dict[str, int]:
+    labels = [f"<={b:g}s" for b in buckets] + [f">{buckets[-1]:g}s"]
+    counts = dict.fromkeys(labels, 0)
+    for v in values:
+        for b, label in zip(buckets, labels):
+            if v <= b:
+                counts[label] += 1
+                break
+        else:
+            counts[labels[-1]] += 1
+    return counts
+
+
+def summarize(records: List[Dict[str, object]], wall_s: float) -> Dict[str, object]:
+    runtimes = [r["runtime_s"] for r in records]
+    stage_names = [s for s in STAGES if any(s in r["stages"] for r in records)]
+    stage_stats = {s: _stats(r["stages"].get(s, 0.0) for r in records) for s in stage_names}
+    stage_total = sum(st["total_s"] for st in stage_stats.values())
+    for st in stage_stats.values():
+        st["share"] = st["total_s"] / stage_total if stage_total else 0.0
+    return {
+        "total": len(records),
+        "valid": sum(bool(r["is_valid_json"]) for r in records),
+        "needs_review": sum(bool(r["needs_review"]) for r in records),
+        "wall_s": wall_s,
+        "throughput_rfq_per_s": len(records) / wall_s if wall_s else 0.0,
+        "runtime": _stats(runtimes),
+        "stages": stage_stats,
+        "histogram": histogram(runtimes),
+    }
+
+
+def format_summary(summary: Dict[str, object]) -> str:
+    rt = summary["runtime"]
+    lines = [
+        f"Run summary: {summary['total']} RFQs, {summary['valid']} valid, {summary['needs_review']} need review",
+        f"- Throughput: {summary['throughput_rfq_per_s']:.1f} RFQ/s (wall {summary['wall_s']:.2f}s)",
+        f"- Runtime per RFQ: mean {rt['mean_s'] * 1000:.3f} ms, p50 {rt['p50_s'] * 1000:.3f} ms, "
+        f"p95 {rt['p95_s'] * 1000:.3f} ms, p99 {rt['p99_s'] * 1000:.3f} ms",
+        "- Stages (share of measured time, mean / p95):",
+    ]
+    for name, st in summary["stages"].items():
+        lines.append(f"  - {name:<12} {st['share']:6.1%}  {st['mean_s'] * 1000:.3f} / {st['p95_s'] * 1000:.3f} ms")
+    lines.append("- Runtime histogram:")
+    for label, count in summary["histogram"].items():
+        if count:
+            lines.append(f"  - {label:>10}: {count}")
+    return "\n".join(lines)
+
+
+def slowest(records: List[Dict[str, object]], n: int) -> List[str]:
+    return [r["rfq_id"] for r in sorted(records, key=lambda r: r["runtime_s"], reverse=True)[:n]]
+
+
+def profile_slowest(rfq_ids: List[str], run_one: Callable[[str], object], out_dir: str, top: int = 15) -> List[str]:
+    """Re-run each RFQ under cProfile; write <rfq_id>.prof and a text report per RFQ. Returns the .prof paths."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for rfq_id in rfq_ids:
+        profiler = cProfile.Profile()
+        profiler.runcall(run_one, rfq_id)
+        path = os.path.join(out_dir, f"{rfq_id}.prof")
+        profiler.dump_stats(path)
+        buf = io.StringIO()
+        pstats.Stats(profiler, stream=buf).sort_stats("cumulative").print_stats(top)
+        with open(os.path.join(out_dir, f"{rfq_id}.txt"), "w", encoding="utf-8") as f:
+            f.write(buf.getvalue())
+        paths.append(path)
+    return paths
@@ -0,0 +1,250 @@
+"""
+Batch intake over data_samples/raw: read mail + attachments, extract, validate
+and write one JSON file per RFQ into export/ (or bulk JSONL/CSV/Parquet files,
+see src/export/writers.py).
+
+Usage (from the repo root):
+    python -m src.intake.batch --workers 4 --chunk-size 64
+    python -m src.intake.batch --format csv
+    python -m src.intake.batch --order deadline   # earliest response due date first
+    python -m src.intake.batch --as-of today      # past delivery/response dates need review
+    python -m src.intake.batch --cache .cache/extraction.sqlite   # unchanged RFQs are not extracted again
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from functools import partial
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.export.writers import WRITERS, open_writer
+from src.extraction.attachments import AttachmentReader, parse_attachment
+from src.extraction.cache import ExtractionCache, cache_key
+from src.extraction.rules import EXTRACTOR_VERSION, build_record, parse_mail
+from src.instrumentation.runlog import (
+    RunLog, StageTimer, format_summary, make_record, profile_slowest, slowest, summarize,
+)
+from src.intake.corpus import (
+    ATTACHMENTS_DIR, ATTACHMENTS_INDEX, EXPORT_DIR, RAW_DIR,
+    list_rfq_ids, load_attachments_index, read_text,
+)
+from src.intake.schedule import order_by_deadline
+from src.models.rfq import RFQ
+
+WorkItem = Tuple[str, List[str]]  # (rfq_id, attachment file names)
+
+
+@dataclass(frozen=True)
+class BatchConfig:
+    raw_dir: str = RAW_DIR
+    attachments_dir: str = ATTACHMENTS_DIR
+    out_dir: str = EXPORT_DIR
+    per_file: bool = True  # False: return the record to the caller instead of writing RFQ_XXXX.json
+    attachment_threads: int = 0  # > 1: read and parse the attachments of one RFQ concurrently
+    as_of: Optional[date] = None  # dates before this day are flagged for review (past delivery / response date)
+    cache_path: str = ""  # extraction cache (SQLite, src/extraction/cache.py); "" = off
+
+
+class BatchResult(NamedTuple):
+    rfq_id: str
+    ok: bool
+    needs_review: Optional[bool] = None
+    error: Optional[str] = None
+    record: Optional[Dict[str, object]] = None
+    log: Optional[Dict[str, object]] = None  # run log record (see src/instrumentation/runlog.py)
+    cached: bool = False  # served from the extraction cache
+
+
+_readers: Dict[int, AttachmentReader] = {}
+
+
+def attachment_reader(threads: int = 0) -> AttachmentReader:
+    """One reader (and parse cache) per process and thread count, shared by all chunks."""
+    reader = _readers.get(threads)
+    if reader is None:
+        executor = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+        reader = _readers[threads] = AttachmentReader(executor)
+    return reader
+
+
+_caches: Dict[str, ExtractionCache] = {}
+
+
+def extraction_cache(path: str) -> Optional[ExtractionCache]:
+    """One cache connection per process and path, shared by all chunks; None while the file cannot be opened."""
+    cache = _caches.get(path)
+    if cache is None:
+        try:
+            cache = _caches[path] = ExtractionCache(path)
+        except sqlite3.Error:
+            return None  # run uncached; the next item tries again
+    return cache
+
+
+def process_item(config: BatchConfig, item: WorkItem) -> BatchResult:
+    rfq_id, attachment_files = item
+    timer = StageTimer()
+    record = None
+    cache = extraction_cache(config.cache_path) if config.cache_path else None
+    cached = None
+    try:
+        with timer.stage("read"):
+            mail_text = read_text(os.path.join(config.raw_dir, f"{rfq_id}.txt"))
+        with timer.stage("attachments"):
+            paths = [os.path.join(config.attachments_dir, n) for n in attachment_files]
+            if cache is None:
+                attachments = attachment_reader(config.attachment_threads).parse_files(paths)
+            else:  # the key needs the texts; they are only parsed on a miss
+                texts = [read_text(p) for p in paths]
+                # as_of changes the review fields, so it is part of the version
+                version = EXTRACTOR_VERSION if config.as_of is None else f"{EXTRACTOR_VERSION}@{config.as_of.isoformat()}"
+                key = cache_key(mail_text, texts, version)
+                cached = cache.get(key)
+                attachments = [parse_attachment(t) for t in texts] if cached is None else []
+        if cached is not None:
+            with timer.stage("validate"):
+                rfq = RFQ.model_validate_json(cached).model_copy(update={"request_id": rfq_id})
+        else:
+            with timer.stage("extract"):
+                parsed = parse_mail(mail_text)
+            with timer.stage("review"):
+                fields = build_record(rfq_id, parsed, attachments=attachments, as_of=config.as_of)
+            with timer.stage("validate"):
+                rfq = RFQ.model_validate(fields)
+            if cache is not None:
+                cache.put(key, rfq.model_dump_json())
+        with timer.stage("export"):
+            if config.per_file:
+                with open(os.path.join(config.out_dir, f"{rfq_id}.json"), "w", encoding="utf-8") as f:
+                    f.write(rfq.model_dump_json(indent=2))
+            else:
+                record = rfq.model_dump(mode="json")
+    except (OSError, ValueError) as e:  # pydantic.ValidationError is a ValueError
+        error = f"{type(e).__name__}: {e}"
+        return BatchResult(rfq_id, False, error=error, log=make_record(rfq_id, timer, False, error=error))
+    log = make_record(rfq_id, timer, True, rfq.needs_review, len(rfq.missing_fields))
+    return BatchResult(rfq_id, True, rfq.needs_review, record=record, log=log, cached=cached is not None)
+
+
+def process_chunk(config: BatchConfig, chunk: Sequence[WorkItem]) -> List[BatchResult]:
+    return [process_item(config, item) for item in chunk]
+
+
+def make_chunks(items: Sequence[WorkItem], chunk_size: int) -> List[Sequence[WorkItem]]:
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def build_work_items(raw_dir: str = RAW_DIR, attachments_index: str = ATTACHMENTS_INDEX) -> List[WorkItem]:
+    index = load_attachments_index(attachments_index)
+    return [(rfq_id, index.get(rfq_id, [])) for rfq_id in list_rfq_ids(raw_dir)]
+
+
+def run_batch(
+    items: Sequence[WorkItem],
+    config: BatchConfig = BatchConfig(),
+    workers: int = 1,
+    chunk_size: int = 64,
+) -> Iterator[BatchResult]:
+    """
+    Process items and yield results in input order, whatever the worker count.
+
+    workers <= 1 runs in-process; otherwise chunks of chunk_size items are
+    spread over a process pool (each worker writes its own JSON files).
+    """
+    os.makedirs(config.out_dir, exist_ok=True)
+    chunks = make_chunks(items, max(1, chunk_size))
+    if workers <= 1:
+        for chunk in chunks:
+            yield from process_chunk(config, chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(partial(process_chunk, config), chunks):
+            yield from results
+
+
+def parse_as_of(value: str) -> date:
+    return date.today() if value == "today" else date.fromisoformat(value)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--attachments-dir", default=ATTACHMENTS_DIR)
+    parser.add_argument("--attachments-index", default=ATTACHMENTS_INDEX)
+    parser.add_argument("--out-dir", default=EXPORT_DIR)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size (1 = no pool).")
+    parser.add_argument("--chunk-size", type=int, default=64, help="RFQs per work unit sent to a worker.")
+    parser.add_argument("--attachment-threads", type=int, default=0, help="Threads per worker for reading attachments (0 = sequential).")
+    parser.add_argument("--as-of", type=parse_as_of, default=None, help="Flag dates before this day (YYYY-MM-DD or 'today') for review.")
+    parser.add_argument("--order", choices=["name", "deadline"], default="name", help="deadline: earliest response due date first.")
+    parser.add_argument("--cache", default="", help="Extraction cache (SQLite) for unchanged RFQs, e.g. .cache/extraction.sqlite.")
+    parser.add_argument("--format", choices=["json"] + list(WRITERS), default="json", help="json = one file per RFQ.")
+    parser.add_argument("--export-batch-size", type=int, default=1000, help="Records per flush for bulk formats.")
+    parser.add_argument("--max-bytes", type=int, default=256 * 1024 * 1024, help="Rotate bulk export files at this size.")
+    parser.add_argument("--log", default="", help="Append one JSONL run log record per RFQ to this file.")
+    parser.add_argument("--profile-slowest", type=int, default=0, help="Re-run the N slowest RFQs under cProfile.")
+    parser.add_argument("--profile-dir", default=os.path.join(EXPORT_DIR, "profiles"))
+    args = parser.parse_args()
+
+    per_file = args.format == "json"
+    config = BatchConfig(args.raw_dir, args.attachments_dir, args.out_dir, per_file, args.attachment_threads, args.as_of, args.cache)
+    items = build_work_items(args.raw_dir, args.attachments_index)
+    if args.order == "deadline":
+        items = order_by_deadline(items, args.raw_dir)
+    writer = None if per_file else open_writer(
+        args.format, args.out_dir, batch_size=args.export_batch_size, max_bytes=args.max_bytes
+    )
+
+    run_log = RunLog(args.log or None)
+    start = time.perf_counter()
+    n_ok = n_review = n_cached = 0
+    failed = []
+    for result in run_batch(items, config, args.workers, args.chunk_size):
+        run_log.write(result.log)
+        if result.ok:
+            n_ok += 1
+            n_review += bool(result.needs_review)
+            n_cached += result.cached
+            if writer is not None:
+                writer.write(result.record)
+        else:
+            failed.append(result)
+    if writer is not None:
+        writer.close()
+    run_log.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"Processed {len(items)} RFQs in {elapsed:.2f}s with {args.workers} worker(s)")
+    print(f"- Valid: {n_ok} (needs_review: {n_review})")
+    if args.cache:
+        print(f"- From the extraction cache: {n_cached}")
+    print(f"- Failed: {len(failed)}")
+    for r in failed:
+        print(f"  - {r.rfq_id}: {r.error}")
+    if writer is None:
+        print(f"- Export: {config.out_dir}/RFQ_XXXX.json")
+    else:
+        for path in writer.paths:
+            print(f"- Export: {path}")
+    if args.log:
+        print(f"- Run log: {args.log}")
+    print(format_summary(summarize(run_log.records, elapsed)))
+
+    if args.profile_slowest:
+        files = dict(items)
+        profile_config = BatchConfig(config.raw_dir, config.attachments_dir, config.out_dir, False, config.attachment_threads, config.as_of)
+        paths = profile_slowest(
+            slowest(run_log.records, args.profile_slowest),
+            lambda rfq_id: process_item(profile_config, (rfq_id, files[rfq_id])),
+            args.profile_dir,
+        )
+        print(f"- Profiles of the {len(paths)} slowest RFQs: {args.profile_dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import csv
+import os
+from typing import Dict, List, Sequence, Tuple
+
+RAW_DIR = os.path.join("data_samples", "raw")
+ATTACHMENTS_DIR = os.path.join("data_samples", "attachments")
+ATTACHMENTS_INDEX = os.path.join("data_samples", "attachments_index.csv")
+RFQ_INDEX = os.path.join("data_samples", "rfq_index.csv")
+EXPORT_DIR = "export"
+
+
+def read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def list_rfq_ids(raw_dir: str = RAW_DIR) -> List[str]:
+    """Sorted ids of all RFQ_XXXX.txt files in raw_dir."""
+    return sorted(
+        name[:-4] for name in os.listdir(raw_dir)
+        if name.startswith("RFQ_") and name.endswith(".txt")
+    )
+
+
+def load_attachments_index(path: str = ATTACHMENTS_INDEX) -> Dict[str, List[str]]:
+    """rfq_id -> attachment file names (the CSV stores them ';'-joined)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {
+            r["rfq_id"]: [name for name in r["attachment_files"].split(";") if name]
+            for r in csv.DictReader(f)
+        }
+
+
+def load_rfq_texts(
+    rfq_id: str,
+    attachment_files: Sequence[str] = (),
+    raw_dir: str = RAW_DIR,
+    attachments_dir: str = ATTACHMENTS_DIR,
+) -> Tuple[str, List[str]]:
+    """Return (mail_text, attachment_texts) for one RFQ."""
+    mail_text = read_text(os.path.join(raw_dir, f"{rfq_id}.txt"))
+    attachment_texts = [read_text(os.path.join(attachments_dir, name)) for name in attachment_files]
+    return mail_text, attachment_texts
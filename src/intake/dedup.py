@@ -0,0 +1,209 @@
+"""
+Near-duplicate detection for incoming RFQs (resends, copies to several sales
+addresses, forwards with a changed date).
+
+Mail and attachment texts are normalized and cut into word shingles. Each
+shingle is hashed once into one of SIGNATURE_SIZE bins (one-permutation
+MinHash, empty bins filled by rotation), so a signature costs one pass over
+the text. Signatures are split into LSH bands; RFQs that share a band key
+within the time window are candidates, and a candidate is a duplicate when
+the share of equal signature slots (an estimate of the Jaccard similarity)
+reaches the threshold.
+
+The index lives in SQLite: lookups are a few B-tree probes, memory is bounded
+by SQLite's page cache, and prune() drops RFQs older than the window.
+Duplicates are linked to the first RFQ of their group (original_id).
+"""
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+import zlib
+from array import array
+from contextlib import contextmanager
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_PATH = os.path.join(".cache", "dedup.sqlite")
+
+SIGNATURE_SIZE = 128
+BANDS = 16  # 16 bands x 8 rows: RFQs with a Jaccard similarity of 0.8 become candidates with p ~ 0.95
+ROWS = SIGNATURE_SIZE // BANDS
+_EMPTY = 0xFFFF
+
+_WORD = re.compile(r"\w+")
+
+
+DedupItem = Tuple[str, str, Sequence[str], Optional[float]]  # (request_id, mail_text, attachment_texts, received)
+
+
+class Duplicate(NamedTuple):
+    original_id: str
+    similarity: float
+
+
+def shingle_hashes(text: str, size: int = 3) -> List[int]:
+    """crc32 of every run of `size` consecutive words (lower-cased; punctuation, quote markers and spacing ignored)."""
+    words = _WORD.findall(unicodedata.normalize("NFC", text).lower())
+    if len(words) <= size:
+        return [zlib.crc32(" ".join(words).encode("utf-8"))] if words else []
+    return [zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)]
+
+
+def signature(mail_text: str, attachment_texts: Sequence[str] = (), shingle_size: int = 3) -> array:
+    """One-permutation MinHash signature: SIGNATURE_SIZE 16-bit minima."""
+    bins = [_EMPTY] * SIGNATURE_SIZE
+    for text in (mail_text, *attachment_texts):
+        for h in shingle_hashes(text, shingle_size):
+            b, v = h % SIGNATURE_SIZE, (h // SIGNATURE_SIZE) & 0x7FFF
+            if v < bins[b]:
+                bins[b] = v
+    # Densification: an empty bin borrows the next filled bin's value, offset by the distance
+    if _EMPTY in bins and any(v != _EMPTY for v in bins):
+        filled = bins[:]
+        for b in range(SIGNATURE_SIZE):
+            if filled[b] == _EMPTY:
+                t = 1
+                while filled[(b + t) % SIGNATURE_SIZE] == _EMPTY:
+                    t += 1
+                bins[b] = 0x8000 | ((filled[(b + t) % SIGNATURE_SIZE] + t) & 0x7FFF)
+    return array("H", bins)
+
+
+def band_keys(sig: Sequence[int]) -> List[int]:
+    """One integer key per band (band number in the high bits)."""
+    return [
+        (band << 32) | zlib.crc32(array("H", sig[band * ROWS:(band + 1) * ROWS]).tobytes())
+        for band in range(BANDS)
+    ]
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    return sum(x == y for x, y in zip(a, b)) / SIGNATURE_SIZE
+
+
+class DedupIndex:
+    """
+    Persistent LSH index of recent RFQs.
+
+    check() looks an RFQ up and records it in one step; a near-duplicate
+    within window_s seconds of the original is returned as Duplicate.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        threshold: float = 0.8,
+        window_s: float = 7 * 24 * 3600,
+        shingle_size: int = 3,
+        cache_kib: int = 16 * 1024,
+    ):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.threshold = threshold
+        self.window_s = window_s
+        self.shingle_size = shingle_size
+        self.duplicates = 0
+
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(f"PRAGMA cache_size=-{int(cache_kib)}")  # bounded page cache (KiB)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, request_id TEXT UNIQUE NOT NULL,"
+            " received REAL NOT NULL, signature BLOB NOT NULL, original_id TEXT)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS docs_received ON docs(received)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS bands (key INTEGER NOT NULL, doc INTEGER NOT NULL, PRIMARY KEY (key, doc)) WITHOUT ROWID")
+        self._lookup = (
+            "SELECT DISTINCT d.request_id, d.signature, d.original_id FROM bands b JOIN docs d ON d.id = b.doc"
+            f" WHERE b.key IN ({','.join('?' * BANDS)}) AND d.received >= ? ORDER BY d.received"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def signature(self, mail_text: str, attachment_texts: Sequence[str] = ()) -> array:
+        return signature(mail_text, attachment_texts, self.shingle_size)
+
+    def find(self, sig: array, received: Optional[float] = None, exclude: Optional[str] = None) -> Optional[Duplicate]:
+        """Best match within the window (earliest RFQ on ties), or None."""
+        received = time.time() if received is None else received
+        best = None
+        for request_id, blob, original_id in self.db.execute(self._lookup, (*band_keys(sig), received - self.window_s)):
+            if request_id == exclude:
+                continue
+            score = similarity(sig, array("H", blob))
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = Duplicate(original_id or request_id, score)
+        return best
+
+    def add(self, request_id: str, sig: array, received: Optional[float] = None, original_id: Optional[str] = None):
+        with self._transaction():
+            self._insert(request_id, sig, time.time() if received is None else received, original_id)
+
+    def _insert(self, request_id: str, sig: array, received: float, original_id: Optional[str]):
+        cur = self.db.execute(
+            "INSERT OR IGNORE INTO docs (request_id, received, signature, original_id) VALUES (?, ?, ?, ?)",
+            (request_id, received, sig.tobytes(), original_id),
+        )
+        if cur.rowcount:
+            self.db.executemany("INSERT OR IGNORE INTO bands VALUES (?, ?)", [(k, cur.lastrowid) for k in band_keys(sig)])
+
+    @contextmanager
+    def _transaction(self):
+        self.db.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def check(
+        self,
+        request_id: str,
+        mail_text: str,
+        attachment_texts: Sequence[str] = (),
+        received: Optional[float] = None,
+    ) -> Optional[Duplicate]:
+        """Look up and record one RFQ; returns the original it duplicates, if any."""
+        return self.check_many([(request_id, mail_text, attachment_texts, received)])[0]
+
+    def check_many(self, items: Iterable[DedupItem]) -> List[Optional[Duplicate]]:
+        """check() for (request_id, mail_text, attachment_texts, received) items in one transaction, in order."""
+        matches = []
+        with self._transaction():
+            for request_id, mail_text, attachment_texts, received in items:
+                received = time.time() if received is None else received
+                sig = self.signature(mail_text, attachment_texts)
+                match = self.find(sig, received, exclude=request_id)
+                self._insert(request_id, sig, received, match.original_id if match else None)
+                self.duplicates += match is not None
+                matches.append(match)
+        return matches
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Remove RFQs older than the window; returns the number removed."""
+        cutoff = (time.time() if now is None else now) - self.window_s
+        rows = self.db.execute("SELECT id, signature FROM docs WHERE received < ?", (cutoff,)).fetchall()
+        if not rows:
+            return 0
+        with self._transaction():
+            self.db.executemany(
+                "DELETE FROM bands WHERE key = ? AND doc = ?",
+                [(k, doc) for doc, blob in rows for k in band_keys(array("H", blob))],
+            )
+            self.db.executemany("DELETE FROM docs WHERE id = ?", [(doc,) for doc, _ in rows])
+        return len(rows)
+
+    def close(self):
+        self.db.close()
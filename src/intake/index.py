@@ -0,0 +1,215 @@
+"""
+In-memory corpus index over data_samples/rfq_index.csv and attachments_index.csv.
+
+Both CSVs are parsed once. Strings that repeat (category, dirty_flags, customer,
+product) are stored once in small tables and referenced by array codes;
+attachment lists use CSR layout (one flat name table + per-RFQ offsets).
+Lookups by rfq_id are O(1). The index can be persisted to a binary sidecar
+(marshal) that is reused as long as the source CSVs are unchanged.
+"""
+from __future__ import annotations
+
+import csv
+import marshal
+import mmap
+import os
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.intake.corpus import ATTACHMENTS_DIR, ATTACHMENTS_INDEX, RFQ_INDEX
+
+SIDECAR_MAGIC = "rfq-corpus-index/2"
+
+
+class IndexEntry(NamedTuple):
+    rfq_id: str
+    category: str
+    dirty_flags: str
+    customer: str
+    product: str
+    has_attachments: bool
+    expected_needs_review: bool
+    attachment_files: List[str]
+
+
+class _Interner:
+    def __init__(self, values: Sequence[str] = ()):
+        self.values = list(values)
+        self.codes = {v: i for i, v in enumerate(self.values)}
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _codes(values: Sequence[int], table_size: int) -> array:
+    """Smallest code array for a table: 2-byte codes up to 65536 distinct values, 4-byte above."""
+    return array("H" if table_size <= 0x10000 else "I", values)
+
+
+def _source_stamp(paths: Sequence[str]) -> Tuple:
+    stamp = []
+    for p in paths:
+        st = os.stat(p) if os.path.exists(p) else None
+        stamp.append((p, st.st_mtime_ns, st.st_size) if st else (p, 0, -1))
+    return tuple(stamp)
+
+
+def read_mapped(path: str) -> str:
+    """Read a text file through mmap (no intermediate buffered copy)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return str(m, "utf-8")
+
+
+class CorpusIndex:
+    _COLUMNS = ("category", "dirty_flags", "customer", "product")
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.tables: Dict[str, List[str]] = {c: [] for c in self._COLUMNS}
+        self.codes: Dict[str, array] = {c: _codes((), 0) for c in self._COLUMNS}
+        self.flags = bytearray()  # bit 0: has_attachments, bit 1: expected_needs_review
+        self.attachment_names: List[str] = []
+        self.attachment_offsets = array("I", [0])
+        self.attachments_dir = ATTACHMENTS_DIR
+        self.source: Tuple = ()
+
+    # ---- build / persist ----
+
+    @classmethod
+    def build(
+        cls,
+        rfq_index: str = RFQ_INDEX,
+        attachments_index: str = ATTACHMENTS_INDEX,
+        attachments_dir: str = ATTACHMENTS_DIR,
+    ) -> "CorpusIndex":
+        index = cls()
+        index.attachments_dir = attachments_dir
+        index.source = _source_stamp([rfq_index, attachments_index])
+
+        attachments: Dict[str, List[str]] = {}
+        if os.path.exists(attachments_index):
+            with open(attachments_index, "r", encoding="utf-8", newline="") as f:
+                for r in csv.DictReader(f):
+                    attachments[r["rfq_id"]] = [n for n in r["attachment_files"].split(";") if n]
+
+        interners = {c: _Interner() for c in cls._COLUMNS}
+        codes: Dict[str, List[int]] = {c: [] for c in cls._COLUMNS}
+        offsets = index.attachment_offsets
+        names = index.attachment_names
+        with open(rfq_index, "r", encoding="utf-8", newline="") as f:
+            for r in csv.DictReader(f):
+                rfq_id = r["rfq_id"]
+                index.positions[rfq_id] = len(index.ids)
+                index.ids.append(rfq_id)
+                for c in cls._COLUMNS:
+                    codes[c].append(interners[c].code(r.get(c) or ""))
+                index.flags.append(
+                    (r.get("has_attachments") == "True") | (r.get("expected_needs_review") == "True") << 1
+                )
+                # CSR: each RFQ's attachments are one contiguous slice of the name table
+                names.extend(attachments.get(rfq_id, ()))
+                offsets.append(len(names))
+        index.tables = {c: interners[c].values for c in cls._COLUMNS}
+        index.codes = {c: _codes(codes[c], len(index.tables[c])) for c in cls._COLUMNS}
+        return index
+
+    def save(self, path: str):
+        payload = (
+            SIDECAR_MAGIC, self.source, self.attachments_dir, self.ids,
+            self.tables,
+            {c: (a.typecode, a.tobytes()) for c, a in self.codes.items()},
+            bytes(self.flags), self.attachment_names, self.attachment_offsets.tobytes(),
+        )
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump(payload, f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CorpusIndex":
+        with open(path, "rb") as f:
+            payload = marshal.load(f)
+        if payload[0] != SIDECAR_MAGIC:
+            raise ValueError(f"{path} is not a corpus index sidecar.")
+        index = cls()
+        _, index.source, index.attachments_dir, index.ids, index.tables, codes, flags, index.attachment_names, offsets = payload
+        index.positions = {rfq_id: i for i, rfq_id in enumerate(index.ids)}
+        for c, (typecode, raw) in codes.items():
+            index.codes[c] = array(typecode)
+            index.codes[c].frombytes(raw)
+        index.flags = bytearray(flags)
+        index.attachment_offsets = array("I")
+        index.attachment_offsets.frombytes(offsets)
+        return index
+
+    @classmethod
+    def open(
+        cls,
+        rfq_index: str = RFQ_INDEX,
+        attachments_index: str = ATTACHMENTS_INDEX,
+        attachments_dir: str = ATTACHMENTS_DIR,
+        sidecar: Optional[str] = None,
+    ) -> "CorpusIndex":
+        """Load the sidecar if it matches the current CSVs, otherwise build (and write the sidecar)."""
+        if sidecar and os.path.exists(sidecar):
+            try:
+                index = cls.load(sidecar)
+                if index.source == _source_stamp([rfq_index, attachments_index]) and index.attachments_dir == attachments_dir:
+                    return index
+            except (ValueError, EOFError, TypeError):
+                pass
+        index = cls.build(rfq_index, attachments_index, attachments_dir)
+        if sidecar:
+            index.save(sidecar)
+        return index
+
+    # ---- lookups ----
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, rfq_id: str) -> bool:
+        return rfq_id in self.positions
+
+    def _get(self, column: str, rfq_id: str) -> str:
+        return self.tables[column][self.codes[column][self.positions[rfq_id]]]
+
+    def category(self, rfq_id: str) -> str:
+        return self._get("category", rfq_id)
+
+    def dirty_flags(self, rfq_id: str) -> str:
+        return self._get("dirty_flags", rfq_id)
+
+    def attachments(self, rfq_id: str) -> List[str]:
+        i = self.positions[rfq_id]
+        return self.attachment_names[self.attachment_offsets[i]:self.attachment_offsets[i + 1]]
+
+    def lookup(self, rfq_id: str) -> IndexEntry:
+        i = self.positions[rfq_id]
+        t, c, flags = self.tables, self.codes, self.flags[i]
+        return IndexEntry(
+            rfq_id,
+            t["category"][c["category"][i]],
+            t["dirty_flags"][c["dirty_flags"][i]],
+            t["customer"][c["customer"][i]],
+            t["product"][c["product"][i]],
+            bool(flags & 1),
+            bool(flags & 2),
+            self.attachments(rfq_id),
+        )
+
+    def __iter__(self) -> Iterator[IndexEntry]:
+        return (self.lookup(rfq_id) for rfq_id in self.ids)
+
+    def attachment_texts(self, rfq_id: str) -> Iterator[str]:
+        """Lazily read (memory-mapped) the attachment contents of one RFQ."""
+        for name in self.attachments(rfq_id):
+            yield read_mapped(os.path.join(self.attachments_dir, name))
@@ -0,0 +1,170 @@
+"""
+Deadline scheduling for intake work: urgent RFQs are extracted first.
+
+prescan_due() finds the response due date with one regex search for its
+bullet label (labels from src/extraction/rules.py) and the date parser of
+src/extraction/normalize.py, without running the full extraction.
+
+DeadlineQueue is a thread-safe heap ordered by earliest deadline with aging.
+The key of an item is fixed when it is enqueued:
+
+    key = due + aging * enqueued
+
+An item that has waited w seconds is thus ranked like one due aging * w
+seconds earlier (default 24: an hour of waiting counts like a day), so
+long-waiting RFQs with far or unknown deadlines still come out; aging = 0
+is plain earliest-deadline-first. Because all waiting items age at the same
+rate, the keys never need to be updated. RFQs without a due date get
+due = enqueued + unknown_slack_s; "ASAP" counts as due now.
+
+order_by_deadline() applies the same order to the work items of a batch run.
+
+Queue waits are recorded per priority band (days until due at enqueue):
+
+    urgent <= 2d, high <= 5d, normal <= 10d, low > 10d, unknown
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import date, datetime, time as dt_time
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.extraction.normalize import parse_date
+from src.extraction.rules import LABELS
+from src.instrumentation.runlog import percentile
+from src.intake.corpus import RAW_DIR, read_text
+
+DAY_S = 24 * 3600
+
+# (band, upper bound in days until due); checked in order
+BANDS: Tuple[Tuple[str, float], ...] = (("urgent", 2), ("high", 5), ("normal", 10), ("low", float("inf")))
+UNKNOWN_BAND = "unknown"
+
+_DUE_LABELS = sorted((re.escape(label) for label, name in LABELS.items() if name == "response_due_date"), key=len, reverse=True)
+_DUE_LINE = re.compile(rf"^[ \t]*[-*•]?[ \t]*(?:{'|'.join(_DUE_LABELS)})[ \t]*:[ \t]*(?P<value>[^\n]*)", re.IGNORECASE | re.MULTILINE)
+
+
+def prescan_due(mail_text: str, today: Optional[date] = None, now: Optional[float] = None) -> Optional[float]:
+    """
+    Response deadline of a mail as a timestamp (end of the due day, local
+    time), now (default: the current time) for ASAP, or None if no deadline
+    is stated.
+    """
+    m = _DUE_LINE.search(mail_text)
+    if m is None:
+        return None
+    value = parse_date(m.group("value"), today)
+    if value.kind == "asap":
+        return time.time() if now is None else now
+    if value.end is None:
+        return None
+    return datetime.combine(value.end, dt_time(23, 59, 59)).timestamp()
+
+
+def band_of(due: Optional[float], now: float) -> str:
+    if due is None:
+        return UNKNOWN_BAND
+    days = (due - now) / DAY_S
+    return next(name for name, limit in BANDS if days <= limit)
+
+
+class Scheduled(NamedTuple):
+    item: Any
+    due: Optional[float]
+    band: str
+    enqueued: float
+
+
+class DeadlineQueue:
+    """Heap-backed priority queue shared by the producer and the workers; see the module docstring for the order."""
+
+    def __init__(self, aging: float = 24.0, unknown_slack_s: float = 14 * DAY_S, max_samples: int = 10_000):
+        self.aging = aging
+        self.unknown_slack_s = unknown_slack_s
+        self.waits: Dict[str, Deque[float]] = {band: deque(maxlen=max_samples) for band, _ in (*BANDS, (UNKNOWN_BAND, None))}
+        self._heap: List[Tuple[float, int, Scheduled]] = []
+        self._seq = itertools.count()  # FIFO among equal keys
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def put(self, item: Any, due: Optional[float], now: Optional[float] = None):
+        now = time.time() if now is None else now
+        entry = Scheduled(item, due, band_of(due, now), now)
+        key = (due if due is not None else now + self.unknown_slack_s) + self.aging * now
+        with self._cond:
+            heapq.heappush(self._heap, (key, next(self._seq), entry))
+            self._cond.notify()
+
+    def pop(self, now: Optional[float] = None) -> Optional[Scheduled]:
+        """Most urgent item, or None if the queue is empty (does not block)."""
+        with self._cond:
+            if not self._heap:
+                return None
+            return self._take(now)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Scheduled]:
+        """Most urgent item; blocks until one is queued, the timeout passes or the queue is closed (None)."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._heap or self._closed, timeout) or not self._heap:
+                return None
+            return self._take(None)
+
+    def _take(self, now: Optional[float]) -> Scheduled:
+        entry = heapq.heappop(self._heap)[2]
+        self.waits[entry.band].append((time.time() if now is None else now) - entry.enqueued)
+        return entry
+
+    def close(self):
+        """Wake up all blocked get() calls; items still queued can be popped."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def wait_stats(self) -> Dict[str, Dict[str, float]]:
+        """Queue wait per band (last max_samples items): count, p50, p95 and max in seconds."""
+        out = {}
+        with self._cond:
+            for band, values in self.waits.items():
+                ordered = sorted(values)
+                if not ordered:
+                    continue
+                out[band] = {
+                    "n": len(ordered),
+                    "p50_s": percentile(ordered, 50),
+                    "p95_s": percentile(ordered, 95),
+                    "max_s": ordered[-1],
+                }
+        return out
+
+
+def order_by_deadline(
+    items: Sequence[Tuple[str, Any]],
+    raw_dir: str = RAW_DIR,
+    today: Optional[date] = None,
+    now: Optional[float] = None,
+) -> List[Tuple[str, Any]]:
+    """
+    Batch work items (rfq_id first) in deadline order; all are enqueued at
+    once, so aging does not apply. The order depends on the reference time
+    (ASAP and unknown deadlines are placed relative to now, dates without a
+    year relative to today); pass both to get the same order on every node.
+    """
+    queue = DeadlineQueue(aging=0.0)
+    now = time.time() if now is None else now
+    for item in items:
+        try:
+            due = prescan_due(read_text(os.path.join(raw_dir, f"{item[0]}.txt")), today, now)
+        except OSError:
+            due = None
+        queue.put(item, due, now)
+    return [queue.pop(now).item for _ in range(len(queue))]
@@ -0,0 +1,333 @@
+"""
+Sharded batch intake: N nodes share the corpus on a common filesystem,
+each processes the RFQs of its shard, and a merge step builds the CRM
+export and a global report.
+
+Partitioning is by a stable hash of the request id (blake2b, not Python's
+per-process salted hash()), so every node computes the same assignment
+without coordination:
+
+    shard = blake2b(rfq_id) mod N
+
+Every node builds the full work list in the single-node order (--order name
+or deadline), keeps its own items and writes, under shard_dir:
+
+    shard-003-of-008/results.jsonl   one line per RFQ: {"position", "rfq_id", "ok", "error", "record"}
+    shard-003-of-008/run_log.jsonl   run log records (src/instrumentation/runlog.py)
+    shard-003-of-008/summary.json    KPI/timing summary; written last, marks the shard complete
+
+"position" is the index in the single-node order, so merge restores that
+order with a streaming k-way merge of the shard files (memory stays flat
+for the export). The deadline order depends on a reference time (ASAP,
+unknown deadlines, dates without a year): pass the same --order-time to
+every node (`local` does). summary.json holds a digest of the ordered id
+list, and merge refuses shards that disagree on it. A failed node is re-run with the same arguments; its
+shard directory is replaced as a whole.
+
+Usage (from the repo root):
+    python -m src.intake.shard run --shard 0 --shards 4 --shard-dir /shared/export/shards   # on each node
+    python -m src.intake.shard run --shard 0 --shards 4 --order deadline --order-time 2026-01-12T08:00:00+00:00
+    python -m src.intake.shard merge --shards 4 --shard-dir /shared/export/shards --format csv
+    python -m src.intake.shard local --shards 4 --format jsonl   # local processes stand in for the nodes
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.export.writers import WRITERS, open_writer
+from src.instrumentation.runlog import RunLog, format_summary, load_records, summarize
+from src.intake.batch import BatchConfig, WorkItem, build_work_items, parse_as_of, run_batch
+from src.intake.corpus import ATTACHMENTS_DIR, ATTACHMENTS_INDEX, EXPORT_DIR, RAW_DIR
+from src.intake.schedule import order_by_deadline
+
+SHARD_DIR = os.path.join(EXPORT_DIR, "shards")
+
+
+def shard_of(rfq_id: str, shards: int) -> int:
+    digest = hashlib.blake2b(rfq_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def shard_path(shard_dir: str, shard: int, shards: int) -> str:
+    return os.path.join(shard_dir, f"shard-{shard:03d}-of-{shards:03d}")
+
+
+def ordered_items(
+    raw_dir: str = RAW_DIR,
+    attachments_index: str = ATTACHMENTS_INDEX,
+    order: str = "name",
+    order_time: Optional[float] = None,
+) -> List[WorkItem]:
+    """All work items in the order a single-node batch run processes them (deadline order as of order_time, default now)."""
+    items = build_work_items(raw_dir, attachments_index)
+    if order == "deadline":
+        now = time.time() if order_time is None else order_time
+        items = order_by_deadline(items, raw_dir, date.fromtimestamp(now), now)
+    return items
+
+
+def order_digest(items: Sequence[WorkItem]) -> str:
+    """Digest of the ordered id list; equal on all nodes that process the same work list in the same order."""
+    return hashlib.blake2b("\n".join(item[0] for item in items).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def parse_order_time(value: str) -> float:
+    """Timestamp from epoch seconds or an ISO date/time (naive values are local time)."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def run_shard(
+    items: Sequence[WorkItem],
+    shard: int,
+    shards: int,
+    shard_dir: str = SHARD_DIR,
+    config: BatchConfig = BatchConfig(),
+    workers: int = 1,
+    chunk_size: int = 64,
+) -> Dict[str, object]:
+    """Process the items of one shard (items in single-node order) and return its summary."""
+    if not 0 <= shard < shards:
+        raise ValueError(f"Shard {shard} is not in 0..{shards - 1}.")
+    out = shard_path(shard_dir, shard, shards)
+    tmp = out + f".tmp-{socket.gethostname()}-{os.getpid()}"
+    os.makedirs(tmp)
+    mine = [(pos, item) for pos, item in enumerate(items) if shard_of(item[0], shards) == shard]
+    positions = {item[0]: pos for pos, item in mine}
+    config = BatchConfig(config.raw_dir, config.attachments_dir, tmp, False, config.attachment_threads, config.as_of, config.cache_path)
+
+    started = _now()
+    start = time.perf_counter()
+    run_log = RunLog(os.path.join(tmp, "run_log.jsonl"))
+    failed = 0
+    with open(os.path.join(tmp, "results.jsonl"), "w", encoding="utf-8") as f:
+        for result in run_batch([item for _, item in mine], config, workers, chunk_size):
+            run_log.write(result.log)
+            failed += not result.ok
+            line = {"position": positions[result.rfq_id], "rfq_id": result.rfq_id, "ok": result.ok, "error": result.error, "record": result.record}
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    run_log.close()
+    wall_s = time.perf_counter() - start
+
+    summary = {
+        "shard": shard,
+        "shards": shards,
+        "items_total": len(items),
+        "order_digest": order_digest(items),
+        "items": len(mine),
+        "failed": failed,
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "workers": workers,
+        "started": started,
+        "finished": _now(),
+        "kpis": summarize(run_log.records, wall_s),
+    }
+    with open(os.path.join(tmp, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    if os.path.exists(out):  # re-run of a shard: replace the earlier output as a whole
+        os.rename(out, tmp + ".old")
+        os.rename(tmp, out)
+        shutil.rmtree(tmp + ".old")
+    else:
+        os.rename(tmp, out)
+    return summary
+
+
+def load_summaries(shard_dir: str, shards: int) -> List[Dict[str, object]]:
+    """Summaries of all shards; raises if a shard is missing or was run with a different work list."""
+    summaries = []
+    for shard in range(shards):
+        path = os.path.join(shard_path(shard_dir, shard, shards), "summary.json")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Shard {shard} of {shards} is not complete ({path} missing).")
+        with open(path, "r", encoding="utf-8") as f:
+            summaries.append(json.load(f))
+    totals = {s["items_total"] for s in summaries}
+    if len(totals) != 1:
+        raise ValueError(f"Shards saw different work lists (items_total {sorted(totals)}); re-run them on the same corpus.")
+    if sum(s["items"] for s in summaries) != totals.pop():
+        raise ValueError("Shard item counts do not add up to the work list.")
+    digests = {s.get("order_digest") for s in summaries}
+    if len(digests) != 1:
+        raise ValueError("Shards saw different work list orders; re-run them with the same --order and --order-time.")
+    return summaries
+
+
+def _read_results(path: str) -> Iterator[Tuple[int, Dict[str, object]]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            result = json.loads(line)
+            yield result["position"], result
+
+
+def merged_results(shard_dir: str, shards: int) -> Iterator[Dict[str, object]]:
+    """Results of all shards in single-node order (k-way merge on position)."""
+    streams = [_read_results(os.path.join(shard_path(shard_dir, s, shards), "results.jsonl")) for s in range(shards)]
+    expected = 0
+    for position, result in heapq.merge(*streams, key=lambda pr: pr[0]):
+        if position != expected:
+            raise ValueError(f"Shard results are not a single-node order: position {position}, expected {expected}.")
+        expected += 1
+        yield result
+
+
+def merge_shards(
+    shard_dir: str = SHARD_DIR,
+    shards: int = 1,
+    out_dir: str = EXPORT_DIR,
+    fmt: str = "json",
+    **writer_kwargs,
+) -> Dict[str, object]:
+    """
+    Write the CRM export (one JSON file per RFQ, or a bulk format from
+    src/export/writers.py) in single-node order plus report.json with the
+    global KPIs and the per-shard timings. Returns the report.
+    """
+    summaries = load_summaries(shard_dir, shards)
+    os.makedirs(out_dir, exist_ok=True)
+    writer = None if fmt == "json" else open_writer(fmt, out_dir, **writer_kwargs)
+    failed = []
+    exported = 0
+    for result in merged_results(shard_dir, shards):
+        if not result["ok"]:
+            failed.append({"rfq_id": result["rfq_id"], "error": result["error"]})
+            continue
+        if writer is not None:
+            writer.write(result["record"])
+        else:
+            with open(os.path.join(out_dir, f"{result['rfq_id']}.json"), "w", encoding="utf-8") as f:
+                f.write(json.dumps(result["record"], ensure_ascii=False, indent=2))
+        exported += 1
+    if writer is not None:
+        writer.close()
+
+    records = []
+    for shard in range(shards):
+        records.extend(load_records(os.path.join(shard_path(shard_dir, shard, shards), "run_log.jsonl")))
+    # wall time of the whole run: first shard start to last shard finish (node clocks are assumed in sync)
+    started = min(datetime.fromisoformat(s["started"]) for s in summaries)
+    finished = max(datetime.fromisoformat(s["finished"]) for s in summaries)
+    items = [s["items"] for s in summaries]
+    report = {
+        "shards": shards,
+        "global": summarize(records, (finished - started).total_seconds()),
+        "failed": failed,
+        "skew": max(items) / (sum(items) / shards) if sum(items) else 1.0,  # largest shard / mean shard
+        "per_shard": [
+            {
+                "shard": s["shard"],
+                "host": s["host"],
+                "items": s["items"],
+                "failed": s["failed"],
+                "wall_s": s["kpis"]["wall_s"],
+                "throughput_rfq_per_s": s["kpis"]["throughput_rfq_per_s"],
+            }
+            for s in summaries
+        ],
+        "exported": exported,
+        "export": writer.paths if writer is not None else [out_dir],  # json: one file per RFQ in out_dir
+    }
+    with open(os.path.join(out_dir, "report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def run_local(shards: int, shard_dir: str, node_args: Sequence[str] = ()) -> List[int]:
+    """Start one `run` process per shard (stand-ins for the nodes) and return their exit codes."""
+    procs = [
+        subprocess.Popen([sys.executable, "-m", "src.intake.shard", "run", "--shard", str(shard), "--shards", str(shards),
+                          "--shard-dir", shard_dir, *node_args])
+        for shard in range(shards)
+    ]
+    return [p.wait() for p in procs]
+
+
+def _add_corpus_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--shards", type=int, required=True, help="Number of shards (nodes).")
+    parser.add_argument("--shard-dir", default=SHARD_DIR, help="Shard outputs, on the shared filesystem.")
+    parser.add_argument("--raw-dir", default=RAW_DIR)
+    parser.add_argument("--attachments-dir", default=ATTACHMENTS_DIR)
+    parser.add_argument("--attachments-index", default=ATTACHMENTS_INDEX)
+    parser.add_argument("--order", choices=["name", "deadline"], default="name", help="Single-node order the merge restores.")
+    parser.add_argument("--order-time", type=parse_order_time, default=None,
+                        help="Reference time of the deadline order (epoch seconds or ISO date/time; default: now). Must be equal on all nodes.")
+    parser.add_argument("--as-of", type=parse_as_of, default=None, help="Flag dates before this day (YYYY-MM-DD or 'today') for review.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size per node (1 = no pool).")
+    parser.add_argument("--chunk-size", type=int, default=64)
+
+
+def _add_merge_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--out-dir", default=EXPORT_DIR)
+    parser.add_argument("--format", choices=["json"] + list(WRITERS), default="json", help="json = one file per RFQ.")
+    parser.add_argument("--export-batch-size", type=int, default=1000)
+    parser.add_argument("--max-bytes", type=int, default=256 * 1024 * 1024)
+
+
+def _print_report(report: Dict[str, object]):
+    print(f"Merged {report['shards']} shard(s), skew {report['skew']:.2f} (largest / mean shard)")
+    for s in report["per_shard"]:
+        print(f"- Shard {s['shard']} on {s['host']}: {s['items']} RFQs in {s['wall_s']:.2f}s ({s['throughput_rfq_per_s']:.1f} RFQ/s), {s['failed']} failed")
+    for r in report["failed"]:
+        print(f"  - {r['rfq_id']}: {r['error']}")
+    print(f"- Exported {report['exported']} RFQ(s):")
+    for path in report["export"]:
+        print(f"  - {path}")
+    print(format_summary(report["global"]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_cmd = commands.add_parser("run", help="Process one shard (run on each node).")
+    run_cmd.add_argument("--shard", type=int, required=True)
+    _add_corpus_args(run_cmd)
+    merge_cmd = commands.add_parser("merge", help="Combine complete shards into the CRM export and a global report.")
+    merge_cmd.add_argument("--shards", type=int, required=True)
+    merge_cmd.add_argument("--shard-dir", default=SHARD_DIR)
+    _add_merge_args(merge_cmd)
+    local_cmd = commands.add_parser("local", help="Run all shards as local processes, then merge.")
+    _add_corpus_args(local_cmd)
+    _add_merge_args(local_cmd)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        items = ordered_items(args.raw_dir, args.attachments_index, args.order, args.order_time)
+        config = BatchConfig(args.raw_dir, args.attachments_dir, as_of=args.as_of)
+        summary = run_shard(items, args.shard, args.shards, args.shard_dir, config, args.workers, args.chunk_size)
+        kpis = summary["kpis"]
+        print(f"Shard {args.shard}/{args.shards}: {summary['items']} of {summary['items_total']} RFQs in {kpis['wall_s']:.2f}s, {summary['failed']} failed")
+        return
+    if args.command == "local":
+        order_time = time.time() if args.order_time is None else args.order_time  # one reference time for all nodes
+        node_args = ["--raw-dir", args.raw_dir, "--attachments-dir", args.attachments_dir, "--attachments-index", args.attachments_index,
+                     "--order", args.order, "--order-time", repr(order_time), "--workers", str(args.workers), "--chunk-size", str(args.chunk_size)]
+        if args.as_of is not None:
+            node_args += ["--as-of", args.as_of.isoformat()]
+        codes = run_local(args.shards, args.shard_dir, node_args)
+        if any(codes):
+            sys.exit(f"Shard(s) {[i for i, c in enumerate(codes) if c]} failed; re-run them with `run --shard N`, then `merge`.")
+    report = merge_shards(args.shard_dir, args.shards, args.out_dir, args.format,
+                          batch_size=args.export_batch_size, max_bytes=args.max_bytes)
+    _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Streaming JSONL intake: one request per input line, one result per output line.
+
+Input line:  {"request_id": "RFQ_0001", "mail_text": "...", "attachment_texts": ["..."]}
+Output line: {"request_id": "RFQ_0001", "valid": true, "rfq": {...}}
+             {"request_id": "RFQ_0002", "valid": false, "error": "..."}
+
+With --dedup, near-duplicates of an RFQ seen within the window are not
+extracted again (see src/intake/dedup.py); their line links the original:
+             {"request_id": "RFQ_0003", "valid": true, "duplicate_of": "RFQ_0001", "similarity": 0.93}
+An optional "received_at" (ISO timestamp) on the input line places the
+request in the dedup window; it defaults to the time of reading.
+
+With --cache, requests whose content (mail and attachment texts, see
+src/extraction/cache.py) was extracted before are answered from the cache
+with their own request_id; the lookups happen in this process, before the
+batch goes to the pool.
+
+Lines are read lazily and at most max_in_flight batches are pending at any
+time, so memory stays flat whatever the input size.
+
+Usage (from the repo root):
+    python -m src.intake.stream requests.jsonl -o export/results.jsonl --workers 4
+    cat requests.jsonl | python -m src.intake.stream - > results.jsonl
+    python -m src.intake.stream requests.jsonl -o export/results.jsonl --dedup .cache/dedup.sqlite
+    python -m src.intake.stream requests.jsonl -o export/results.jsonl --cache .cache/extraction.sqlite
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from src.extraction.rules import EXTRACTOR_VERSION, extract_rfq
+
+if TYPE_CHECKING:
+    from src.extraction.cache import ExtractionCache
+    from src.intake.dedup import DedupIndex
+
+
+def request_fields(request) -> Tuple[Optional[str], str, Sequence[str]]:
+    """(request_id, mail_text, attachment_texts) of a decoded request line; ValueError for wrong types."""
+    if not isinstance(request, dict):
+        raise ValueError("Expected a JSON object per line.")
+    request_id = request.get("request_id")
+    if request_id is not None and not isinstance(request_id, str):
+        raise ValueError("'request_id' must be a string.")
+    mail_text = request.get("mail_text", request.get("text"))
+    if not isinstance(mail_text, str):
+        raise ValueError("Missing 'mail_text'.")
+    attachment_texts = request.get("attachment_texts") or []
+    if not isinstance(attachment_texts, list) or not all(isinstance(t, str) for t in attachment_texts):
+        raise ValueError("'attachment_texts' must be a list of strings.")
+    return request_id, mail_text, attachment_texts
+
+
+def process_line(line: str) -> str:
+    request_id = None
+    try:
+        request = json.loads(line)
+        if isinstance(request, dict) and isinstance(request.get("request_id"), str):
+            request_id = request["request_id"]
+        rfq = extract_rfq(*request_fields(request))
+    except ValueError as e:  # json.JSONDecodeError and pydantic.ValidationError are ValueErrors
+        out = {"request_id": request_id, "valid": False, "error": f"{type(e).__name__}: {e}"}
+        return json.dumps(out, ensure_ascii=False) + "\n"
+    return _valid_line(rfq.request_id, rfq.model_dump_json())
+
+
+def _valid_line(request_id: str, rfq_json: str) -> str:
+    return '{"request_id": %s, "valid": true, "rfq": %s}\n' % (json.dumps(request_id), rfq_json)
+
+
+def process_lines(lines: List[str]) -> List[str]:
+    return [process_line(line) for line in lines]
+
+
+def _received(value) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(value).timestamp() if isinstance(value, str) else None
+    except ValueError:
+        return None
+
+
+def dedup_lines(index: DedupIndex, lines: List[str]) -> Tuple[List[str], Dict[int, str]]:
+    """
+    Split a batch into the lines still to extract and the output lines of
+    near-duplicates (by batch position). Lines that are not well-formed
+    requests with a request_id are left for process_line to report.
+    """
+    positions, items = [], []
+    for i, line in enumerate(lines):
+        try:
+            request = json.loads(line)
+            request_id, mail_text, attachment_texts = request_fields(request)
+        except ValueError:
+            continue
+        if request_id is None:
+            continue
+        positions.append(i)
+        items.append((request_id, mail_text, attachment_texts, _received(request.get("received_at"))))
+    resolved = {}
+    for i, item, match in zip(positions, items, index.check_many(items)):
+        if match is not None:
+            out = {"request_id": item[0], "valid": True, "duplicate_of": match.original_id, "similarity": round(match.similarity, 3)}
+            resolved[i] = json.dumps(out, ensure_ascii=False) + "\n"
+    return [line for i, line in enumerate(lines) if i not in resolved], resolved
+
+
+def cache_lines(cache: ExtractionCache, lines: List[str]) -> Tuple[List[str], Dict[int, str], List[Optional[str]]]:
+    """
+    Split a batch into the lines still to extract and the result lines served
+    from the cache (by batch position), plus the cache key of every line still
+    to extract (None for lines without a request_id or not well-formed).
+    """
+    from src.extraction.cache import cache_key
+
+    remaining, resolved, keys = [], {}, []
+    for i, line in enumerate(lines):
+        try:
+            request_id, mail_text, attachment_texts = request_fields(json.loads(line))
+        except ValueError:
+            request_id = None
+        key = None
+        if request_id is not None:
+            key = cache_key(mail_text, attachment_texts, EXTRACTOR_VERSION)
+            value = cache.get(key)
+            if value is not None:
+                rfq = json.loads(value)
+                rfq["request_id"] = request_id
+                resolved[i] = _valid_line(request_id, json.dumps(rfq, ensure_ascii=False, separators=(",", ":")))
+                continue
+        remaining.append(line)
+        keys.append(key)
+    return remaining, resolved, keys
+
+
+def store_results(cache: ExtractionCache, keys: List[Optional[str]], results: List[str]):
+    """Put the RFQs of valid result lines into the cache under the keys from cache_lines."""
+    for key, line in zip(keys, results):
+        if key is not None:
+            result = json.loads(line)
+            if result["valid"]:
+                cache.put(key, json.dumps(result["rfq"], ensure_ascii=False, separators=(",", ":")))
+
+
+def merge_results(results: List[str], resolved: Dict[int, str]) -> List[str]:
+    """Put the duplicate lines back between the extracted results, in input order."""
+    if not resolved:
+        return results
+    it = iter(results)
+    return [resolved[i] if i in resolved else next(it) for i in range(len(results) + len(resolved))]
+
+
+def iter_batches(lines: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    """Group non-blank lines into lists of batch_size without reading ahead."""
+    it = (line for line in lines if line.strip())
+    while True:
+        batch = list(islice(it, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def run_stream(
+    infile: TextIO,
+    outfile: TextIO,
+    workers: int = 1,
+    batch_size: int = 256,
+    max_in_flight: int = 0,
+    dedup: Optional[DedupIndex] = None,
+    cache: Optional[ExtractionCache] = None,
+) -> int:
+    """
+    Copy results for every input line to outfile, in input order.
+
+    With workers > 1, batches go to a process pool; once max_in_flight batches
+    (default: 2 per worker) are pending, reading blocks until the oldest batch
+    has been written (backpressure). With a dedup index and/or an extraction
+    cache, each batch is checked in this process before extraction. Returns
+    the number of processed lines.
+    """
+
+    def prepare(batch: List[str]):
+        lines, resolved = dedup_lines(dedup, batch) if dedup is not None else (batch, {})
+        lines, cached, keys = cache_lines(cache, lines) if cache is not None else (lines, {}, [])
+        return lines, (resolved, cached, keys)
+
+    def finish(results: List[str], resolved, cached, keys) -> List[str]:
+        if cache is not None:
+            store_results(cache, keys, results)
+        return merge_results(merge_results(results, cached), resolved)
+
+    n = 0
+    batches = iter_batches(infile, max(1, batch_size))
+    if workers <= 1:
+        for batch in batches:
+            lines, state = prepare(batch)
+            outfile.writelines(finish(process_lines(lines), *state))
+            n += len(batch)
+        return n
+
+    from concurrent.futures import ProcessPoolExecutor  # only pooled runs pay for multiprocessing
+
+    max_in_flight = max_in_flight or 2 * workers
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in batches:
+            if len(pending) >= max_in_flight:
+                future, state = pending.popleft()
+                results = finish(future.result(), *state)
+                outfile.writelines(results)
+                n += len(results)
+            lines, state = prepare(batch)
+            pending.append((pool.submit(process_lines, lines), state))
+        while pending:
+            future, state = pending.popleft()
+            results = finish(future.result(), *state)
+            outfile.writelines(results)
+            n += len(results)
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file or '-' for stdin.")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file or '-' for stdout.")
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size (1 = no pool).")
+    parser.add_argument("--batch-size", type=int, default=256, help="Lines per work unit.")
+    parser.add_argument("--max-in-flight", type=int, default=0, help="Pending batches before reading blocks (default: 2 per worker).")
+    parser.add_argument("--dedup", default="", help="Near-duplicate index (SQLite) to check requests against, e.g. .cache/dedup.sqlite.")
+    parser.add_argument("--dedup-threshold", type=float, default=0.8, help="Estimated Jaccard similarity that counts as duplicate.")
+    parser.add_argument("--dedup-window-hours", type=float, default=7 * 24)
+    parser.add_argument("--cache", default="", help="Extraction cache (SQLite) for repeated content, e.g. .cache/extraction.sqlite.")
+    args = parser.parse_args()
+
+    infile = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    if args.output == "-":
+        outfile = sys.stdout
+    else:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        outfile = open(args.output, "w", encoding="utf-8")
+    dedup = None
+    if args.dedup:
+        from src.intake.dedup import DedupIndex
+
+        dedup = DedupIndex(args.dedup, args.dedup_threshold, args.dedup_window_hours * 3600)
+    cache = None
+    if args.cache:
+        from src.extraction.cache import ExtractionCache
+
+        cache = ExtractionCache(args.cache)
+    try:
+        if dedup is not None:
+            dedup.prune()
+        n = run_stream(infile, outfile, args.workers, args.batch_size, args.max_in_flight, dedup, cache)
+    finally:
+        if dedup is not None:
+            dedup.close()
+        if cache is not None:
+            cache.close()
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    print(f"Processed {n} requests", file=sys.stderr)
+    if dedup is not None:
+        print(f"- Near-duplicates linked to an earlier RFQ: {dedup.duplicates}", file=sys.stderr)
+    if cache is not None:
+        stats = cache.stats()
+        print(f"- Extraction cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} entries)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
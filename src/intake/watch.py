@@ -0,0 +1,533 @@
+"""
+Watch-folder intake daemon: RFQs dropped into an inbox directory are
+extracted, validated and exported within seconds instead of at the next
+batch run.
+
+Inbox layout (same file names as data_samples/):
+    inbox/RFQ_0003.txt                  mail text
+    inbox/RFQ_0003_att_01.txt, ...      attachments
+    inbox/attachments_index.csv         optional, lists the attachments each RFQ will get
+
+New files are noticed via inotify (Linux, through ctypes) or, where that is
+not available, by polling the directory. An RFQ is dispatched once its mail
+is there and
+    - all attachments listed in attachments_index.csv have arrived, or
+      grace_s seconds have passed since the mail arrived, or
+    - (RFQs not in the index) no file of the RFQ has changed for settle_s.
+
+Senders should write files under another name (e.g. "RFQ_0003.txt.part")
+and rename them into place; the polling fallback cannot tell a half-written
+file from a complete one.
+
+Complete RFQs wait in a deadline queue (src/intake/schedule.py): the due
+date is pre-scanned from the mail, and at most max_in_flight RFQs are on the
+worker pool, the most urgent first. Workers write export/RFQ_XXXX.json atomically and move the inbox files to
+inbox/processed/ (inbox/failed/ on errors). Before dispatch an in-progress
+marker is written to state_dir; markers left behind by a crash are picked up
+at the next start and their RFQs are processed again right away (exports are
+replaced by rename, so a repeated run is harmless). If a worker fails outside
+the extraction (OSError while exporting or moving files, a dead pool
+process), the RFQ counts as failed, its marker is kept with the error and
+the daemon carries on; the RFQ is retried at the next start. Attachments
+without a mail (e.g. arriving after their RFQ was dispatched) are moved to
+inbox/failed/ after orphan_s.
+
+SIGTERM / SIGINT stop the intake of new RFQs; RFQs already on the worker
+pool are finished first, queued ones stay in the inbox for the next start.
+A local HTTP endpoint serves /health and /metrics (JSON: counters,
+arrival-to-export latency and queue wait per priority band).
+
+Usage (from the repo root):
+    python -m src.intake.watch --inbox inbox --workers 2 --metrics-port 8787
+    python -m src.intake.watch --inbox inbox --review-db .cache/review.sqlite --log export/run_log.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import re
+import select
+import signal
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.instrumentation.runlog import RunLog, percentile
+from src.intake.batch import BatchConfig, BatchResult, WorkItem, process_item
+from src.intake.corpus import EXPORT_DIR, load_attachments_index, read_text
+from src.intake.schedule import DeadlineQueue, prescan_due
+
+DEFAULT_INBOX = "inbox"
+DEFAULT_STATE_DIR = os.path.join(".cache", "watch")
+INDEX_NAME = "attachments_index.csv"
+PROCESSED_DIR = "processed"
+FAILED_DIR = "failed"
+
+_NAME = re.compile(r"(?P<rfq_id>RFQ_[A-Za-z0-9-]+?)(?P<attachment>_att_\d+)?\.txt")
+
+
+@dataclass(frozen=True)
+class WatchConfig:
+    inbox: str = DEFAULT_INBOX
+    out_dir: str = EXPORT_DIR
+    state_dir: str = DEFAULT_STATE_DIR
+    settle_s: float = 1.0  # quiet period for RFQs without an attachments_index.csv entry
+    grace_s: float = 30.0  # longest wait for listed attachments after the mail has arrived
+    orphan_s: float = 600.0  # attachments without a mail are moved to inbox/failed/ after this
+    poll_interval: float = 0.5
+    max_in_flight: int = 4  # RFQs on the worker pool at once; the rest wait in the deadline queue
+    aging: float = 24.0  # see src/intake/schedule.py
+
+
+# ---- watchers ----
+
+class PollingWatcher:
+    """Rescans the directory; reports new files and files whose size or mtime changed."""
+
+    name = "polling"
+
+    def __init__(self, path: str, interval: float = 0.5):
+        self.path = path
+        self.interval = interval
+        self._state: Dict[str, Tuple[int, int]] = {}
+
+    def scan(self) -> List[str]:
+        state = {}
+        with os.scandir(self.path) as entries:
+            for e in entries:
+                if e.is_file():
+                    st = e.stat()
+                    state[e.name] = (st.st_size, st.st_mtime_ns)
+        self._state = state
+        return sorted(state)
+
+    def wait(self, timeout: float) -> List[str]:
+        time.sleep(max(0.0, min(timeout, self.interval)))
+        before = self._state
+        self.scan()
+        return [name for name, stamp in self._state.items() if before.get(name) != stamp]
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through ctypes: reports files when they are closed after writing or moved in."""
+
+    name = "inotify"
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_Q_OVERFLOW = 0x4000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.path = path
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), self.IN_CLOSE_WRITE | self.IN_MOVED_TO) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+
+    def scan(self) -> List[str]:
+        with os.scandir(self.path) as entries:
+            return sorted(e.name for e in entries if e.is_file())
+
+    def wait(self, timeout: float) -> List[str]:
+        if not select.select([self.fd], [], [], max(0.0, timeout))[0]:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        names, offset = [], 0
+        while offset < len(data):
+            _, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            if mask & self.IN_Q_OVERFLOW:  # events were dropped: fall back to a full listing
+                return self.scan()
+            names.append(os.fsdecode(data[offset:offset + length].rstrip(b"\0")))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_watcher(path: str, poll_interval: float = 0.5, inotify: bool = True):
+    if inotify:
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError):  # no inotify on this platform or no libc symbol
+            pass
+    return PollingWatcher(path, poll_interval)
+
+
+# ---- arrivals ----
+
+@dataclass
+class Arrival:
+    first_seen: float  # when the mail was seen (monotonic)
+    last_change: float
+    mail: bool = False
+    attachments: Set[str] = field(default_factory=set)
+    recovered: bool = False  # in progress when the previous daemon stopped
+
+
+class ArrivalTracker:
+    """Collects the files of each RFQ and decides when it is complete enough to process."""
+
+    def __init__(self, settle_s: float = 1.0, grace_s: float = 30.0, orphan_s: float = 600.0):
+        self.settle_s = settle_s
+        self.grace_s = grace_s
+        self.orphan_s = orphan_s
+        self.expected: Dict[str, List[str]] = {}
+        self.arrivals: Dict[str, Arrival] = {}
+
+    def __len__(self) -> int:
+        return len(self.arrivals)
+
+    def seen(self, name: str, now: float) -> bool:
+        """Record one inbox file; True if it is the mail of a new RFQ."""
+        m = _NAME.fullmatch(name)
+        if m is None:
+            return False
+        rfq_id = m.group("rfq_id")
+        arrival = self.arrivals.get(rfq_id)
+        if arrival is None:
+            arrival = self.arrivals[rfq_id] = Arrival(now, now)
+        arrival.last_change = now
+        if m.group("attachment"):
+            arrival.attachments.add(name)
+            return False
+        if arrival.mail:
+            return False
+        arrival.mail = True
+        arrival.first_seen = now
+        return True
+
+    def _deadline(self, rfq_id: str, arrival: Arrival) -> Optional[float]:
+        """Monotonic time at which the RFQ is ready (None: not before more files arrive)."""
+        if not arrival.mail:
+            return None
+        if arrival.recovered:
+            return arrival.first_seen
+        expected = self.expected.get(rfq_id)
+        if expected is None:
+            return arrival.last_change + self.settle_s
+        if arrival.attachments.issuperset(expected):
+            return arrival.last_change
+        return arrival.first_seen + self.grace_s
+
+    def next_deadline(self) -> Optional[float]:
+        deadlines = [d for rfq_id, a in self.arrivals.items() if (d := self._deadline(rfq_id, a)) is not None]
+        return min(deadlines, default=None)
+
+    def pop_ready(self, now: float) -> List[Tuple[str, Arrival]]:
+        ready = [
+            (rfq_id, a) for rfq_id, a in self.arrivals.items()
+            if (d := self._deadline(rfq_id, a)) is not None and d <= now
+        ]
+        for rfq_id, _ in ready:
+            del self.arrivals[rfq_id]
+        return sorted(ready, key=lambda item: item[1].first_seen)
+
+    def pop_orphans(self, now: float) -> List[Tuple[str, Arrival]]:
+        """Attachment-only arrivals without a new file for orphan_s (their mail never came or was already processed)."""
+        orphans = [(rfq_id, a) for rfq_id, a in self.arrivals.items() if not a.mail and a.last_change + self.orphan_s <= now]
+        for rfq_id, _ in orphans:
+            del self.arrivals[rfq_id]
+        return orphans
+
+
+# ---- work ----
+
+def _write_atomic(path: str, data: str):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _move(inbox: str, names: List[str], target: str):
+    os.makedirs(target, exist_ok=True)
+    for name in names:
+        try:
+            os.replace(os.path.join(inbox, name), os.path.join(target, name))
+        except FileNotFoundError:
+            pass
+
+
+def process_and_export(config: WatchConfig, item: WorkItem) -> BatchResult:
+    """Worker side: extract and validate one RFQ, write its JSON export atomically, move its inbox files."""
+    rfq_id, attachments = item
+    result = process_item(BatchConfig(config.inbox, config.inbox, config.out_dir, per_file=False), item)
+    if result.ok:
+        _write_atomic(os.path.join(config.out_dir, f"{rfq_id}.json"), json.dumps(result.record, ensure_ascii=False, indent=2))
+    target = PROCESSED_DIR if result.ok else FAILED_DIR
+    _move(config.inbox, [f"{rfq_id}.txt", *attachments], os.path.join(config.inbox, target))
+    return result
+
+
+class IntakeDaemon:
+    """
+    Main loop of the watch-folder intake: watch, track arrivals, dispatch to
+    the executor, collect results. run() returns after stop is set and all
+    dispatched RFQs have finished.
+    """
+
+    def __init__(
+        self,
+        config: WatchConfig,
+        executor: Executor,
+        watcher=None,
+        run_log: Optional[RunLog] = None,
+        review_store=None,
+        make_executor: Optional[Callable[[], Executor]] = None,
+    ):
+        self.config = config
+        self.executor = executor
+        self.make_executor = make_executor  # replaces a broken process pool (a worker process died)
+        self.watcher = watcher or open_watcher(config.inbox, config.poll_interval)
+        self.run_log = run_log
+        self.review_store = review_store  # src.review.store.ReviewStore: new RFQs enter the review queue directly
+        self.tracker = ArrivalTracker(config.settle_s, config.grace_s, config.orphan_s)
+        self.queue = DeadlineQueue(config.aging)
+        self.markers = os.path.join(config.state_dir, "in_progress")
+        self.started = time.time()
+        self.stopping = False
+        self.counters = dict.fromkeys(("received", "processed", "failed", "needs_review", "recovered", "orphaned"), 0)
+        self.latencies: deque = deque(maxlen=1000)  # (arrival -> export, arrival -> dispatch) seconds
+        self._in_flight: Dict[Future, Tuple[str, Arrival, float]] = {}
+        self._index_stamp = None
+        self._lock = threading.Lock()
+        os.makedirs(config.out_dir, exist_ok=True)
+        os.makedirs(self.markers, exist_ok=True)
+
+    # ---- metrics ----
+
+    def health(self) -> Dict[str, object]:
+        return {
+            "status": "stopping" if self.stopping else "ok",
+            "uptime_s": round(time.time() - self.started, 3),
+            "watcher": self.watcher.name,
+        }
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            totals = sorted(t for t, _ in self.latencies)
+            waits = sorted(w for _, w in self.latencies)
+            out = dict(self.counters, waiting=len(self.tracker), queued=len(self.queue), in_flight=len(self._in_flight))
+        out["latency_s"] = {"p50": round(percentile(totals, 50), 4), "p95": round(percentile(totals, 95), 4), "max": totals[-1] if totals else 0.0}
+        out["dispatch_wait_s"] = {"p50": round(percentile(waits, 50), 4), "p95": round(percentile(waits, 95), 4)}
+        out["queue_wait_s"] = self.queue.wait_stats()
+        return out
+
+    def serve_metrics(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                routes = {"/health": daemon.health, "/metrics": daemon.metrics}
+                route = routes.get(self.path.split("?")[0])
+                body = json.dumps(route() if route else {"error": "not found"}).encode("utf-8")
+                self.send_response(200 if route else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="watch-metrics", daemon=True).start()
+        return server
+
+    # ---- loop ----
+
+    def _on_file(self, name: str, now: float):
+        if name == INDEX_NAME:
+            self._load_index()
+        elif self.tracker.seen(name, now):
+            with self._lock:
+                self.counters["received"] += 1
+
+    def _load_index(self):
+        path = os.path.join(self.config.inbox, INDEX_NAME)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        if (st.st_size, st.st_mtime_ns) != self._index_stamp:
+            self._index_stamp = (st.st_size, st.st_mtime_ns)
+            self.tracker.expected = load_attachments_index(path)
+
+    def _recover(self, now: float):
+        """Files already in the inbox are arrivals; RFQs with a leftover marker are processed first."""
+        for name in self.watcher.scan():
+            self._on_file(name, now)
+        for name in os.listdir(self.markers):
+            rfq_id = name[:-len(".json")]
+            arrival = self.tracker.arrivals.get(rfq_id)
+            if arrival is not None and arrival.mail:
+                arrival.recovered = True
+                with self._lock:
+                    self.counters["recovered"] += 1
+            else:  # finished before the crash; only the marker was left
+                os.remove(os.path.join(self.markers, name))
+
+    def _enqueue(self, rfq_id: str, arrival: Arrival):
+        if arrival.recovered:
+            due = time.time()  # was already dispatched once: goes first
+        else:
+            try:
+                due = prescan_due(read_text(os.path.join(self.config.inbox, f"{rfq_id}.txt")))
+            except OSError:
+                due = None  # the worker reports the missing file
+        self.queue.put((rfq_id, arrival), due)
+
+    def _dispatch(self, rfq_id: str, arrival: Arrival, now: float):
+        attachments = sorted(arrival.attachments)
+        marker = {"rfq_id": rfq_id, "attachments": attachments, "dispatched_at": time.time()}
+        _write_atomic(os.path.join(self.markers, f"{rfq_id}.json"), json.dumps(marker))
+        try:
+            future = self.executor.submit(process_and_export, self.config, (rfq_id, attachments))
+        except BrokenExecutor as e:
+            if self.make_executor is None:
+                self._fail(rfq_id, marker, e)
+                return
+            self.executor.shutdown(wait=False)
+            self.executor = self.make_executor()
+            future = self.executor.submit(process_and_export, self.config, (rfq_id, attachments))
+        with self._lock:
+            self._in_flight[future] = (rfq_id, arrival, now)
+
+    def _fail(self, rfq_id: str, marker: Dict[str, object], error: BaseException):
+        """Worker failure outside the extraction: keep the marker (retried at the next start) with the error."""
+        marker = dict(marker, failed_at=time.time(), error=f"{type(error).__name__}: {error}")
+        try:
+            _write_atomic(os.path.join(self.markers, f"{rfq_id}.json"), json.dumps(marker))
+        except OSError:
+            pass  # the marker written at dispatch stays
+        with self._lock:
+            self.counters["failed"] += 1
+
+    def _collect(self, wait: bool = False):
+        for future in [f for f in self._in_flight if wait or f.done()]:
+            rfq_id, arrival, dispatched = self._in_flight[future]
+            try:
+                result = future.result()
+            except (OSError, BrokenExecutor) as e:  # export/move failed, or the worker process died
+                with self._lock:
+                    del self._in_flight[future]
+                self._fail(rfq_id, {"rfq_id": rfq_id, "attachments": sorted(arrival.attachments)}, e)
+                continue
+            done = time.monotonic()
+            if result.ok and self.review_store is not None:
+                self.review_store.add([result.record], os.path.join(os.path.normpath(self.config.out_dir), f"{rfq_id}.json"))
+            if self.run_log is not None:
+                self.run_log.write(result.log)
+            os.remove(os.path.join(self.markers, f"{rfq_id}.json"))
+            with self._lock:
+                del self._in_flight[future]
+                self.counters["processed" if result.ok else "failed"] += 1
+                self.counters["needs_review"] += bool(result.needs_review)
+                self.latencies.append((done - arrival.first_seen, dispatched - arrival.first_seen))
+
+    def run(self, stop: threading.Event):
+        self._load_index()
+        self._recover(time.monotonic())
+        try:
+            while not stop.is_set():
+                now = time.monotonic()
+                for rfq_id, arrival in self.tracker.pop_ready(now):
+                    self._enqueue(rfq_id, arrival)
+                for rfq_id, arrival in self.tracker.pop_orphans(now):
+                    _move(self.config.inbox, sorted(arrival.attachments), os.path.join(self.config.inbox, FAILED_DIR))
+                    with self._lock:
+                        self.counters["orphaned"] += 1
+                while len(self._in_flight) < self.config.max_in_flight and (entry := self.queue.pop()) is not None:
+                    self._dispatch(*entry.item, now)
+                timeout = self.config.poll_interval
+                deadline = self.tracker.next_deadline()
+                if deadline is not None:
+                    timeout = min(timeout, max(0.0, deadline - now))
+                if self._in_flight:
+                    timeout = min(timeout, 0.05)  # pick up finished RFQs promptly
+                for name in self.watcher.wait(timeout):
+                    self._on_file(name, time.monotonic())
+                self._collect()
+        finally:
+            self.stopping = True
+            self._collect(wait=True)  # graceful: finish what was dispatched, leave the rest in the inbox
+            self.watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--inbox", default=DEFAULT_INBOX)
+    parser.add_argument("--out-dir", default=EXPORT_DIR)
+    parser.add_argument("--state-dir", default=DEFAULT_STATE_DIR, help="In-progress markers for crash recovery.")
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size (1 = one worker thread).")
+    parser.add_argument("--settle", type=float, default=1.0, help="Quiet seconds before an RFQ without index entry is processed.")
+    parser.add_argument("--grace", type=float, default=30.0, help="Longest wait (s) for attachments listed in attachments_index.csv.")
+    parser.add_argument("--orphan", type=float, default=600.0, help="Seconds after which attachments without a mail go to inbox/failed/.")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--max-in-flight", type=int, default=0, help="RFQs on the worker pool at once (default: 2 per worker).")
+    parser.add_argument("--aging", type=float, default=24.0, help="Deadline-queue aging: seconds of priority gained per second waited.")
+    parser.add_argument("--no-inotify", action="store_true", help="Always poll the inbox.")
+    parser.add_argument("--metrics-port", type=int, default=8787, help="Port for /health and /metrics on 127.0.0.1 (0 = off).")
+    parser.add_argument("--review-db", default="", help="Add new RFQs to this review store (see src/review/store.py).")
+    parser.add_argument("--log", default="", help="Append one JSONL run log record per RFQ to this file.")
+    args = parser.parse_args()
+
+    config = WatchConfig(
+        args.inbox, args.out_dir, args.state_dir, args.settle, args.grace, args.orphan, args.poll_interval,
+        args.max_in_flight or 2 * max(1, args.workers), args.aging,
+    )
+    os.makedirs(config.inbox, exist_ok=True)
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    review_store = None
+    if args.review_db:
+        from src.review.store import ReviewStore
+        review_store = ReviewStore(args.review_db)
+
+    def make_executor() -> Executor:
+        return ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else ThreadPoolExecutor(max_workers=1)
+
+    watcher = open_watcher(config.inbox, config.poll_interval, inotify=not args.no_inotify)
+    run_log = RunLog(args.log or None)
+    daemon = IntakeDaemon(config, make_executor(), watcher, run_log, review_store, make_executor)
+    server = daemon.serve_metrics(args.metrics_port) if args.metrics_port else None
+    print(f"Watching {config.inbox}/ ({watcher.name}); exports to {config.out_dir}/"
+          + (f"; metrics on http://127.0.0.1:{server.server_address[1]}/metrics" if server else ""), flush=True)
+    try:
+        daemon.run(stop)
+    finally:
+        daemon.executor.shutdown()
+        if server is not None:
+            server.shutdown()
+        run_log.close()
+        if review_store is not None:
+            review_store.close()
+    m = daemon.metrics()
+    print(f"Stopped: {m['processed']} processed, {m['failed']} failed, {m['waiting'] + m['queued']} left in the inbox;"
+          f" latency p50 {m['latency_s']['p50']:.3f}s, p95 {m['latency_s']['p95']:.3f}s")
+    for band, st in m["queue_wait_s"].items():
+        print(f"- Queue wait {band:<8} n={st['n']}: p50 {st['p50_s']:.3f}s, p95 {st['p95_s']:.3f}s, max {st['max_s']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Pre-warmed extraction worker on a local Unix socket, for per-message hooks.
+
+A hook that starts `python -m src.intake.stream` for every mail pays for the
+interpreter, the imports and the pydantic model build each time. The worker
+pays once: `serve` loads the extraction code, runs one warm-up RFQ and then
+answers requests over the socket. The protocol is the one of
+src/intake/stream.py: one JSON request per line in, one result line out, in
+order; several lines per connection are fine.
+
+The client side (`send`, the `send` command) only imports the standard
+library. Any Unix socket client works as well, e.g.
+    printf '%s\\n' '{"request_id": "RFQ_0001", "mail_text": "..."}' | socat - UNIX-CONNECT:.cache/worker.sock
+    ... | nc -U -q 1 .cache/worker.sock
+
+The socket file is created with mode 0600 and removed on SIGTERM/SIGINT.
+
+Usage (from the repo root):
+    python -m src.intake.worker serve --socket .cache/worker.sock
+    python -m src.intake.worker send --request-id RFQ_0001 < data_samples/raw/RFQ_0001.txt
+    python -m src.intake.worker send --jsonl < requests.jsonl > results.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Iterable, Iterator, Optional, Sequence
+
+DEFAULT_SOCKET = os.path.join(".cache", "worker.sock")
+
+WARMUP_REQUEST = {
+    "request_id": "WARMUP",
+    "mail_text": "Subject: RFQ\n\n- Product: bracket\n- Quantity: 10 pcs\n- Response due date: ASAP\n",
+}
+
+
+def _remove_stale(path: str):
+    """Remove a socket file left by a crashed worker; refuse to take over one that still answers."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"A worker is already listening on {path}.")
+    finally:
+        probe.close()
+
+
+def make_server(path: str = DEFAULT_SOCKET):
+    """Bound, pre-warmed server (not yet serving); the extraction code is imported here."""
+    import socketserver
+
+    from src.intake.stream import process_line
+
+    t0 = time.perf_counter()
+    process_line(json.dumps(WARMUP_REQUEST))  # builds the pydantic validators and compiles the regexes
+    warmup_s = time.perf_counter() - t0
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode("utf-8", errors="replace")
+                if line.strip():
+                    self.wfile.write(process_line(line).encode("utf-8"))
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    _remove_stale(path)
+    old_umask = os.umask(0o177)  # no window in which other users could connect
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    server.warmup_s = warmup_s
+    return server
+
+
+def serve(path: str = DEFAULT_SOCKET):
+    """Serve until SIGTERM/SIGINT; connections in progress are finished, then the socket file is removed."""
+    server = make_server(path)
+
+    def stop(signum, frame):
+        threading.Thread(target=server.shutdown).start()  # shutdown() waits for serve_forever() on this thread
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"Worker listening on {path} (warm-up {server.warmup_s * 1000:.0f} ms)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def send(lines: Iterable[str], path: str = DEFAULT_SOCKET, timeout: Optional[float] = 60.0) -> Iterator[str]:
+    """
+    Send request lines to a running worker and yield the result lines in
+    order. Lines are written from a second thread, so large inputs do not
+    block on a full socket buffer.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(path)
+
+    def write():
+        try:
+            for line in lines:
+                sock.sendall((line if line.endswith("\n") else line + "\n").encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass  # the reader reports the broken connection
+
+    writer = threading.Thread(target=write, daemon=True)
+    writer.start()
+    try:
+        with sock.makefile("r", encoding="utf-8") as f:
+            yield from f
+    finally:
+        sock.close()
+        writer.join(timeout=1.0)
+
+
+def request_line(request_id: Optional[str], mail_text: str, attachment_texts: Sequence[str] = ()) -> str:
+    return json.dumps({"request_id": request_id, "mail_text": mail_text, "attachment_texts": list(attachment_texts)}, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_cmd = commands.add_parser("serve", help="Start the worker.")
+    serve_cmd.add_argument("--socket", default=DEFAULT_SOCKET)
+    send_cmd = commands.add_parser("send", help="Send one mail (stdin) or JSONL requests (--jsonl) to the worker.")
+    send_cmd.add_argument("--socket", default=DEFAULT_SOCKET)
+    send_cmd.add_argument("--request-id", default=None, help="request_id of the mail on stdin.")
+    send_cmd.add_argument("--attachment", action="append", default=[], help="Attachment text file (repeatable).")
+    send_cmd.add_argument("--jsonl", action="store_true", help="stdin holds stream requests, one per line.")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket)
+        return
+    if args.jsonl:
+        lines: Iterable[str] = sys.stdin
+    else:
+        attachments = []
+        for name in args.attachment:
+            with open(name, "r", encoding="utf-8") as f:
+                attachments.append(f.read())
+        lines = [request_line(args.request_id, sys.stdin.read(), attachments)]
+    try:
+        sys.stdout.writelines(send(lines, args.socket))
+    except OSError as e:
+        sys.exit(f"No worker on {args.socket} ({e}); start one with `python -m src.intake.worker serve`.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Compact struct-of-arrays container for many RFQs held in memory (dedup, export).
+
+Each column is one array instead of one attribute per RFQ instance:
+- customer_name, product_or_service, quantity_unit, incoterms: interned
+  strings, one int code per RFQ (code 0 = None)
+- missing_fields, clarification_questions, tasks, certifications_required:
+  interned tuples; the review rules produce only a few hundred distinct combinations
+- request_id, contact_name, contact_email, specification, delivery_location:
+  UTF-8 bytes packed into one buffer per column with CSR offsets
+- quantity: float64 (NaN = None), needs_review: one byte
+- requested_delivery_date, response_due_date: ordinal days (0 = "unknown")
+
+Conversion to and from RFQ is lossless, so pydantic is only needed at the
+boundaries: RFQBatch.from_rfqs(rfqs) ... batch.to_rfq(i) / iter(batch).
+"""
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from datetime import date
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional
+
+from src.models.rfq import RFQ, UNKNOWN
+
+INTERNED = ("customer_name", "product_or_service", "quantity_unit", "incoterms")
+PACKED = ("request_id", "contact_name", "contact_email", "specification", "delivery_location")
+DATES = ("requested_delivery_date", "response_due_date")
+LISTS = ("missing_fields", "clarification_questions", "tasks", "certifications_required")
+
+
+class _Interner:
+    """Value table with code 0 reserved for None."""
+
+    def __init__(self):
+        self.values: List[Optional[Hashable]] = [None]
+        self.codes: Dict[Hashable, int] = {}
+
+    def code(self, value: Optional[Hashable]) -> int:
+        if value is None:
+            return 0
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.values) + sys.getsizeof(self.codes) + sum(_deep_size(v) for v in self.values[1:])
+
+
+class _PackedStrings:
+    """Optional strings as one UTF-8 buffer plus offsets (row i = data[offsets[i]:offsets[i + 1]])."""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("Q", [0])
+        self.nulls = bytearray()
+
+    def append(self, value: Optional[str]):
+        self.nulls.append(value is None)
+        if value:
+            self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if self.nulls[i]:
+            return None
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.data) + sys.getsizeof(self.offsets) + sys.getsizeof(self.nulls)
+
+
+def _deep_size(value) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+def _date_ordinal(value: str) -> int:
+    return 0 if value == UNKNOWN else date.fromisoformat(value).toordinal()
+
+
+class RFQBatch:
+    """Append-only column store of RFQs; index access returns a validated-equivalent RFQ."""
+
+    def __init__(self):
+        self._interned = {name: (_Interner(), array("I")) for name in INTERNED + LISTS}
+        self._packed = {name: _PackedStrings() for name in PACKED}
+        self._dates = {name: array("i") for name in DATES}
+        # Dates whose ISO text does not round-trip through an ordinal (e.g. '20260427') -> (row, field): text
+        self._odd_dates: Dict[tuple, str] = {}
+        self._quantity = array("d")
+        self._needs_review = bytearray()
+
+    @classmethod
+    def from_rfqs(cls, rfqs: Iterable[RFQ]) -> "RFQBatch":
+        batch = cls()
+        batch.extend(rfqs)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self._needs_review)
+
+    def append(self, rfq: RFQ):
+        row = len(self)
+        for name in INTERNED:
+            table, codes = self._interned[name]
+            codes.append(table.code(getattr(rfq, name)))
+        for name in LISTS:
+            table, codes = self._interned[name]
+            codes.append(table.code(tuple(getattr(rfq, name))))
+        for name in PACKED:
+            self._packed[name].append(getattr(rfq, name))
+        for name in DATES:
+            value = getattr(rfq, name)
+            ordinal = _date_ordinal(value)
+            if ordinal and date.fromordinal(ordinal).isoformat() != value:
+                self._odd_dates[(row, name)] = value
+            self._dates[name].append(ordinal)
+        self._quantity.append(math.nan if rfq.quantity is None else rfq.quantity)
+        self._needs_review.append(rfq.needs_review)
+
+    def extend(self, rfqs: Iterable[RFQ]):
+        for rfq in rfqs:
+            self.append(rfq)
+
+    def record(self, i: int) -> Dict[str, object]:
+        """Row i as an RFQ-shaped dict (same values as RFQ.model_dump())."""
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        out: Dict[str, object] = {}
+        for name in INTERNED:
+            table, codes = self._interned[name]
+            out[name] = table.values[codes[i]]
+        for name in LISTS:
+            table, codes = self._interned[name]
+            out[name] = list(table.values[codes[i]])
+        for name in PACKED:
+            out[name] = self._packed[name][i]
+        for name in DATES:
+            ordinal = self._dates[name][i]
+            out[name] = self._odd_dates.get((i, name)) or (date.fromordinal(ordinal).isoformat() if ordinal else UNKNOWN)
+        quantity = self._quantity[i]
+        out["quantity"] = None if math.isnan(quantity) else quantity
+        out["needs_review"] = bool(self._needs_review[i])
+        return {name: out[name] for name in RFQ.model_fields}
+
+    def to_rfq(self, i: int, validate: bool = False) -> RFQ:
+        """
+        Row i as an RFQ. Rows were validated on the way in, so by default the
+        model is constructed without re-validation.
+        """
+        record = self.record(i)
+        return RFQ.model_validate(record) if validate else RFQ.model_construct(**record)
+
+    def __getitem__(self, i: int) -> RFQ:
+        return self.to_rfq(i)
+
+    def __iter__(self) -> Iterator[RFQ]:
+        for i in range(len(self)):
+            yield self.to_rfq(i)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the batch, including the interned tables."""
+        total = sys.getsizeof(self._odd_dates) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in self._odd_dates.items())
+        for table, codes in self._interned.values():
+            total += table.nbytes() + sys.getsizeof(codes)
+        total += sum(p.nbytes() for p in self._packed.values())
+        total += sum(sys.getsizeof(a) for a in self._dates.values())
+        return total + sys.getsizeof(self._quantity) + sys.getsizeof(self._needs_review)
@@ -0,0 +1,3 @@
+"""Values shared by the RFQ model and the extraction/review code; importable without pydantic."""
+
+UNKNOWN = "unknown"  # dates and required strings that could not be determined
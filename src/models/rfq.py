@@ -1,10 +1,18 @@
 #Imports
 from __future__ import annotations #Aktiviert ein Python-Feature: Type Hints werden als “Strings” behandelt
 from datetime import date #Importiert den Typ date, um ISO-Datumstrings zu prüfen
-from typing import List, Optional #Das sind Typen für Type Hints: Optional[str] bedeutet: entweder str oder None; List[str] bedeutet: Liste von Strings
-from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator #Das ist alles aus pydantic (v2), um dein Datenmodell zu definieren und zu prüfen
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union #Das sind Typen für Type Hints: Optional[str] bedeutet: entweder str oder None; List[str] bedeutet: Liste von Strings
+from pydantic import BaseModel, Field, ConfigDict, ValidationError, field_validator, model_validator #Das ist alles aus pydantic (v2), um dein Datenmodell zu definieren und zu prüfen
 
-UNKNOWN = "unknown" #konstante um den String nur einmal zu definieren
+from src.models.constants import UNKNOWN #konstante um den String nur einmal zu definieren (liegt in constants.py, damit sie ohne pydantic importierbar ist)
+
+class BulkValidation(NamedTuple): #Ergebnis von RFQ.validate_many
+    records: List[Optional["RFQ"]] #gleiche Reihenfolge wie der Input, None bei ungültigen Datensätzen
+    errors: Dict[int, List[dict]] #Index des Datensatzes -> pydantic Fehler dieses Datensatzes
+
+    @property
+    def valid(self) -> List["RFQ"]:
+        return [r for r in self.records if r is not None]
 
 class RFQ(BaseModel): #eine Klasse RFQ und erbt BaseModel aus import
     """
@@ -44,6 +52,9 @@ class RFQ(BaseModel): #eine Klasse RFQ und erbt BaseModel aus import
     clarification_questions: List[str] = Field(default_factory=list)
     tasks: List[str] = Field(default_factory=list)
 
+    # Optional fields (docs/rfq-data-model.md, Nice-to-have)
+    certifications_required: List[str] = Field(default_factory=list) #z.B. ["RoHS", "REACH"], aus den Quality-Anhängen
+
     # ---- Validators ----
 
     @field_validator("requested_delivery_date", "response_due_date") #ein Validator für die Felder request.../response...
@@ -80,3 +91,26 @@ class RFQ(BaseModel): #eine Klasse RFQ und erbt BaseModel aus import
         if self.quantity_unit and self.quantity is None:
             raise ValueError("quantity_unit is set but quantity is missing.")
         return self
+
+    # ---- Bulk validation ----
+
+    @classmethod
+    def validate_many(cls, records: Iterable[Union[dict, str, bytes]], *, from_json: bool = False) -> BulkValidation:
+        """
+        Validate many records; invalid ones are reported per record instead of stopping the run.
+
+        records are dicts, or JSON documents (str/bytes, one RFQ each) when from_json=True.
+        Each record is validated on its own: one bulk call over a List[RFQ] TypeAdapter
+        was measured slower than this loop (the validators of the model run in Python
+        either way), and joining JSON documents lets a malformed one shift the others.
+        """
+        validate = cls.model_validate_json if from_json else cls.model_validate
+        out: List[Optional[RFQ]] = []
+        errors: Dict[int, List[dict]] = {}
+        for i, record in enumerate(records):
+            try:
+                out.append(validate(record))
+            except ValidationError as e:
+                out.append(None)
+                errors[i] = e.errors(include_url=False, include_input=False)
+        return BulkValidation(out, errors)
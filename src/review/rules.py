@@ -0,0 +1,224 @@
+"""
+Declarative review rules (docs/rfq-data-model.md): which fields are missing or
+uncertain, and the resulting needs_review flag, clarification questions and
+3–7 standardized tasks.
+
+Rules are evaluated column-wise over a batch. Each rule sets one bit of a
+per-record code, and the outputs for every possible code are precomputed in
+a lookup table. The per-record work after the column passes is a single
+table lookup. Columns are plain Python sequences (stdlib only, in line with
+requirements.txt); the same code serves single records through review_fields().
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from src.models.constants import UNKNOWN
+
+BASE_TASKS = ("Check delivery feasibility", "Prepare quotation")
+CLEAN_TASK = "Send quotation to customer"
+MAX_TASKS = 7  # 3–7 standardized tasks per RFQ
+MERGED_TASK = "Clarify remaining open points with customer"  # replaces the field tasks beyond MAX_TASKS
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """A review field: missing (None/'unknown') -> question + task."""
+
+    field: str
+    question: str
+    task: str
+
+
+@dataclass(frozen=True)
+class UncertaintyRule:
+    """
+    A flag that makes a present field uncertain (contradiction or implausible value).
+    Non-blocking rules only add their question: the value stays authoritative and the
+    RFQ does not need review for it (e.g. the mail wins over an attachment).
+    """
+
+    flag: str
+    field: str
+    question: str
+    blocking: bool = True
+
+
+# Fields whose absence (or ambiguity) sends an RFQ to human review, in report order.
+FIELD_RULES = (
+    FieldRule("product_or_service", "Which product or service should we quote?", "Clarify requested product"),
+    FieldRule("specification", "Can you provide the technical specification?", "Request technical specification"),
+    FieldRule("quantity", "What quantity do you require (number and unit)?", "Clarify quantity"),
+    FieldRule("requested_delivery_date", "What is the requested delivery date?", "Clarify delivery date"),
+    FieldRule("incoterms", "Which Incoterms should apply to the delivery?", "Clarify Incoterms"),
+    FieldRule("response_due_date", "Do you have a response deadline (due date)?", "Clarify response deadline"),
+)
+
+# Contradictions raised by the extractor (two_* flag names match rfq_index.csv dirty_flags), mail/attachment
+# conflicts from src/extraction/attachments.py (non-blocking: the mail wins, the customer is asked to confirm),
+# then plausibility rules that are only evaluated when an as_of date is given.
+UNCERTAINTY_RULES = (
+    UncertaintyRule("two_quantities", "quantity", "Which quantity should we quote, or do you need pricing for both quantities?"),
+    UncertaintyRule("two_dates", "requested_delivery_date", "Which of the mentioned delivery dates is binding?"),
+    UncertaintyRule(
+        "attachment_date_conflict", "requested_delivery_date",
+        "The delivery date in your mail lies outside the delivery window in the attachment. Which applies?",
+        blocking=False,
+    ),
+    UncertaintyRule(
+        "attachment_location_conflict", "delivery_location",
+        "The delivery location in your mail differs from the delivery address in the attachment. Which applies?",
+        blocking=False,
+    ),
+    UncertaintyRule("past_delivery_date", "requested_delivery_date", "The requested delivery date is in the past. Which date applies?"),
+    UncertaintyRule("past_response_due_date", "response_due_date", "The response deadline is in the past. Is there a new deadline?"),
+)
+
+# Flag -> field it makes uncertain / per-key question and task (dict views of the rules above)
+CONTRADICTIONS = {r.flag: r.field for r in UNCERTAINTY_RULES if r.blocking and not r.flag.startswith("past_")}
+QUESTIONS = {**{r.field: r.question for r in FIELD_RULES}, **{r.flag: r.question for r in UNCERTAINTY_RULES}}
+TASKS = {r.field: r.task for r in FIELD_RULES}
+
+REVIEW_FIELDS = tuple(r.field for r in FIELD_RULES)
+FLAG_BITS = {r.flag: 1 << (len(FIELD_RULES) + i) for i, r in enumerate(UNCERTAINTY_RULES)}
+
+
+class ReviewOutcome(NamedTuple):
+    needs_review: bool
+    missing_fields: Tuple[str, ...]
+    clarification_questions: Tuple[str, ...]
+    tasks: Tuple[str, ...]
+
+
+def _outcome(code: int) -> ReviewOutcome:
+    missing, questions, tasks = [], [], list(BASE_TASKS)
+    for i, rule in enumerate(FIELD_RULES):
+        if code & (1 << i):
+            question = rule.question
+        else:
+            question = next(
+                (u.question for u in UNCERTAINTY_RULES if u.blocking and u.field == rule.field and code & FLAG_BITS[u.flag]),
+                None,
+            )
+            if question is None:
+                continue
+        missing.append(rule.field)
+        questions.append(question)
+        tasks.append(rule.task)
+    questions.extend(u.question for u in UNCERTAINTY_RULES if not u.blocking and code & FLAG_BITS[u.flag])
+    if not missing:
+        tasks.append(CLEAN_TASK)
+    elif len(tasks) > MAX_TASKS:
+        tasks[MAX_TASKS - 1:] = [MERGED_TASK]
+    return ReviewOutcome(bool(missing), tuple(missing), tuple(questions), tuple(tasks))
+
+
+# Every combination of rule bits -> outcome
+OUTCOMES: Tuple[ReviewOutcome, ...] = tuple(_outcome(c) for c in range(1 << (len(FIELD_RULES) + len(UNCERTAINTY_RULES))))
+
+
+class ReviewColumns(NamedTuple):
+    needs_review: List[bool]
+    missing_fields: List[Tuple[str, ...]]
+    clarification_questions: List[Tuple[str, ...]]
+    tasks: List[Tuple[str, ...]]
+
+
+def _ordinal(value) -> int:
+    """ISO date string -> ordinal day, 0 for None/'unknown'/invalid."""
+    if not value or value == UNKNOWN:
+        return 0
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+def evaluate_codes(
+    columns: Mapping[str, Sequence],
+    flags: Optional[Sequence[Iterable[str]]] = None,
+    as_of: Optional[date] = None,
+) -> List[int]:
+    """
+    Rule bits per record, computed one column at a time.
+
+    columns: field name -> values (all of equal length; absent columns count as missing)
+    flags:   per-record extraction flags, e.g. {"two_quantities"}
+    as_of:   enables the past-date rules (dates before as_of are uncertain)
+    """
+    n = max((len(c) for c in columns.values()), default=0)
+    if flags is not None:
+        n = max(n, len(flags))
+    codes = [0] * n
+
+    for i, rule in enumerate(FIELD_RULES):
+        bit = 1 << i
+        col = columns.get(rule.field)
+        if col is None:
+            codes = [c | bit for c in codes]
+        else:
+            codes = [c | bit if (v is None or v == UNKNOWN) else c for c, v in zip(codes, col)]
+
+    if flags is not None:
+        codes = [c | _flag_bits(f) if f else c for c, f in zip(codes, flags)]
+
+    if as_of is not None:
+        today = as_of.toordinal()
+        for field, flag in (("requested_delivery_date", "past_delivery_date"), ("response_due_date", "past_response_due_date")):
+            col = columns.get(field)
+            if col is None:
+                continue
+            bit = FLAG_BITS[flag]
+            days = [_ordinal(v) for v in col]
+            codes = [c | bit if 0 < d < today else c for c, d in zip(codes, days)]
+    return codes
+
+
+def _flag_bits(flags: Iterable[str]) -> int:
+    bits = 0
+    for f in flags:
+        bits |= FLAG_BITS.get(f, 0)
+    return bits
+
+
+def evaluate_batch(
+    columns: Mapping[str, Sequence],
+    flags: Optional[Sequence[Iterable[str]]] = None,
+    as_of: Optional[date] = None,
+) -> ReviewColumns:
+    """Review outputs for a batch held column-wise; one table lookup per record."""
+    outcomes = [OUTCOMES[c] for c in evaluate_codes(columns, flags, as_of)]
+    if not outcomes:
+        return ReviewColumns([], [], [], [])
+    return ReviewColumns(*(list(col) for col in zip(*outcomes)))
+
+
+def to_columns(records: Sequence[Mapping[str, object]]) -> Dict[str, List[object]]:
+    """Row dicts -> the columns the rules read."""
+    fields = set(REVIEW_FIELDS)
+    return {f: [r.get(f) for r in records] for f in fields}
+
+
+def review_fields(values: Mapping[str, object], flags: Iterable[str] = (), as_of: Optional[date] = None) -> Dict[str, object]:
+    """Single-record form: needs_review, missing_fields, clarification_questions and tasks."""
+    code = evaluate_codes({f: [values.get(f)] for f in REVIEW_FIELDS}, [flags], as_of)[0]
+    outcome = OUTCOMES[code]
+    return {
+        "needs_review": outcome.needs_review,
+        "missing_fields": list(outcome.missing_fields),
+        "clarification_questions": list(outcome.clarification_questions),
+        "tasks": list(outcome.tasks),
+    }
+
+
+def apply_review(records: List[Dict[str, object]], flags: Optional[Sequence[Iterable[str]]] = None, as_of: Optional[date] = None) -> List[Dict[str, object]]:
+    """Fill the review fields of a batch of RFQ-shaped dicts in place (and return them)."""
+    review = evaluate_batch(to_columns(records), flags, as_of)
+    for r, nr, mf, cq, t in zip(records, *review):
+        r["needs_review"] = nr
+        r["missing_fields"] = list(mf)
+        r["clarification_questions"] = list(cq)
+        r["tasks"] = list(t)
+    return records
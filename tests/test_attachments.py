@@ -0,0 +1,70 @@
+import os
+
+from src.extraction.attachments import AttachmentReader, merge_attachments, parse_attachment
+from src.extraction.rules import conflict_questions, extract_rfq
+from src.review.rules import QUESTIONS
+
+ADDRESSES = open("data_samples/attachments/RFQ_0003_att_01.txt", encoding="utf-8").read()
+QUALITY = open("data_samples/attachments/RFQ_0003_att_03.txt", encoding="utf-8").read()
+MAIL = open("data_samples/raw/RFQ_0003.txt", encoding="utf-8").read()
+
+
+def test_classify_and_scan():
+    att = parse_attachment(ADDRESSES)
+    assert (att.kind, att.rfq_id) == ("addresses", "RFQ_0003")
+    assert att.blocks["delivery address"][-1] == "20095 Hamburg"
+    assert att.values["requested delivery window"] == "2026-04-06 to 2026-05-16"
+    quality = parse_attachment("Attachment: Quality & Compliance Requirements (RFQ_9)\n\nCompliance: RoHS, REACH\n")
+    assert quality.kind == "quality" and quality.certifications == ["RoHS", "REACH"]
+
+
+def test_merge_precedence_and_conflicts():
+    values = {"delivery_location": "Berlin, DE", "requested_delivery_date": "2026-04-20"}
+    flags = set()
+    conflicts = merge_attachments(values, flags, [parse_attachment(ADDRESSES), parse_attachment(QUALITY)])
+    assert values["delivery_location"] == "Berlin, DE"  # the mail wins
+    assert values["certifications_required"] == ["ISO 9001"]  # attachments fill gaps
+    assert [c.field for c in conflicts] == ["delivery_location"]  # 2026-04-20 lies inside the window
+
+    values, flags = {}, set()
+    other = ADDRESSES.replace("20095 Hamburg", "80331 Munich")
+    (conflict,) = merge_attachments(values, flags, [parse_attachment(ADDRESSES), parse_attachment(other)])
+    assert conflict.source == "attachment" and values["delivery_location"].endswith("20095 Hamburg")
+    (question,) = conflict_questions([QUESTIONS[conflict.flag]], [conflict])
+    assert question.startswith("The attachments state different values for the delivery location") and "mail" not in question
+
+    values = {"requested_delivery_date": "2026-01-30"}
+    flags = set()
+    merge_attachments(values, flags, [parse_attachment(ADDRESSES)])
+    assert "attachment_date_conflict" in flags
+    assert values["delivery_location"].endswith("20095 Hamburg")
+
+
+def test_extractor_uses_attachments():
+    mail = MAIL.replace("- Requested delivery date: 2026-04-27\n", "")
+    rfq = extract_rfq(None, mail, [ADDRESSES, QUALITY])
+    assert rfq.requested_delivery_date == "2026-05-16"
+    assert rfq.certifications_required == ["ISO 9001"]
+    assert "requested_delivery_date" not in rfq.missing_fields
+
+
+def test_placeholders_and_conflicts_in_review():
+    mail = MAIL.replace("- Requested delivery date: 2026-04-27\n", "- Requested delivery date: ASAP / to be confirmed\n")
+    rfq = extract_rfq(None, mail, [ADDRESSES])
+    assert rfq.requested_delivery_date == "unknown"  # an explicit placeholder is not filled from the attachment
+    assert "requested_delivery_date" in rfq.missing_fields
+
+    rfq = extract_rfq(None, MAIL.replace("2026-04-27", "2026-01-30"), [ADDRESSES])
+    assert rfq.requested_delivery_date == "2026-01-30" and not rfq.needs_review  # the mail wins
+    assert any("(mail: 2026-01-30 / attachment: 2026-04-06 to 2026-05-16)" in q for q in rfq.clarification_questions)
+
+
+def test_reader_skips_unchanged_files(tmp_path):
+    path = tmp_path / "att.txt"
+    path.write_text(QUALITY, encoding="utf-8")
+    reader = AttachmentReader()
+    first = reader.parse_files([str(path), str(path)])
+    assert first[0] is first[1] and (reader.parsed, reader.skipped) == (1, 1)
+    path.write_text(ADDRESSES + "\n", encoding="utf-8")
+    os.utime(path, ns=(0, 1))
+    assert reader.parse_file(str(path)).kind == "addresses" and reader.parsed == 2
@@ -0,0 +1,40 @@
+import json
+from datetime import date
+
+from src.intake.batch import BatchConfig, build_work_items, run_batch
+
+def test_batch_is_deterministic_across_worker_counts(tmp_path):
+    items = build_work_items()
+    assert len(items) == 80
+    assert dict(items)["RFQ_0003"] == ["RFQ_0003_att_01.txt", "RFQ_0003_att_02.txt", "RFQ_0003_att_03.txt"]
+
+    serial = list(run_batch(items, BatchConfig(out_dir=str(tmp_path / "a")), workers=1, chunk_size=7))
+    pooled = list(run_batch(items, BatchConfig(out_dir=str(tmp_path / "b")), workers=2, chunk_size=7))
+    assert [r._replace(log=None) for r in serial] == [r._replace(log=None) for r in pooled]
+    assert [r.rfq_id for r in serial] == [rfq_id for rfq_id, _ in items]
+    assert all(r.ok for r in serial)
+
+    a = json.loads((tmp_path / "a" / "RFQ_0003.json").read_text(encoding="utf-8"))
+    b = json.loads((tmp_path / "b" / "RFQ_0003.json").read_text(encoding="utf-8"))
+    assert a == b and a["request_id"] == "RFQ_0003"
+
+def test_batch_reports_missing_file(tmp_path):
+    results = list(run_batch([("RFQ_9999", [])], BatchConfig(out_dir=str(tmp_path))))
+    assert results[0].ok is False and "FileNotFoundError" in results[0].error
+
+def test_batch_as_of_flags_past_dates(tmp_path):
+    item = [i for i in build_work_items() if i[0] == "RFQ_0001"]
+    (plain,) = run_batch(item, BatchConfig(out_dir=str(tmp_path), per_file=False))
+    (late,) = run_batch(item, BatchConfig(out_dir=str(tmp_path), per_file=False, as_of=date(2100, 1, 1)))
+    assert not plain.needs_review
+    assert late.needs_review and {"requested_delivery_date", "response_due_date"} <= set(late.record["missing_fields"])
+
+def test_batch_cache_serves_unchanged_rfqs(tmp_path):
+    items = build_work_items()[:12]
+    config = BatchConfig(out_dir=str(tmp_path), per_file=False, cache_path=str(tmp_path / "cache.sqlite"))
+    first = list(run_batch(items, config))
+    again = list(run_batch(items, config, workers=2, chunk_size=4))
+    assert not any(r.cached for r in first) and all(r.cached for r in again)
+    assert [r.record for r in again] == [r.record for r in first]
+    (late,) = run_batch(items[:1], BatchConfig(out_dir=str(tmp_path), per_file=False, as_of=date(2100, 1, 1), cache_path=config.cache_path))
+    assert not late.cached and late.needs_review  # as_of is part of the key
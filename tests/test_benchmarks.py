@@ -0,0 +1,28 @@
+from benchmarks.run import compare, run_scale
+from benchmarks.synthetic import count_packed, iter_packed, iter_synthetic_rfqs, write_packed
+
+def test_synthetic_corpus_is_deterministic_and_mixed():
+    a = list(iter_synthetic_rfqs(200, seed=7))
+    b = list(iter_synthetic_rfqs(200, seed=7))
+    assert a == b
+    categories = {r["category"] for r in a}
+    assert categories == {"clean", "incomplete", "contradictory"}
+    assert any(r["attachment_texts"] for r in a)
+
+def test_run_scale_from_packed_file(tmp_path):
+    packed = str(tmp_path / "corpus.jsonl")
+    write_packed(packed, 150)
+    assert sum(1 for _ in iter_packed(packed)) == count_packed(packed) == 150
+    row = run_scale(150, packed=packed, block_size=40, export_path=str(tmp_path / "out.jsonl"))
+    assert row["n"] == 150 and row["invalid"] == 0
+    assert row["extract_rfq_per_s"] > 0 and row["peak_rss_mb"] > 0
+    assert sum(1 for _ in open(tmp_path / "out.jsonl", encoding="utf-8")) == 150
+    short = run_scale(500, packed=packed, block_size=40)
+    assert (short["n"], short["processed"]) == (500, 150)
+    assert short["pipeline_rfq_per_s"] == 150 / short["pipeline_s"]
+
+def test_compare_flags_regressions():
+    old = {"scales": [{"n": 10, "extract_rfq_per_s": 100.0, "validate_rfq_per_s": 100.0}]}
+    new = {"scales": [{"n": 10, "extract_rfq_per_s": 80.0, "validate_rfq_per_s": 95.0,
+                       "export_rfq_per_s": 1.0, "pipeline_rfq_per_s": 1.0}]}
+    assert compare(new, old) == ["n=10 extract: 80/s vs 100/s (-20.0%)"]
@@ -0,0 +1,50 @@
+import sys
+
+from benchmarks.synthetic import iter_synthetic_rfqs
+from src.extraction.rules import extract_rfq
+from src.models.compact import RFQBatch
+from src.models.rfq import RFQ
+
+
+def _rfq(**kw):
+    base = dict(request_id="RFQ_1", product_or_service="Gearbox", specification="i=10", needs_review=False)
+    return RFQ.model_validate({**base, **kw})
+
+
+def _deep_size(obj, seen):
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_size(v, seen) for v in obj)
+    elif isinstance(obj, RFQ):
+        size += _deep_size(obj.__dict__, seen) + _deep_size(obj.__pydantic_fields_set__, seen)
+    return size
+
+
+def test_round_trip_is_lossless():
+    rfqs = [
+        _rfq(),
+        _rfq(request_id="RFQ_2", customer_name="Kappa", contact_email="a@b.de", quantity=0.0, quantity_unit="pcs",
+             requested_delivery_date="2026-03-15", response_due_date="20260301", incoterms="DAP",
+             needs_review=True, missing_fields=["incoterms"], clarification_questions=["Which?"], tasks=["x", "y", "z"]),
+        _rfq(request_id="RFQ_3", specification="Edelstahl, Ø 12 mm – öl-frei", delivery_location=""),
+    ]
+    batch = RFQBatch.from_rfqs(rfqs)
+    assert len(batch) == 3
+    assert list(batch) == rfqs
+    assert batch[-1] == rfqs[-1]
+    assert batch.to_rfq(1, validate=True) == rfqs[1]
+    assert batch.record(1)["response_due_date"] == "20260301"
+
+
+def test_memory_reduction_at_least_5x():
+    rfqs = [extract_rfq(r["request_id"], r["mail_text"]) for r in iter_synthetic_rfqs(2000, 7)]
+    seen = set()
+    full = sum(_deep_size(r, seen) for r in rfqs)
+    batch = RFQBatch.from_rfqs(rfqs)
+    assert full / batch.nbytes() >= 5
+    assert batch[1234] == rfqs[1234]
@@ -0,0 +1,47 @@
+import os
+import shutil
+
+from src.intake.index import CorpusIndex
+
+def test_lookup_matches_csv():
+    index = CorpusIndex.build()
+    assert len(index) == 80
+    entry = index.lookup("RFQ_0051")
+    assert entry.category == "incomplete"
+    assert entry.dirty_flags == "quantity"
+    assert entry.customer == "EuroFab Industries"
+    assert entry.expected_needs_review is True
+    assert index.attachments("RFQ_0003") == ["RFQ_0003_att_01.txt", "RFQ_0003_att_02.txt", "RFQ_0003_att_03.txt"]
+    assert index.attachments("RFQ_0013") == []
+    texts = list(index.attachment_texts("RFQ_0003"))
+    assert texts[0].startswith("Attachment: Delivery / Billing Information (RFQ_0003)")
+    assert len(index.tables["category"]) == 3
+
+def test_sidecar_roundtrip_and_invalidation(tmp_path):
+    rfq_index = tmp_path / "rfq_index.csv"
+    shutil.copy("data_samples/rfq_index.csv", rfq_index)
+    sidecar = str(tmp_path / "index.bin")
+
+    built = CorpusIndex.open(str(rfq_index), sidecar=sidecar)
+    loaded = CorpusIndex.open(str(rfq_index), sidecar=sidecar)
+    assert os.path.exists(sidecar)
+    assert list(loaded) == list(built)
+
+    with open(rfq_index, "a", encoding="utf-8") as f:
+        f.write("RFQ_0999,clean,,New GmbH,Gearbox,False,False\n")
+    rebuilt = CorpusIndex.open(str(rfq_index), sidecar=sidecar)
+    assert rebuilt.lookup("RFQ_0999").customer == "New GmbH"
+
+def test_more_than_65536_distinct_values(tmp_path):
+    rfq_index = tmp_path / "rfq_index.csv"
+    with open(rfq_index, "w", encoding="utf-8") as f:
+        f.write("rfq_id,category,dirty_flags,customer,product,has_attachments,expected_needs_review\n")
+        for i in range(70_000):
+            f.write(f"RFQ_{i:05d},clean,,Customer {i},Gearbox,False,False\n")
+    sidecar = str(tmp_path / "index.bin")
+
+    built = CorpusIndex.open(str(rfq_index), str(tmp_path / "none.csv"), sidecar=sidecar)
+    loaded = CorpusIndex.open(str(rfq_index), str(tmp_path / "none.csv"), sidecar=sidecar)
+    assert built.codes["customer"].itemsize == 4 and built.codes["category"].itemsize == 2
+    assert loaded.lookup("RFQ_69999").customer == "Customer 69999"
+    assert loaded.codes["customer"].typecode == built.codes["customer"].typecode
@@ -0,0 +1,48 @@
+import io
+import json
+
+from src.intake.dedup import DedupIndex
+from src.intake.stream import run_stream
+
+MAIL = open("data_samples/raw/RFQ_0003.txt", encoding="utf-8").read()
+OTHER = open("data_samples/raw/RFQ_0013.txt", encoding="utf-8").read()
+
+
+def test_resend_links_to_original_within_window(tmp_path):
+    path = str(tmp_path / "dedup.sqlite")
+    with DedupIndex(path, window_s=3600) as index:
+        assert index.check("A", MAIL, received=1000.0) is None
+        assert index.check("B", OTHER, received=1001.0) is None
+        forwarded = "Fwd:\n" + "\n".join("> " + line for line in MAIL.splitlines())
+        match = index.check("C", forwarded, received=1002.0)
+        assert match is not None and match.original_id == "A" and match.similarity >= 0.8
+        # a duplicate of a duplicate links to the first RFQ of the group
+        assert index.check("D", MAIL, received=1003.0).original_id == "A"
+        # outside the window the original is no longer a candidate
+        assert index.check("E", OTHER, received=1001.0 + 7200) is None
+
+    with DedupIndex(path, window_s=3600) as index:  # persisted
+        assert len(index) == 5
+        assert index.prune(now=1001.0 + 7200) == 4
+        assert len(index) == 1
+
+
+def test_stream_skips_extraction_of_duplicates():
+    lines = [
+        json.dumps({"request_id": "RFQ_A", "mail_text": MAIL}),
+        json.dumps({"request_id": "RFQ_B", "mail_text": OTHER}),
+        json.dumps({"request_id": "RFQ_C", "mail_text": MAIL}),
+        "not json",
+    ]
+    text = "\n".join(lines) + "\n"
+    outputs = []
+    for workers in (1, 2):
+        out = io.StringIO()
+        with DedupIndex(":memory:") as index:
+            assert run_stream(io.StringIO(text), out, workers=workers, batch_size=2, dedup=index) == 4
+        outputs.append(out.getvalue())
+    assert outputs[0] == outputs[1]
+    results = [json.loads(line) for line in outputs[0].splitlines()]
+    assert "rfq" in results[0] and "rfq" in results[1]
+    assert results[2] == {"request_id": "RFQ_C", "valid": True, "duplicate_of": "RFQ_A", "similarity": 1.0}
+    assert results[3]["valid"] is False
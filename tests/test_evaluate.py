@@ -0,0 +1,36 @@
+from src.evaluation.evaluate import EvalCase, EvalRecord, check_targets, compute_kpis, load_cases, run_evaluation
+
+def test_golden_set_with_rule_extractor():
+    cases = load_cases("golden")
+    assert len(cases) == 10
+    serial, _ = run_evaluation(cases, workers=1)
+    pooled, wall_s = run_evaluation(cases, workers=2, chunk_size=3)
+    assert [r.rfq_id for r in pooled] == [c.rfq_id for c in cases]
+    assert [r.needs_review for r in pooled] == [r.needs_review for r in serial]
+    kpis = compute_kpis(cases, pooled, wall_s)
+    assert kpis["M1_valid_json_rate"] == 1.0
+    assert kpis["review_accuracy"] == 1.0
+    assert kpis["dirty_flag_coverage"] == 1.0
+    assert all(check_targets(kpis).values())
+
+def test_kpi_definitions():
+    cases = [
+        EvalCase("A", False),
+        EvalCase("B", True, "quantity"),
+        EvalCase("C", True, "due_date"),
+        EvalCase("D", False),
+    ]
+    records = [
+        EvalRecord("A", True, 0.1, False, [], True),
+        EvalRecord("B", True, 0.2, True, ["quantity"], True),
+        EvalRecord("C", True, 0.3, False, [], True),
+        EvalRecord("D", False, 0.4, error="ValueError"),
+    ]
+    kpis = compute_kpis(cases, records, wall_s=1.0)
+    assert kpis["M1_valid_json_rate"] == 0.75
+    assert kpis["M2_review_precision"] == 1.0
+    assert kpis["M3_auto_approve_rate"] == 0.5
+    assert kpis["review_recall"] == 0.5
+    assert kpis["dirty_flag_coverage"] == 0.5
+    assert kpis["latency_p50_s"] == 0.2
+    assert kpis["throughput_rfq_per_s"] == 4.0
@@ -0,0 +1,68 @@
+import csv
+import json
+import os
+
+import pytest
+
+from src.export.writers import COLUMNS, BatchWriter, open_writer
+from src.intake.batch import BatchConfig, build_work_items, run_batch
+
+def exported_records(tmp_path):
+    config = BatchConfig(out_dir=str(tmp_path), per_file=False)
+    return [r.record for r in run_batch(build_work_items(), config)]
+
+def test_jsonl_rotation_is_atomic(tmp_path):
+    records = exported_records(tmp_path)
+    out = tmp_path / "out"
+    with open_writer("jsonl", str(out), batch_size=10, max_bytes=20_000) as writer:
+        writer.write_many(records)
+    assert len(writer.paths) > 1
+    assert not [p for p in os.listdir(out) if p.endswith(".tmp")]
+    lines = [json.loads(line) for p in writer.paths for line in open(p, encoding="utf-8")]
+    assert lines == records
+
+def test_csv_has_stable_columns_and_joined_lists(tmp_path):
+    records = exported_records(tmp_path)
+    with open_writer("csv", str(tmp_path / "out"), batch_size=7) as writer:
+        writer.write_many(records)
+    with open(writer.paths[0], encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == COLUMNS
+    assert len(rows) == 80
+    review = next(r for r, rec in zip(rows, records) if rec["missing_fields"])
+    assert review["missing_fields"].split(";") == next(rec for rec in records if rec["missing_fields"])["missing_fields"]
+
+def test_csv_round_trip_keeps_list_items(tmp_path):
+    from src.review.store import read_export
+
+    records = exported_records(tmp_path)
+    with open_writer("csv", str(tmp_path / "out")) as writer:
+        writer.write_many(records)
+    back = {r["request_id"]: r for r in read_export(writer.paths[0])}
+    conflict = next(rec for rec in records if any("(mail: " in q for q in rec["clarification_questions"]))
+    assert back[conflict["request_id"]]["clarification_questions"] == conflict["clarification_questions"]
+    for rec in records:
+        for c in ("missing_fields", "clarification_questions", "tasks", "certifications_required"):
+            assert back[rec["request_id"]][c] == rec[c]
+
+def test_parquet_list_columns(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    records = exported_records(tmp_path)
+    with open_writer("parquet", str(tmp_path / "out"), batch_size=25) as writer:
+        writer.write_many(records)
+    table = pq.read_table(writer.paths[0])
+    assert table.num_rows == 80
+    assert pa.types.is_list(table.schema.field("tasks").type)
+    assert table.column("missing_fields").to_pylist() == [r["missing_fields"] for r in records]
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_writer("xml", str(tmp_path))
+
+def test_writer_without_batch_hook_fails_at_construction(tmp_path):
+    class XMLWriter(BatchWriter):
+        extension = ".xml"
+
+    with pytest.raises(TypeError):
+        XMLWriter(str(tmp_path))
@@ -0,0 +1,86 @@
+import asyncio
+
+from src.extraction.cache import CachedExtractor, ExtractionCache, cache_key, normalize_text
+from src.extraction.rules import RuleExtractor
+
+MAIL = open("data_samples/raw/RFQ_0003.txt", encoding="utf-8").read()
+
+class CountingExtractor(RuleExtractor):
+    def __init__(self):
+        self.calls = 0
+
+    def extract(self, request_id, mail_text, attachment_texts=()):
+        self.calls += 1
+        return super().extract(request_id, mail_text, attachment_texts)
+
+    async def extract_many(self, requests):
+        from src.extraction.llm import ExtractionResult
+        return [ExtractionResult(rid, rfq=self.extract(rid, mail, atts)) for rid, mail, atts in requests]
+
+def test_key_ignores_formatting_and_attachment_order():
+    forwarded = "\r\n".join("> " + line + "  " for line in MAIL.splitlines())
+    assert normalize_text(forwarded) == normalize_text(MAIL)
+    assert cache_key(MAIL, ["a", "b"], "v1") == cache_key(forwarded, ["b", "a"], "v1")
+    assert cache_key(MAIL, ["a"], "v1") != cache_key(MAIL, ["a"], "v2")
+
+def test_resend_is_a_hit_with_new_request_id(tmp_path):
+    inner = CountingExtractor()
+    cached = CachedExtractor(inner, ExtractionCache(str(tmp_path / "c.sqlite")))
+    first = cached.extract("RFQ_0003", MAIL)
+    again = cached.extract("RFQ_0100", MAIL.replace("\n", "\r\n"))
+    assert inner.calls == 1
+    assert again.request_id == "RFQ_0100"
+    assert again.model_dump(exclude={"request_id"}) == first.model_dump(exclude={"request_id"})
+    assert cached.cache.stats()["hits"] == 1
+
+    # persisted across instances
+    reopened = CachedExtractor(inner, ExtractionCache(str(tmp_path / "c.sqlite")))
+    reopened.extract("RFQ_0101", MAIL)
+    assert inner.calls == 1
+
+def test_lru_eviction():
+    cache = ExtractionCache(":memory:", max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert len(cache) == 2 and cache.evictions == 1
+    assert cache.get("b") is None and cache.get("a") == "1"
+
+def test_schema_change_clears_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "c.sqlite")
+    cache = ExtractionCache(path)
+    cache.put("a", "1")
+    cache.close()
+    monkeypatch.setattr("src.extraction.cache.schema_fingerprint", lambda model=None: "other")
+    assert len(ExtractionCache(path)) == 0
+
+def test_extract_many_deduplicates_misses():
+    inner = CountingExtractor()
+    cached = CachedExtractor(inner, ExtractionCache(":memory:"))
+    requests = [("RFQ_0003", MAIL, []), ("RFQ_0200", MAIL, []), ("RFQ_0201", MAIL, [])]
+    results = asyncio.run(cached.extract_many(requests))
+    assert inner.calls == 1
+    assert [r.rfq.request_id for r in results] == ["RFQ_0003", "RFQ_0200", "RFQ_0201"]
+
+def test_bounds_hold_across_connections(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    first, second = ExtractionCache(path, max_entries=3), ExtractionCache(path, max_entries=3)
+    for i in range(4):
+        first.put(f"a{i}", "x")
+        second.put(f"b{i}", "y")
+    assert len(first) == len(second) == 3
+    assert first.stats()["entries"] == 3 and first.evictions + second.evictions == 5
+
+def test_locked_database_is_a_miss(tmp_path):
+    path = str(tmp_path / "c.sqlite")
+    cache = ExtractionCache(path, timeout=0.01)
+    cache.put("a", "1")
+    assert cache.get("a") == "1"
+    writer = ExtractionCache(path)
+    writer.db.execute("BEGIN IMMEDIATE")  # another process holds the write lock
+    cache.put("b", "2")  # skipped, not raised
+    writer.db.execute("ROLLBACK")
+    assert cache.get("b") is None
+    cache.close()
+    assert cache.get("a") is None and cache.stats()["entries"] == 1
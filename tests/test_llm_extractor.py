@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+from src.extraction.llm import LLMExtractor
+from src.extraction.stub_server import StubLLMServer
+from src.intake.batch import build_work_items
+from src.intake.corpus import load_rfq_texts
+
+def load_requests():
+    return [(rid, *load_rfq_texts(rid, files)) for rid, files in build_work_items()]
+
+def run_with_stub(requests, server, **kwargs):
+    async def go():
+        port = await server.start()
+        try:
+            async with LLMExtractor(f"http://127.0.0.1:{port}", **kwargs) as ex:
+                return await ex.extract_many(requests)
+        finally:
+            await server.stop()
+    return asyncio.run(go())
+
+def test_extract_many_runs_concurrently():
+    requests = load_requests()
+    server = StubLLMServer(latency=0.1)
+    start = time.perf_counter()
+    results = run_with_stub(requests, server, concurrency=20, batch_size=2)
+    elapsed = time.perf_counter() - start
+    assert [r.request_id for r in results] == [r[0] for r in requests]
+    assert all(r.ok for r in results)
+    assert server.requests_served == 40
+    assert elapsed < 1.5  # 40 sequential requests would take 4s
+
+def test_retries_and_canned_responses():
+    requests = load_requests()[:10]
+    canned = run_with_stub(requests[:1], StubLLMServer(latency=0))[0].rfq.model_dump(mode="json")
+    canned["customer_name"] = "Canned GmbH"
+    server = StubLLMServer({requests[0][0]: canned}, latency=0, failure_rate=0.5, seed=1)
+    results = run_with_stub(requests, server, batch_size=1, retries=10, backoff=0.001)
+    assert all(r.ok for r in results)
+    assert server.requests_served > 10
+    assert results[0].rfq.customer_name == "Canned GmbH"
+
+def test_timeout_is_reported_per_request():
+    requests = load_requests()[:3]
+    results = run_with_stub(requests, StubLLMServer(latency=1.0), timeout=0.05, retries=0)
+    assert [r.ok for r in results] == [False, False, False]
+    assert "TimeoutError" in results[0].error
+
+def test_malformed_bodies_become_per_request_errors():
+    ex = LLMExtractor("http://127.0.0.1:1")
+    batch = [("RFQ_0001", "x", []), ("RFQ_0002", "x", [])]
+    for body in (b'[1]', b'{"results": null}'):
+        with pytest.raises(ValueError):  # extract_batch turns it into one error per request
+            ex.parse_response(batch, body)
+    for body in (b'{"results": [1]}', b'{"results": [{"request_id": "RFQ_0001", "rfq": 5}]}'):
+        assert [r.ok for r in ex.parse_response(batch, body)] == [False, False]
+
+    async def go():
+        async def post(payload):
+            return b'{"results": [1]}'
+        ex._post = post
+        return await ex.extract_many(batch)
+    assert [r.error for r in asyncio.run(go())] == ["No result returned."] * 2
+
+    server = StubLLMServer(latency=0)
+    assert server.answer(1)["error"] and server.answer({"request_id": "RFQ_1", "mail_text": 5})["error"].startswith("TypeError")
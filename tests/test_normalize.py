@@ -0,0 +1,41 @@
+from datetime import date
+
+from src.extraction.normalize import normalize_fields, parse_date, parse_quantity, rfq_date
+from src.extraction.rules import extract_rfq
+
+TODAY = date(2026, 1, 10)
+
+
+def test_date_formats():
+    for text in ("2026-03-15", "15.03.2026", "15.03.26", "15/03/2026", "15. März 2026", "March 15, 2026", "15.03."):
+        assert rfq_date(text, TODAY) == "2026-03-15", text
+    assert parse_date("KW 12", TODAY)[1:] == (date(2026, 3, 16), date(2026, 3, 22))
+    assert parse_date("Mitte März", TODAY)[1:] == (date(2026, 3, 11), date(2026, 3, 20))
+    assert parse_date("end of February 2027", TODAY).end == date(2027, 2, 28)
+    assert parse_date("KW 1", TODAY).start == date(2027, 1, 4)  # week already past -> next year
+    assert rfq_date("ASAP / to be confirmed", TODAY) == "unknown"
+    assert rfq_date("(no deadline mentioned)", TODAY) == "unknown"
+
+
+def test_delivery_window_and_alternatives():
+    window = parse_date("2026-04-06 to 2026-05-16", TODAY)
+    assert window.kind == "window" and window.iso == "2026-05-16"
+    assert parse_date("15.03.2026 bis 30.04.2026", TODAY).start == date(2026, 3, 15)
+    assert parse_date("2026-03-15 (alternatively 2026-04-01)", TODAY).kind == "date"
+
+
+def test_quantities():
+    assert parse_quantity("1.000 pcs") == (1000.0, "pcs")
+    assert parse_quantity("1,000 units") == (1000.0, "units")
+    assert parse_quantity("1'000 Stück") == (1000.0, "pcs")
+    assert parse_quantity("1.000,5 kg") == (1000.5, "kg")
+    assert parse_quantity("500") == (500.0, None)
+
+
+def test_normalized_values_feed_rfq():
+    assert normalize_fields({"quantity": "1.000 Stk.", "requested_delivery_date": "KW 12"}, TODAY) == {
+        "quantity": 1000.0, "quantity_unit": "pcs", "requested_delivery_date": "2026-03-22",
+    }
+    mail = open("data_samples/raw/RFQ_0003.txt", encoding="utf-8").read()
+    mail = mail.replace("Requested delivery date: 2026-04-27", "Requested delivery date: 27.04.2026")
+    assert extract_rfq(None, mail).requested_delivery_date == "2026-04-27"
@@ -0,0 +1,56 @@
+from datetime import date
+
+from src.review.rules import OUTCOMES, apply_review, evaluate_batch, review_fields
+
+COMPLETE = {
+    "product_or_service": "Gearbox",
+    "specification": "i=10",
+    "quantity": 5.0,
+    "requested_delivery_date": "2026-04-27",
+    "incoterms": "DAP",
+    "response_due_date": "2026-01-14",
+}
+
+
+def test_lookup_table_tasks():
+    assert all(len(o.tasks) == min(7, 2 + max(1, len(o.missing_fields))) for o in OUTCOMES)
+    assert review_fields({})["tasks"][-1] == "Clarify remaining open points with customer"
+    assert OUTCOMES[0].tasks[-1] == "Send quotation to customer" and not OUTCOMES[0].needs_review
+
+
+def test_batch_matches_single_record():
+    rows = [
+        COMPLETE,
+        {**COMPLETE, "quantity": None, "incoterms": "unknown"},
+        {**COMPLETE, "requested_delivery_date": "unknown"},
+        {},
+    ]
+    flags = [set(), set(), {"two_dates"}, {"two_quantities"}]
+    columns = {f: [r.get(f) for r in rows] for f in COMPLETE}
+    batch = evaluate_batch(columns, flags)
+    for i, (row, f) in enumerate(zip(rows, flags)):
+        single = review_fields(row, f)
+        assert batch.needs_review[i] == single["needs_review"]
+        assert list(batch.missing_fields[i]) == single["missing_fields"]
+        assert list(batch.tasks[i]) == single["tasks"]
+    assert batch.missing_fields[1] == ("quantity", "incoterms")
+    # a missing value wins over the contradiction question
+    assert batch.clarification_questions[2] == ("What is the requested delivery date?",)
+
+
+def test_contradiction_marks_present_field_uncertain():
+    out = review_fields(COMPLETE, {"two_quantities"})
+    assert out["needs_review"] and out["missing_fields"] == ["quantity"]
+    assert "both quantities" in out["clarification_questions"][0]
+
+
+def test_past_dates_only_with_as_of():
+    assert not review_fields(COMPLETE, ())["needs_review"]
+    out = review_fields(COMPLETE, (), as_of=date(2026, 2, 1))
+    assert out["missing_fields"] == ["response_due_date"]
+
+
+def test_apply_review_fills_records():
+    records = apply_review([dict(COMPLETE), {"request_id": "RFQ_1"}])
+    assert records[0]["tasks"][-1] == "Send quotation to customer"
+    assert records[1]["missing_fields"] == list(COMPLETE)
@@ -0,0 +1,109 @@
+import json
+import os
+
+from src.export.writers import CSVWriter, JSONLWriter
+from src.models.rfq import RFQ
+from src.review.store import ReviewStore
+
+
+def make_rfq(i, **overrides):
+    missing = ["quantity"] if i % 3 == 0 else []
+    fields = dict(
+        request_id=f"RFQ_{i:04d}",
+        customer_name=f"Customer {i % 4}",
+        product_or_service="Stainless flange" if i % 2 else "Hydraulic cylinder",
+        specification=f"DN{i} PN16",
+        quantity=None if missing else 100.0,
+        response_due_date="unknown" if i % 5 == 0 else f"2026-04-{1 + i % 28:02d}",
+        needs_review=bool(missing),
+        missing_fields=missing,
+    )
+    fields.update(overrides)
+    return RFQ(**fields)
+
+
+def write_exports(out_dir):
+    with JSONLWriter(str(out_dir)) as w:
+        w.write_many(make_rfq(i) for i in range(1, 41))
+    with CSVWriter(str(out_dir)) as w:
+        w.write_many(make_rfq(i) for i in range(41, 61))
+    with open(out_dir / "RFQ_0061.json", "w", encoding="utf-8") as f:
+        f.write(make_rfq(61).model_dump_json(indent=2))
+    with open(out_dir / "results.jsonl", "w", encoding="utf-8") as f:  # stream output incl. a failed line
+        f.write(json.dumps({"request_id": "RFQ_0062", "valid": True, "rfq": make_rfq(62).model_dump(mode="json")}) + "\n")
+        f.write(json.dumps({"request_id": "RFQ_0063", "valid": False, "error": "ValueError"}) + "\n")
+    with open(out_dir / "run_log.jsonl", "w", encoding="utf-8") as f:  # not an export
+        f.write(json.dumps({"rfq_id": "RFQ_0001", "ok": True, "stages": {}}) + "\n")
+
+
+def test_sync_and_filters(tmp_path):
+    out = tmp_path / "export"
+    write_exports(out)
+    with ReviewStore(str(tmp_path / "review.sqlite")) as store:
+        stats = store.sync(str(out))
+        assert stats.files_read == 5 and stats.records == 62
+        assert len(store) == 62
+
+        queue = store.query(needs_review=True, page_size=5)
+        assert queue.total == 20 and queue.pages == 4
+        assert all(r["needs_review"] for r in queue.items)
+        due = [r["response_due_date"] for r in store.query(needs_review=True, page_size=100).items]
+        assert due == sorted(due) and due[-1] == "unknown"  # unknown due dates last
+
+        pages = [store.query(order="request_id", page=p, page_size=25).items for p in (1, 2, 3)]
+        ids = [r["request_id"] for page in pages for r in page]
+        assert ids == sorted(ids) and len(set(ids)) == 62
+
+        assert store.query(customer="Customer 1").total == 16
+        missing = store.query(needs_review=True, missing_field="quantity", due_before="2026-04-10")
+        assert missing.total > 0 and all(r["response_due_date"] < "2026-04-10" for r in missing.items)
+        assert store.query(missing_field="quantity", customer="Customer 0").total == 5
+        assert store.query(text="stainless").total == 31
+        assert store.query(text="hydr dn42").items[0]["request_id"] == "RFQ_0042"  # prefix match, CSV record
+        assert store.get("RFQ_0042")["missing_fields"] == ["quantity"]
+        assert store.get("RFQ_0043")["quantity"] == 100.0
+        assert dict(store.facets("product_or_service")) == {"Stainless flange": 31, "Hydraulic cylinder": 31}
+
+
+def test_incremental_sync(tmp_path):
+    out = tmp_path / "export"
+    write_exports(out)
+    path = str(tmp_path / "review.sqlite")
+    with ReviewStore(path) as store:
+        store.sync(str(out))
+
+    with ReviewStore(path) as store:  # persisted; unchanged files are not read again
+        assert store.sync(str(out)).files_read == 0
+
+        with open(out / "RFQ_0061.json", "w", encoding="utf-8") as f:
+            f.write(make_rfq(61, product_or_service="Gear pump", needs_review=True, missing_fields=["incoterms"]).model_dump_json())
+        with JSONLWriter(str(out)) as w:  # a new part lands
+            w.write(make_rfq(100))
+        stats = store.sync(str(out))
+        assert (stats.files_read, stats.records) == (2, 2)
+        assert store.query(text="gear").total == 1 and store.query(text="dn61 stainless").total == 0
+        assert store.query(missing_field="incoterms").items[0]["request_id"] == "RFQ_0061"
+
+        os.remove(out / "rfqs-00001.jsonl")
+        assert store.sync(str(out)).files_removed == 1
+        assert len(store) == 23 and store.get("RFQ_0001") is None
+        assert store.query(text="stainless").total == 10
+
+
+def test_duplicate_ids_and_partial_files(tmp_path):
+    out = tmp_path / "export"
+    out.mkdir()
+    with open(out / "results.jsonl", "w", encoding="utf-8") as f:  # the same RFQ twice in one file
+        f.write(make_rfq(1).model_dump_json() + "\n")
+        f.write(make_rfq(1, product_or_service="Gear pump").model_dump_json() + "\n")
+    (out / "RFQ_0002.json").write_text(make_rfq(2).model_dump_json()[:40], encoding="utf-8")  # still being written
+    with ReviewStore(str(tmp_path / "review.sqlite")) as store:
+        stats = store.sync(str(out))
+        assert (stats.files_read, stats.files_invalid, stats.records) == (1, 1, 1)
+        assert store.get("RFQ_0001")["product_or_service"] == "Gear pump"  # the last one wins
+        assert store.query(text="gear").total == 1 and store.query(text="hydraulic").total == 0
+        store.db.execute("INSERT INTO rfq_fts(rfq_fts) VALUES ('integrity-check')")
+
+        (out / "RFQ_0002.json").write_text(make_rfq(2).model_dump_json(), encoding="utf-8")
+        stats = store.sync(str(out))
+        assert (stats.files_read, stats.files_invalid) == (1, 0) and store.get("RFQ_0002") is not None
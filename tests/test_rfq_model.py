@@ -14,3 +14,37 @@ def test_valid_rfq():
     }
     rfq = RFQ.model_validate(data)
     assert rfq.request_id == "RFQ_0001"
+
+def test_validate_many_reports_errors_per_record():
+    good = {
+        "request_id": "RFQ_0001",
+        "product_or_service": "Pneumatic valve",
+        "specification": "Test spec",
+        "needs_review": False,
+    }
+    bad_date = {**good, "request_id": "RFQ_0002", "requested_delivery_date": "15.03.2026"}
+    bad_unit = {**good, "request_id": "RFQ_0003", "quantity_unit": "pcs"}
+    result = RFQ.validate_many([good, bad_date, good, bad_unit])
+    assert [r.request_id if r else None for r in result.records] == ["RFQ_0001", None, "RFQ_0001", None]
+    assert sorted(result.errors) == [1, 3]
+    assert result.errors[1][0]["loc"] == ("requested_delivery_date",)
+    assert len(result.valid) == 2
+
+def test_validate_many_from_json():
+    doc = RFQ.model_validate({
+        "request_id": "RFQ_0001",
+        "product_or_service": "Pneumatic valve",
+        "specification": "Test spec",
+        "needs_review": True,
+    }).model_dump_json()
+    result = RFQ.validate_many([doc, doc.encode()], from_json=True)
+    assert result.errors == {} and len(result.valid) == 2
+
+    result = RFQ.validate_many([doc, "{not json", doc], from_json=True)
+    assert list(result.errors) == [1]
+    assert result.errors[1][0]["type"] == "json_invalid"
+    assert result.records[2].request_id == "RFQ_0001"
+    bad = doc.replace('"RFQ_0001"', '"RFQ_0002"').replace('"needs_review":true', '"needs_review":"maybe"')
+    result = RFQ.validate_many([doc, doc + "," + bad, doc], from_json=True)  # two JSON values in one document
+    assert len(result.records) == 3 and list(result.errors) == [1]
+    assert [r.request_id for r in result.valid] == ["RFQ_0001", "RFQ_0001"]
@@ -0,0 +1,91 @@
+import glob
+import hashlib
+import os
+from datetime import date
+
+from src.extraction import normalize
+from src.extraction.rules import EXTRACTOR_VERSION, extract_rfq, parse_mail, parse_quantity
+
+CLEAN = """Subject: RFQ RFQ_0003 – Sheet metal part
+
+Hello Sales Team,
+
+we would like to request a quotation for the following item:
+
+- Product/Service: Sheet metal part
+- Specification: Laser cut + bend, powder-coated, per drawing; please include datasheet and lead time.
+- Quantity: 100 units
+- Requested delivery date: 2026-04-27
+- Delivery location: Berlin, DE
+- Incoterms: DAP
+- Response due date: 2026-01-14
+
+Please confirm availability and provide pricing incl. delivery.
+
+Best regards
+Procurement
+Rheinmetall Components (Demo)
+"""
+
+def test_clean_mail():
+    rfq = extract_rfq(None, CLEAN)
+    assert rfq.request_id == "RFQ_0003"
+    assert rfq.customer_name == "Rheinmetall Components (Demo)"
+    assert rfq.product_or_service == "Sheet metal part"
+    assert rfq.quantity == 100 and rfq.quantity_unit == "units"
+    assert rfq.requested_delivery_date == "2026-04-27"
+    assert rfq.delivery_location == "Berlin, DE"
+    assert rfq.incoterms == "DAP"
+    assert rfq.response_due_date == "2026-01-14"
+    assert rfq.needs_review is False
+    assert rfq.missing_fields == []
+    assert 3 <= len(rfq.tasks) <= 7
+
+def test_placeholders_are_missing():
+    text = CLEAN.replace("100 units", "(not specified yet)") \
+        .replace("2026-04-27", "ASAP / to be confirmed") \
+        .replace("Incoterms: DAP", "Incoterms: (not specified)")
+    rfq = extract_rfq("RFQ_0003", text)
+    assert rfq.quantity is None and rfq.quantity_unit is None
+    assert rfq.requested_delivery_date == "unknown"
+    assert rfq.incoterms is None
+    assert rfq.needs_review is True
+    assert rfq.missing_fields == ["quantity", "requested_delivery_date", "incoterms"]
+    assert len(rfq.clarification_questions) == 3
+    assert 3 <= len(rfq.tasks) <= 7
+
+def test_contradictions():
+    text = CLEAN.replace("100 units", "500 pcs (please also provide pricing for 750 pcs)") \
+        .replace("2026-04-27", "2026-02-28 (alternatively 2026-04-25 depending on availability)")
+    parsed = parse_mail(text)
+    assert parsed.flags == {"two_quantities", "two_dates"}
+    rfq = extract_rfq("RFQ_0003", text)
+    assert rfq.quantity == 500
+    assert rfq.requested_delivery_date == "2026-02-28"
+    assert rfq.missing_fields == ["quantity", "requested_delivery_date"]
+
+def test_parse_quantity_thousands():
+    assert parse_quantity("1.000 pcs") == (1000.0, "pcs")
+    assert parse_quantity("2,5 kg") == (2.5, "kg")
+    assert parse_quantity("none") == (None, None)
+
+
+class _FixedDate(date):
+    @classmethod
+    def today(cls):
+        return cls(2026, 1, 1)
+
+
+def test_output_fingerprint_pins_extractor_version(monkeypatch):
+    # EXTRACTOR_VERSION is part of the extraction cache key: when this digest changes, bump the version too.
+    monkeypatch.setattr(normalize, "date", _FixedDate)  # dates without a year depend on "today"
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob("data_samples/raw/RFQ_*.txt")):
+        rid = os.path.basename(path)[:-4]
+        attachments = []
+        for att in sorted(glob.glob(f"data_samples/attachments/{rid}_att_*.txt")):
+            with open(att, encoding="utf-8") as f:
+                attachments.append(f.read())
+        with open(path, encoding="utf-8") as f:
+            digest.update(extract_rfq(rid, f.read(), attachments).model_dump_json().encode("utf-8"))
+    assert (EXTRACTOR_VERSION, digest.hexdigest()[:16]) == ("rules-4", "6e607352184d03be")
@@ -0,0 +1,43 @@
+import json
+
+from src.instrumentation.runlog import RunLog, StageTimer, histogram, make_record, percentile, profile_slowest, slowest, summarize
+from src.intake.batch import BatchConfig, build_work_items, run_batch
+
+def test_stage_timer():
+    timer = StageTimer()
+    with timer.stage("read"):
+        pass
+    with timer.stage("outer"):
+        with timer.stage("extract"):
+            sum(range(1000))
+    assert set(timer.stages) == {"read", "outer", "extract"}
+    record = make_record("RFQ_0001", timer, True, False, 0)
+    assert record["runtime_s"] >= timer.stages["outer"] >= timer.stages["extract"]
+
+def test_percentile():
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([1, 2, 3], 50) == 2 and percentile([1, 2, 3, 4], 99) == 4
+    assert percentile([], 50) == 0.0
+
+def test_batch_run_log_and_summary(tmp_path):
+    path = str(tmp_path / "run_log.jsonl")
+    with RunLog(path) as log:
+        for result in run_batch(build_work_items(), BatchConfig(out_dir=str(tmp_path))):
+            log.write(result.log)
+    lines = [json.loads(line) for line in open(path, encoding="utf-8")]
+    assert len(lines) == 80
+    assert set(lines[0]) >= {"rfq_id", "is_valid_json", "needs_review", "missing_fields_count", "runtime_s", "timestamp"}
+    assert set(lines[0]["stages"]) == {"read", "attachments", "extract", "review", "validate", "export"}
+
+    summary = summarize(lines, wall_s=1.0)
+    assert summary["total"] == summary["valid"] == 80
+    assert summary["needs_review"] == 32
+    assert sum(summary["histogram"].values()) == 80
+    assert abs(sum(s["share"] for s in summary["stages"].values()) - 1.0) < 1e-9
+
+    calls = []
+    paths = profile_slowest(slowest(lines, 2), calls.append, str(tmp_path / "prof"))
+    assert len(paths) == 2 and len(calls) == 2
+
+def test_histogram_buckets():
+    assert histogram([0.00005, 0.3, 20.0], buckets=(0.001, 1.0)) == {"<=0.001s": 1, "<=1s": 1, ">1s": 1}
@@ -0,0 +1,62 @@
+import threading
+import time
+from datetime import date, datetime
+
+from src.intake.batch import build_work_items
+from src.intake.schedule import DAY_S, DeadlineQueue, band_of, order_by_deadline, prescan_due
+
+TODAY = date(2026, 1, 5)
+
+
+def test_prescan_due():
+    mail = "Subject: RFQ 0001\n\n- Quantity: 10 pcs\n- Response due date: 2026-01-12\n"
+    assert datetime.fromtimestamp(prescan_due(mail, TODAY)).date() == date(2026, 1, 12)
+    assert prescan_due("* Quotation due date: 12.01.2026", TODAY) == prescan_due(mail, TODAY)
+    assert prescan_due("- Response due date: (no deadline mentioned)", TODAY) is None
+    assert prescan_due("no bullets here", TODAY) is None
+    assert abs(prescan_due("- Response due date: ASAP", TODAY) - time.time()) < 5
+
+
+def test_earliest_deadline_first_with_aging():
+    now = 1_000_000.0
+    queue = DeadlineQueue(aging=24.0, unknown_slack_s=14 * DAY_S)
+    for i in range(1000):  # backlog of low-priority RFQs, queued over the last hour
+        queue.put(f"low-{i}", now + 21 * DAY_S, now - 3600 + i)
+    queue.put("unknown", None, now)
+    queue.put("urgent", now + 2 * DAY_S, now)
+    queue.put("high", now + 4 * DAY_S, now)
+    # unknown due dates count as due in 14 days; the low backlog, due in 21 days, has gained a day by waiting
+    assert [queue.pop(now + 1).item for _ in range(4)] == ["urgent", "high", "unknown", "low-0"]
+
+    old = DeadlineQueue(aging=24.0)
+    old.put("waited-a-day", now + 21 * DAY_S, now - DAY_S)
+    old.put("new-urgent", now + 2 * DAY_S, now)
+    assert old.pop(now).item == "waited-a-day"  # aging: nothing starves behind a stream of urgent RFQs
+
+    stats = queue.wait_stats()
+    assert stats["urgent"]["n"] == 1 and stats["urgent"]["max_s"] == 1.0
+    assert stats["low"]["n"] == 1 and stats["low"]["p50_s"] == 3601.0 and stats["unknown"]["n"] == 1
+    assert band_of(None, now) == "unknown" and band_of(now + 7 * DAY_S, now) == "normal"
+
+
+def test_get_blocks_until_put_or_close():
+    queue = DeadlineQueue()
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(queue.get(timeout=5))) for _ in range(2)]
+    for w in workers:
+        w.start()
+    queue.put("a", time.time() + DAY_S)
+    time.sleep(0.05)
+    queue.close()
+    for w in workers:
+        w.join()
+    assert [r.item for r in results if r is not None] == ["a"] and results.count(None) == 1
+
+
+def test_batch_order_by_deadline():
+    items = build_work_items()
+    ordered = order_by_deadline(items, today=TODAY)
+    assert sorted(ordered) == sorted(items)
+    dues = [prescan_due(open(f"data_samples/raw/{rfq_id}.txt", encoding="utf-8").read(), TODAY) for rfq_id, _ in ordered]
+    known = [d for d in dues if d is not None]
+    assert known == sorted(known) and dues[-len(dues) + len(known):] == [None] * (len(dues) - len(known))
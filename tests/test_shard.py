@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from src.intake.batch import BatchConfig, run_batch
+from src.intake.shard import load_summaries, merge_shards, order_digest, ordered_items, run_local, run_shard, shard_of
+
+
+def test_shard_assignment_is_stable():
+    assert [shard_of(f"RFQ_{i:04d}", 4) for i in range(1, 9)] == [shard_of(f"RFQ_{i:04d}", 4) for i in range(1, 9)]
+    assert {shard_of(f"RFQ_{i:04d}", 4) for i in range(1, 81)} == {0, 1, 2, 3}
+
+
+@pytest.mark.parametrize("order", ["name", "deadline"])
+def test_merge_restores_single_node_order(tmp_path, order):
+    items = ordered_items(order=order)
+    single = [r.record for r in run_batch(items, BatchConfig(out_dir=str(tmp_path / "single"), per_file=False))]
+    shard_dir = str(tmp_path / "shards")
+    for shard in range(3):
+        run_shard(items, shard, 3, shard_dir)
+    with pytest.raises(FileNotFoundError):
+        load_summaries(shard_dir, 2)  # shards of a different split are missing
+    run_shard(items, 1, 3, shard_dir)  # a re-run replaces the shard output
+
+    report = merge_shards(shard_dir, 3, str(tmp_path / "out"), "jsonl")
+    (path,) = report["export"]
+    with open(path, encoding="utf-8") as f:
+        merged = [json.loads(line) for line in f]
+    assert merged == single
+    assert report["global"]["total"] == 80 and sum(s["items"] for s in report["per_shard"]) == 80
+    assert json.loads((tmp_path / "out" / "report.json").read_text())["failed"] == []
+
+
+def test_nodes_must_agree_on_the_order(tmp_path):
+    # ASAP counts as due at the reference time: before or after all dated deadlines
+    early, late = ordered_items(order="deadline", order_time=0.0), ordered_items(order="deadline", order_time=4e9)
+    assert ordered_items(order="deadline", order_time=0.0) == early
+    assert order_digest(early) != order_digest(late)
+    shard_dir = str(tmp_path / "shards")
+    run_shard(early, 0, 2, shard_dir)
+    run_shard(late, 1, 2, shard_dir)
+    with pytest.raises(ValueError, match="different work list orders"):
+        load_summaries(shard_dir, 2)
+
+
+def test_local_processes_as_nodes(tmp_path):
+    shard_dir = str(tmp_path / "shards")
+    assert run_local(2, shard_dir, ["--workers", "1"]) == [0, 0]
+    report = merge_shards(shard_dir, 2, str(tmp_path / "out"))
+    assert report["export"] == [str(tmp_path / "out")] and report["exported"] == 80
+    record = json.loads((tmp_path / "out" / "RFQ_0003.json").read_text(encoding="utf-8"))
+    assert record["request_id"] == "RFQ_0003"
+    assert len(list((tmp_path / "out").glob("RFQ_*.json"))) == 80
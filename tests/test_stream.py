@@ -0,0 +1,61 @@
+import io
+import json
+
+from src.extraction.cache import ExtractionCache
+from src.intake.stream import iter_batches, run_stream
+
+def make_input():
+    mail = open("data_samples/raw/RFQ_0003.txt", encoding="utf-8").read()
+    lines = [json.dumps({"request_id": f"RFQ_{i:04d}", "mail_text": mail}) for i in range(20)]
+    lines.insert(5, "not json")
+    lines.insert(9, json.dumps({"request_id": "RFQ_X"}))
+    return "\n".join(lines) + "\n"
+
+def test_stream_keeps_order_and_reports_errors():
+    text = make_input()
+    serial, pooled = io.StringIO(), io.StringIO()
+    assert run_stream(io.StringIO(text), serial) == 22
+    assert run_stream(io.StringIO(text), pooled, workers=2, batch_size=3, max_in_flight=1) == 22
+    assert serial.getvalue() == pooled.getvalue()
+
+    out = [json.loads(line) for line in serial.getvalue().splitlines()]
+    assert [o["valid"] for o in out].count(False) == 2
+    assert out[5]["valid"] is False and "JSONDecodeError" in out[5]["error"]
+    assert out[9] == {"request_id": "RFQ_X", "valid": False, "error": "ValueError: Missing 'mail_text'."}
+    assert out[0]["rfq"]["request_id"] == "RFQ_0000"
+    assert out[-1]["rfq"]["incoterms"] == "DAP"
+
+def test_wrong_field_types_give_invalid_lines():
+    mail = open("data_samples/raw/RFQ_0003.txt", encoding="utf-8").read()
+    lines = [
+        json.dumps({"request_id": "RFQ_A", "mail_text": mail, "attachment_texts": [1]}),
+        json.dumps({"request_id": "RFQ_B", "mail_text": mail, "attachment_texts": [None]}),
+        json.dumps({"request_id": 7, "mail_text": mail}),
+        json.dumps({"request_id": "RFQ_C", "mail_text": mail}),
+    ]
+    out = io.StringIO()
+    assert run_stream(io.StringIO("\n".join(lines) + "\n"), out, workers=2, batch_size=2) == 4
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["valid"] for r in results] == [False, False, False, True]
+    assert results[0] == {"request_id": "RFQ_A", "valid": False, "error": "ValueError: 'attachment_texts' must be a list of strings."}
+    assert results[2]["request_id"] is None
+
+def test_cache_answers_repeated_content():
+    text = make_input()
+    cache = ExtractionCache(":memory:")
+    plain, first, again = io.StringIO(), io.StringIO(), io.StringIO()
+    run_stream(io.StringIO(text), plain)
+    run_stream(io.StringIO(text), first, cache=cache)
+    run_stream(io.StringIO(text), again, workers=2, batch_size=3, cache=cache)
+    assert plain.getvalue() == first.getvalue() == again.getvalue()  # same lines, own request_ids
+    assert len(cache) == 1 and (cache.misses, cache.hits) == (20, 20)  # the second run extracts nothing
+
+def test_iter_batches_reads_lazily():
+    consumed = []
+    def source():
+        for i in range(10):
+            consumed.append(i)
+            yield f"{i}\n"
+    batches = iter_batches(source(), 4)
+    assert next(batches) == ["0\n", "1\n", "2\n", "3\n"]
+    assert len(consumed) == 4
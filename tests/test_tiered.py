@@ -0,0 +1,83 @@
+import asyncio
+
+from src.extraction.llm import LLMExtractor
+from src.extraction.rules import build_record, parse_mail
+from src.extraction.stub_server import StubLLMServer
+from src.extraction.tiered import CONTRADICTED, LABELLED, STATED_MISSING, UNPARSED, TieredExtractor, field_confidence
+from src.intake.batch import build_work_items
+from src.intake.corpus import load_rfq_texts
+
+MAIL = """Subject: RFQ RFQ_0100 – Gearbox
+
+- Product/Service: Gearbox
+- Specification: Ratio 1:20
+- Quantity: {quantity}
+- Requested delivery date: 2026-04-27
+- Incoterms: (not specified)
+- Response due date: 2026-01-14
+
+Regards
+Hanseatic Automation
+"""
+
+
+def confidence(mail):
+    parsed = parse_mail(mail)
+    return field_confidence(parsed, build_record("RFQ_0100", parsed, review=False))
+
+
+def test_field_confidence():
+    clean = confidence(MAIL.format(quantity="100 pcs"))
+    assert clean["quantity"] == clean["product_or_service"] == LABELLED and clean["incoterms"] == STATED_MISSING
+    assert confidence(MAIL.format(quantity="100 pcs (please also provide pricing for 200 pcs)"))["quantity"] == CONTRADICTED
+    assert confidence(MAIL.format(quantity="a few hundred"))["quantity"] == UNPARSED
+
+
+def test_rules_only_sends_uncertain_fields_to_review():
+    result, = asyncio.run(TieredExtractor().extract_many([("RFQ_0100", MAIL.format(quantity="a few hundred"), [])]))
+    assert result.tier == "unresolved" and result.escalated == ("quantity",)
+    assert "quantity" in result.rfq.missing_fields and result.rfq.needs_review
+
+
+def test_malformed_requests_become_error_results():
+    extractor = TieredExtractor()
+    bad_type, no_mail, ok = asyncio.run(extractor.extract_many([
+        ("RFQ_0100", MAIL.format(quantity="100 pcs"), [1]),
+        ("RFQ_0101", None, []),
+        ("RFQ_0102", MAIL.format(quantity="100 pcs"), []),
+    ]))
+    assert not bad_type.ok and bad_type.error.startswith("TypeError")
+    assert not no_mail.ok and ok.ok
+    assert (extractor.report.rfqs, extractor.report.errors) == (3, 2)
+
+
+def test_only_uncertain_rfqs_and_fields_go_to_the_llm():
+    requests = [(rid, *load_rfq_texts(rid, files)) for rid, files in build_work_items()]
+    canned = {"RFQ_0074": {"request_id": "RFQ_0074", "customer_name": "Canned GmbH", "product_or_service": "x",
+                           "specification": "x", "quantity": 1500, "quantity_unit": "pcs", "needs_review": False}}
+    server = StubLLMServer(canned, latency=0.01)
+
+    async def go():
+        port = await server.start()
+        try:
+            async with LLMExtractor(f"http://127.0.0.1:{port}", batch_size=4) as llm:
+                extractor = TieredExtractor(llm)
+                return extractor, await extractor.extract_many(requests)
+        finally:
+            await server.stop()
+
+    extractor, results = asyncio.run(go())
+    assert [r.request_id for r in results] == [r[0] for r in requests] and all(r.ok for r in results)
+    by_id = {r.request_id: r for r in results}
+    assert by_id["RFQ_0013"].tier == "rules" and not by_id["RFQ_0013"].rfq.needs_review  # clean
+    contradictory = by_id["RFQ_0074"]
+    assert contradictory.tier == "llm" and "quantity" in contradictory.escalated
+    assert contradictory.rfq.quantity == 1500 and contradictory.rfq.customer_name == "Kappa Process Solutions"
+    assert "quantity" in contradictory.rfq.missing_fields  # the customer still has to confirm the quantity
+
+    report = extractor.report
+    escalated = sum(1 for r in results if r.escalated)
+    assert report.tiers == {"rules": len(results) - escalated, "llm": escalated, "unresolved": 0}
+    assert report.tiers["rules"] >= 0.6 * len(results)
+    assert server.requests_served == -(-escalated // 4)
+    assert 0 < report.tokens < report.tokens_all_llm and report.summary()["tokens_saved_fraction"] > 0.5
@@ -0,0 +1,150 @@
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.intake import watch
+from src.intake.watch import ArrivalTracker, IntakeDaemon, InotifyWatcher, PollingWatcher, WatchConfig
+
+RAW = "data_samples/raw"
+ATTACHMENTS = "data_samples/attachments"
+
+
+def drop(inbox, src_dir, name):
+    """Write under a temporary name and rename into place, as senders should."""
+    shutil.copy(os.path.join(src_dir, name), os.path.join(inbox, name + ".part"))
+    os.replace(os.path.join(inbox, name + ".part"), os.path.join(inbox, name))
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_tracker_waits_for_listed_attachments_or_grace():
+    tracker = ArrivalTracker(settle_s=1.0, grace_s=5.0)
+    tracker.expected = {"RFQ_0003": ["RFQ_0003_att_01.txt", "RFQ_0003_att_02.txt"]}
+    assert tracker.seen("RFQ_0003.txt", 0.0) and tracker.seen("RFQ_0001.txt", 0.0)
+    assert not tracker.seen("notes.txt", 0.0)
+    tracker.seen("RFQ_0003_att_01.txt", 0.5)
+    assert [rfq_id for rfq_id, _ in tracker.pop_ready(1.0)] == ["RFQ_0001"]  # not listed: settle_s after the last file
+    assert tracker.pop_ready(4.9) == []
+    tracker.seen("RFQ_0003_att_02.txt", 2.0)
+    (rfq_id, arrival), = tracker.pop_ready(2.0)  # complete: no further wait
+    assert rfq_id == "RFQ_0003" and arrival.attachments == {"RFQ_0003_att_01.txt", "RFQ_0003_att_02.txt"}
+
+    tracker.seen("RFQ_0004.txt", 10.0)
+    tracker.expected["RFQ_0004"] = ["RFQ_0004_att_01.txt"]
+    assert tracker.next_deadline() == 15.0
+    assert [rfq_id for rfq_id, _ in tracker.pop_ready(15.0)] == ["RFQ_0004"]  # grace period over
+
+    tracker.orphan_s = 60.0
+    tracker.seen("RFQ_0004_att_01.txt", 20.0)  # its mail was already dispatched
+    assert tracker.pop_ready(100.0) == [] and tracker.pop_orphans(79.0) == []
+    assert [rfq_id for rfq_id, _ in tracker.pop_orphans(80.0)] == ["RFQ_0004"] and len(tracker) == 0
+
+
+@pytest.mark.parametrize("watcher_cls", [PollingWatcher, InotifyWatcher])
+def test_daemon_exports_new_rfqs(tmp_path, watcher_cls):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    try:
+        watcher = watcher_cls(str(inbox))
+    except OSError:
+        pytest.skip("inotify is not available")
+    config = WatchConfig(str(inbox), str(tmp_path / "export"), str(tmp_path / "state"), settle_s=0.1, grace_s=5.0, poll_interval=0.05)
+    (inbox / "attachments_index.csv").write_text("rfq_id,attachment_files\nRFQ_0005,RFQ_0005_att_01.txt;RFQ_0005_att_02.txt\n")
+    stop = threading.Event()
+    with ThreadPoolExecutor(2) as pool:
+        daemon = IntakeDaemon(config, pool, watcher)
+        server = daemon.serve_metrics(0)
+        thread = threading.Thread(target=daemon.run, args=(stop,))
+        thread.start()
+        try:
+            drop(inbox, RAW, "RFQ_0001.txt")
+            drop(inbox, RAW, "RFQ_0005.txt")
+            drop(inbox, ATTACHMENTS, "RFQ_0005_att_01.txt")
+            assert wait_for(lambda: (tmp_path / "export" / "RFQ_0001.json").exists())
+            time.sleep(0.3)
+            assert not (tmp_path / "export" / "RFQ_0005.json").exists()  # waits for the second attachment
+            drop(inbox, ATTACHMENTS, "RFQ_0005_att_02.txt")
+            assert wait_for(lambda: daemon.metrics()["processed"] == 2)
+
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            assert json.loads(urllib.request.urlopen(url + "/health").read())["watcher"] == watcher.name
+            metrics = json.loads(urllib.request.urlopen(url + "/metrics").read())
+            assert metrics["received"] == 2 and metrics["in_flight"] == 0 and metrics["latency_s"]["max"] < 5.0
+        finally:
+            stop.set()
+            thread.join()
+            server.shutdown()
+
+    record = json.loads((tmp_path / "export" / "RFQ_0005.json").read_text(encoding="utf-8"))
+    assert record["request_id"] == "RFQ_0005"
+    assert sorted(os.listdir(inbox / "processed")) == ["RFQ_0001.txt", "RFQ_0005.txt", "RFQ_0005_att_01.txt", "RFQ_0005_att_02.txt"]
+    assert os.listdir(tmp_path / "state" / "in_progress") == []
+
+
+def test_daemon_recovers_in_progress_rfqs(tmp_path):
+    inbox = tmp_path / "inbox"
+    markers = tmp_path / "state" / "in_progress"
+    inbox.mkdir()
+    markers.mkdir(parents=True)
+    drop(inbox, RAW, "RFQ_0002.txt")  # dispatched before a crash, never finished
+    (markers / "RFQ_0002.json").write_text("{}")
+    (markers / "RFQ_0009.json").write_text("{}")  # finished, only the marker was left
+    config = WatchConfig(str(inbox), str(tmp_path / "export"), str(tmp_path / "state"), settle_s=60.0, poll_interval=0.05)
+    stop = threading.Event()
+    with ThreadPoolExecutor(1) as pool:
+        daemon = IntakeDaemon(config, pool, PollingWatcher(str(inbox)))
+        thread = threading.Thread(target=daemon.run, args=(stop,))
+        thread.start()
+        try:
+            # processed right away although settle_s has not passed
+            assert wait_for(lambda: (tmp_path / "export" / "RFQ_0002.json").exists(), timeout=5.0)
+        finally:
+            stop.set()
+            thread.join()
+    assert daemon.metrics()["recovered"] == 1
+    assert os.listdir(markers) == []
+
+
+def test_daemon_survives_worker_errors_and_expires_orphans(tmp_path, monkeypatch):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    real = watch.process_and_export
+
+    def flaky(config, item):
+        if item[0] == "RFQ_0001":
+            raise OSError(28, "No space left on device")
+        return real(config, item)
+
+    monkeypatch.setattr(watch, "process_and_export", flaky)
+    config = WatchConfig(str(inbox), str(tmp_path / "export"), str(tmp_path / "state"), settle_s=0.1, orphan_s=0.2, poll_interval=0.05)
+    stop = threading.Event()
+    with ThreadPoolExecutor(1) as pool:
+        daemon = IntakeDaemon(config, pool, PollingWatcher(str(inbox)))
+        thread = threading.Thread(target=daemon.run, args=(stop,))
+        thread.start()
+        try:
+            drop(inbox, RAW, "RFQ_0001.txt")
+            assert wait_for(lambda: daemon.metrics()["failed"] == 1)
+            drop(inbox, RAW, "RFQ_0002.txt")
+            drop(inbox, ATTACHMENTS, "RFQ_0003_att_01.txt")  # no mail follows
+            assert wait_for(lambda: daemon.metrics()["processed"] == 1 and daemon.metrics()["orphaned"] == 1)
+        finally:
+            stop.set()
+            thread.join()
+    assert (tmp_path / "export" / "RFQ_0002.json").exists()
+    marker = json.loads((tmp_path / "state" / "in_progress" / "RFQ_0001.json").read_text())
+    assert marker["error"].startswith("OSError") and (inbox / "RFQ_0001.txt").exists()  # retried at the next start
+    assert os.listdir(inbox / "failed") == ["RFQ_0003_att_01.txt"]
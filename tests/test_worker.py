@@ -0,0 +1,32 @@
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from src.intake.worker import make_server, request_line, send
+
+
+def test_worker_round_trip(tmp_path):
+    path = str(tmp_path / "worker.sock")
+    server = make_server(path)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        with open("data_samples/raw/RFQ_0001.txt", encoding="utf-8") as f:
+            mail = f.read()
+        lines = [request_line("RFQ_0001", mail), "not json", request_line("RFQ_0002", mail)]
+        results = [json.loads(line) for line in send(lines, path)]
+        assert [r["request_id"] for r in results] == ["RFQ_0001", None, "RFQ_0002"]
+        assert results[0]["valid"] and not results[1]["valid"]
+        assert results[2]["rfq"]["customer_name"] == results[0]["rfq"]["customer_name"]
+
+        with pytest.raises(RuntimeError):
+            make_server(path)  # the socket is in use
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    make_server(path).server_close()  # a stale socket file is replaced